@@ -0,0 +1,326 @@
+import asyncio
+import contextvars
+import functools
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Iterable, List, Tuple
+
+import Solution
+import Utility.Columnar as Columnar
+import Utility.Config as Config
+from Utility.ReturnValue import ReturnValue
+
+from Business.Movie import Movie
+from Business.Studio import Studio
+from Business.Critic import Critic
+from Business.Actor import Actor
+
+# asyncio counterpart of Solution.py: every function has the same arguments and returns the same values,
+# it just awaits instead of blocking the event loop.
+# calls run on a worker pool as large as the connection pool (pool_max_size in database.ini), each worker
+# holding at most one pooled connection, so any number of coroutines can await results concurrently while
+# only a handful of connections exist. a call waits for a free connection without blocking the loop
+
+_executor = None
+_transaction = contextvars.ContextVar("AsyncSolution.transaction", default=None)
+
+
+# (re)size the worker pool, call before the first query or between workloads
+def configureWorkers(workers=None) -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False)
+    _executor = ThreadPoolExecutor(max_workers=workers or Config.getInt("connector", "pool_max_size", 10),
+                                   thread_name_prefix="AsyncSolution")
+
+
+def _workers() -> ThreadPoolExecutor:
+    if _executor is None:
+        configureWorkers()
+    return _executor
+
+
+# runs function(*args) on a worker, or on the worker owning the current transaction
+async def _run(function, *args, **kwargs):
+    tx = _transaction.get()
+    executor = tx.executor if tx is not None else _workers()
+    return await asyncio.get_running_loop().run_in_executor(executor, functools.partial(function, *args, **kwargs))
+
+
+# async with transaction() as tx:
+#     await addActor(...)
+#     await actorPlayedInMovie(...)
+# same semantics as Solution.transaction(). the block's calls run one at a time on a worker dedicated to the
+# transaction (a transaction is one connection), calls from other tasks are unaffected
+class transaction:
+    def __init__(self, savepoints=True):
+        self.savepoints = savepoints
+        self.executor = None
+        self.tx = None
+        self.token = None
+
+    async def __aenter__(self):
+        outer = _transaction.get()
+        if outer is not None:
+            self.executor = outer.executor
+        else:
+            self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="AsyncSolution.transaction")
+        self.tx = Solution.transaction(self.savepoints)
+        await asyncio.get_running_loop().run_in_executor(self.executor, self.tx.__enter__)
+        self.token = _transaction.set(self)
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        _transaction.reset(self.token)
+        try:
+            await asyncio.get_running_loop().run_in_executor(
+                self.executor, self.tx.__exit__, exc_type, exc_value, traceback)
+        finally:
+            if _transaction.get() is None:
+                self.executor.shutdown(wait=False)
+        return False
+
+    def commit(self):
+        return _run(self.tx.commit)
+
+    def rollback(self):
+        self.tx.rollback()
+
+
+# rows of a Solution.py generator, moved to the event loop chunk rows at a time
+async def _stream(generator, chunk=500) -> AsyncIterator:
+    try:
+        while True:
+            rows = await _run(lambda: list(itertools.islice(generator, chunk)))
+            if not rows:
+                return
+            for row in rows:
+                yield row
+    finally:
+        await _run(generator.close)
+
+
+# ---------------------------------- CRUD API: ----------------------------------
+
+async def createTables():
+    return await _run(Solution.createTables)
+
+
+async def clearTables():
+    return await _run(Solution.clearTables)
+
+
+async def dropTables():
+    return await _run(Solution.dropTables)
+
+
+async def addCritic(critic: Critic) -> ReturnValue:
+    return await _run(Solution.addCritic, critic)
+
+
+async def deleteCritic(critic_id: int) -> ReturnValue:
+    return await _run(Solution.deleteCritic, critic_id)
+
+
+async def getCriticProfile(critic_id: int) -> Critic:
+    return await _run(Solution.getCriticProfile, critic_id)
+
+
+async def addActor(actor: Actor) -> ReturnValue:
+    return await _run(Solution.addActor, actor)
+
+
+async def deleteActor(actor_id: int) -> ReturnValue:
+    return await _run(Solution.deleteActor, actor_id)
+
+
+async def getActorProfile(actor_id: int) -> Actor:
+    return await _run(Solution.getActorProfile, actor_id)
+
+
+async def addMovie(movie: Movie) -> ReturnValue:
+    return await _run(Solution.addMovie, movie)
+
+
+async def deleteMovie(movie_name: str, year: int) -> ReturnValue:
+    return await _run(Solution.deleteMovie, movie_name, year)
+
+
+async def getMovieProfile(movie_name: str, year: int) -> Movie:
+    return await _run(Solution.getMovieProfile, movie_name, year)
+
+
+async def addStudio(studio: Studio) -> ReturnValue:
+    return await _run(Solution.addStudio, studio)
+
+
+async def deleteStudio(studio_id: int) -> ReturnValue:
+    return await _run(Solution.deleteStudio, studio_id)
+
+
+async def getStudioProfile(studio_id: int) -> Studio:
+    return await _run(Solution.getStudioProfile, studio_id)
+
+
+# -----------------------------------------Basic API--------------------------------------------------------
+
+async def criticRatedMovie(movieName: str, movieYear: int, criticID: int, rating: int) -> ReturnValue:
+    return await _run(Solution.criticRatedMovie, movieName, movieYear, criticID, rating)
+
+
+async def criticDidntRateMovie(movieName: str, movieYear: int, criticID: int) -> ReturnValue:
+    return await _run(Solution.criticDidntRateMovie, movieName, movieYear, criticID)
+
+
+async def actorPlayedInMovie(movieName: str, movieYear: int, actorID: int, salary: int,
+                             roles: List[str]) -> ReturnValue:
+    return await _run(Solution.actorPlayedInMovie, movieName, movieYear, actorID, salary, roles)
+
+
+async def actorDidntPlayInMovie(movieName: str, movieYear: int, actorID: int) -> ReturnValue:
+    return await _run(Solution.actorDidntPlayInMovie, movieName, movieYear, actorID)
+
+
+async def getActorsRoleInMovie(actor_id: int, movie_name: str, movieYear: int):
+    return await _run(Solution.getActorsRoleInMovie, actor_id, movie_name, movieYear)
+
+
+async def studioProducedMovie(studioID: int, movieName: str, movieYear: int, budget: int,
+                              revenue: int) -> ReturnValue:
+    return await _run(Solution.studioProducedMovie, studioID, movieName, movieYear, budget, revenue)
+
+
+async def studioDidntProduceMovie(studioID: int, movieName: str, movieYear: int) -> ReturnValue:
+    return await _run(Solution.studioDidntProduceMovie, studioID, movieName, movieYear)
+
+
+async def averageRating(movieName: str, movieYear: int) -> float:
+    return await _run(Solution.averageRating, movieName, movieYear)
+
+
+async def averageActorRating(actorID: int) -> float:
+    return await _run(Solution.averageActorRating, actorID)
+
+
+async def bestPerformance(actor_id: int) -> Movie:
+    return await _run(Solution.bestPerformance, actor_id)
+
+
+async def stageCrewBudget(movieName: str, movieYear: int) -> int:
+    return await _run(Solution.stageCrewBudget, movieName, movieYear)
+
+
+async def overlyInvestedInMovie(movie_name: str, movie_year: int, actor_id: int) -> bool:
+    return await _run(Solution.overlyInvestedInMovie, movie_name, movie_year, actor_id)
+
+
+# ---------------------------------- ADVANCED API: ----------------------------------
+
+async def franchiseRevenue() -> List[Tuple[str, int]]:
+    return await _run(Solution.franchiseRevenue)
+
+
+async def studioRevenueByYear() -> List[Tuple[int, int, int]]:
+    return await _run(Solution.studioRevenueByYear)
+
+
+async def getFanCritics() -> List[Tuple[int, int]]:
+    return await _run(Solution.getFanCritics)
+
+
+async def averageAgeByGenre() -> List[Tuple[str, float]]:
+    return await _run(Solution.averageAgeByGenre)
+
+
+async def getExclusiveActors() -> List[Tuple[int, int]]:
+    return await _run(Solution.getExclusiveActors)
+
+
+# async for row in franchiseRevenueStream(): ...
+def franchiseRevenueStream(fetchSize=None) -> AsyncIterator[Tuple[str, int]]:
+    return _stream(Solution.franchiseRevenueStream(fetchSize))
+
+
+def studioRevenueByYearStream(fetchSize=None) -> AsyncIterator[Tuple[int, int, int]]:
+    return _stream(Solution.studioRevenueByYearStream(fetchSize))
+
+
+def getFanCriticsStream(fetchSize=None) -> AsyncIterator[Tuple[int, int]]:
+    return _stream(Solution.getFanCriticsStream(fetchSize))
+
+
+def averageAgeByGenreStream(fetchSize=None) -> AsyncIterator[Tuple[str, float]]:
+    return _stream(Solution.averageAgeByGenreStream(fetchSize))
+
+
+def getExclusiveActorsStream(fetchSize=None) -> AsyncIterator[Tuple[int, int]]:
+    return _stream(Solution.getExclusiveActorsStream(fetchSize))
+
+
+async def franchiseRevenueColumns(fetchSize=None) -> Columnar.Columns:
+    return await _run(Solution.franchiseRevenueColumns, fetchSize)
+
+
+async def studioRevenueByYearColumns(fetchSize=None) -> Columnar.Columns:
+    return await _run(Solution.studioRevenueByYearColumns, fetchSize)
+
+
+async def getFanCriticsColumns(fetchSize=None) -> Columnar.Columns:
+    return await _run(Solution.getFanCriticsColumns, fetchSize)
+
+
+async def averageAgeByGenreColumns(fetchSize=None) -> Columnar.Columns:
+    return await _run(Solution.averageAgeByGenreColumns, fetchSize)
+
+
+async def getExclusiveActorsColumns(fetchSize=None) -> Columnar.Columns:
+    return await _run(Solution.getExclusiveActorsColumns, fetchSize)
+
+
+# ---------------------------------- BULK API: ----------------------------------
+
+async def addCritics(critics: Iterable[Critic]) -> List[ReturnValue]:
+    return await _run(Solution.addCritics, critics)
+
+
+async def addActors(actors: Iterable[Actor]) -> List[ReturnValue]:
+    return await _run(Solution.addActors, actors)
+
+
+async def addMovies(movies: Iterable[Movie]) -> List[ReturnValue]:
+    return await _run(Solution.addMovies, movies)
+
+
+async def addStudios(studios: Iterable[Studio]) -> List[ReturnValue]:
+    return await _run(Solution.addStudios, studios)
+
+
+async def bulkRated(ratings: Iterable[Tuple[str, int, int, int]]) -> List[ReturnValue]:
+    return await _run(Solution.bulkRated, ratings)
+
+
+async def bulkProduced(productions: Iterable[Tuple[int, str, int, int, int]]) -> List[ReturnValue]:
+    return await _run(Solution.bulkProduced, productions)
+
+
+async def bulkPlayedIn(casts: Iterable[Tuple[str, int, int, int, List[str]]]) -> List[ReturnValue]:
+    return await _run(Solution.bulkPlayedIn, casts)
+
+
+async def actorsPlayedInMovie(movieName: str, movieYear: int,
+                              cast: Iterable[Tuple[int, int, List[str]]]) -> List[ReturnValue]:
+    return await _run(Solution.actorsPlayedInMovie, movieName, movieYear, cast)
+
+
+# ---------------------------------- BATCH API: ----------------------------------
+
+async def averageRatings(movies: Iterable[Tuple[str, int]]) -> List[float]:
+    return await _run(Solution.averageRatings, movies)
+
+
+async def averageActorRatings(actor_ids: Iterable[int]) -> List[float]:
+    return await _run(Solution.averageActorRatings, actor_ids)
+
+
+async def getActorProfiles(actor_ids: Iterable[int]) -> List[Actor]:
+    return await _run(Solution.getActorProfiles, actor_ids)
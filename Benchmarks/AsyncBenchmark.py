@@ -0,0 +1,60 @@
+import asyncio
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import AsyncSolution
+import Solution
+from Business.Actor import Actor
+
+'''
+    Throughput of getActorProfile: sequential sync calls, sync calls on a thread pool and concurrent
+    AsyncSolution calls (the profile cache is off so every call reaches the database).
+    Run from the repository root (so Utility/database.ini is found):
+        python -m Benchmarks.AsyncBenchmark [calls] [concurrency]
+'''
+
+
+def sequential(calls: int) -> None:
+    for i in range(calls):
+        Solution.getActorProfile(i % 100 + 1)
+
+
+def threaded(calls: int, concurrency: int) -> None:
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(lambda i: Solution.getActorProfile(i % 100 + 1), range(calls)))
+
+
+async def concurrent(calls: int, concurrency: int) -> None:
+    limit = asyncio.Semaphore(concurrency)
+
+    async def lookup(i):
+        async with limit:
+            return await AsyncSolution.getActorProfile(i % 100 + 1)
+
+    await asyncio.gather(*[lookup(i) for i in range(calls)])
+
+
+def report(label: str, calls: int, run) -> None:
+    start = time.perf_counter()
+    run()
+    elapsed = time.perf_counter() - start
+    print(label.ljust(28) + "%8.3fs  %10.0f calls/s" % (elapsed, calls / elapsed))
+
+
+def main(calls=5000, concurrency=200) -> None:
+    Solution.createTables()
+    Solution.addActors(Actor(actor_id=i, actor_name="actor" + str(i), age=30, height=180) for i in range(1, 101))
+    Solution.configureProfileCache(enabled=False)
+    try:
+        sequential(100)  # warm up the pool
+        report("sync, sequential", calls, lambda: sequential(calls))
+        report("sync, %d threads" % concurrency, calls, lambda: threaded(calls, concurrency))
+        report("async, %d in flight" % concurrency, calls, lambda: asyncio.run(concurrent(calls, concurrency)))
+    finally:
+        Solution.configureProfileCache()
+        Solution.dropTables()
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,154 @@
+import bisect
+import itertools
+import random
+from typing import Iterator, List, Tuple
+
+from Business.Actor import Actor
+from Business.Critic import Critic
+from Business.Movie import Movie
+from Business.Studio import Studio
+
+'''
+    Seeded synthetic data for the movie schema, at scales from 10^3 to 10^7 rows in total.
+    Every row is valid against the schema (unique keys, resolvable foreign keys), so it loads with the bulk API:
+        Generator.Dataset(10 ** 5).load(Solution)
+    Popularity is skewed: entity number i is picked with weight 1 / (i + 1) ^ skew, so a few movies collect most
+    of the ratings and cast, a few critics write most of the ratings and a few studios produce most movies.
+    The same (scale, seed, skew) always generates the same rows.
+'''
+
+GENRES = ['Drama', 'Action', 'Comedy', 'Horror']
+BATCH = 4096
+
+
+# draws 0 .. size-1 with Zipf-like weights, a batch of draws at a time
+class Skewed:
+    def __init__(self, rng: random.Random, size: int, skew: float):
+        self.rng = rng
+        self.cumulative = list(itertools.accumulate(1.0 / (i + 1) ** skew for i in range(size)))
+        self.total = self.cumulative[-1]
+        self.pending = []
+
+    def __call__(self) -> int:
+        if not self.pending:
+            random_ = self.rng.random
+            cumulative, total, last = self.cumulative, self.total, len(self.cumulative) - 1
+            self.pending = [min(bisect.bisect(cumulative, random_() * total), last) for _ in range(BATCH)]
+        return self.pending.pop()
+
+
+class Dataset:
+    def __init__(self, scale=10 ** 4, seed=236363, skew=1.1):
+        self.scale = scale
+        self.seed = seed
+        self.skew = skew
+        self.movies = max(scale // 20, 10)
+        self.actors = max(scale // 20, 10)
+        self.critics = max(scale // 50, 10)
+        self.studios = max(scale // 2000, 3)
+        # at most a quarter of the possible pairs, so drawing distinct skewed pairs stays cheap
+        self.ratings = min(scale // 2, self.movies * self.critics // 4)
+        self.cast = min(scale // 4, self.movies * self.actors // 4)
+
+    def rng(self, table: str) -> random.Random:
+        return random.Random(str(self.seed) + "/" + table)  # one stream per table, tables generate independently
+
+    # the key of movie number i
+    @staticmethod
+    def movie(i: int) -> Tuple[str, int]:
+        return "movie" + str(i), 1900 + i % 120
+
+    def movieRows(self) -> Iterator[Movie]:
+        rng = self.rng("movies")
+        for i in range(self.movies):
+            name, year = self.movie(i)
+            yield Movie(movie_name=name, year=year, genre=rng.choice(GENRES))
+
+    def actorRows(self) -> Iterator[Actor]:
+        rng = self.rng("actors")
+        for actor_id in range(1, self.actors + 1):
+            yield Actor(actor_id=actor_id, actor_name="actor" + str(actor_id), age=rng.randint(18, 90),
+                        height=rng.randint(150, 200))
+
+    def criticRows(self) -> Iterator[Critic]:
+        for critic_id in range(1, self.critics + 1):
+            yield Critic(critic_id=critic_id, critic_name="critic" + str(critic_id))
+
+    def studioRows(self) -> Iterator[Studio]:
+        for studio_id in range(1, self.studios + 1):
+            yield Studio(studio_id=studio_id, studio_name="studio" + str(studio_id))
+
+    # (studioID, movieName, movieYear, budget, revenue) for 80% of the movies, popular studios produce more
+    def producedRows(self) -> Iterator[Tuple[int, str, int, int, int]]:
+        rng = self.rng("produced")
+        studio = Skewed(rng, self.studios, self.skew)
+        for i in range(self.movies):
+            if rng.random() < 0.8:
+                budget = rng.randint(10 ** 4, 10 ** 8)
+                yield (studio() + 1,) + self.movie(i) + (budget, int(budget * rng.uniform(0, 5)))
+
+    # (movieName, movieYear, criticID, rating), distinct (movie, critic) pairs with both sides skewed
+    def ratedRows(self) -> Iterator[Tuple[str, int, int, int]]:
+        rng = self.rng("rated")
+        movie, critic = Skewed(rng, self.movies, self.skew), Skewed(rng, self.critics, self.skew)
+        for i, critic_id in self.__pairs(movie, critic, self.ratings, self.critics):
+            yield self.movie(i) + (critic_id + 1, rng.randint(1, 5))
+
+    # (movieName, movieYear, actorID, salary, roles), popular movies get large casts
+    def playedInRows(self) -> Iterator[Tuple[str, int, int, int, List[str]]]:
+        rng = self.rng("playedin")
+        movie, actor = Skewed(rng, self.movies, self.skew), Skewed(rng, self.actors, self.skew / 2)
+        for i, actor_id in self.__pairs(movie, actor, self.cast, self.actors):
+            roles = ["role" + str(k) for k in range(rng.choice((1, 1, 1, 2, 3)))]
+            yield self.movie(i) + (actor_id + 1, rng.randint(1, 10 ** 6), roles)
+
+    @staticmethod
+    def __pairs(first: Skewed, second: Skewed, count: int, width: int) -> Iterator[Tuple[int, int]]:
+        seen = set()
+        attempts = 0
+        while len(seen) < count and attempts < count * 50:
+            attempts += 1
+            pair = first() * width + second()
+            if pair not in seen:
+                seen.add(pair)
+                yield divmod(pair, width)
+
+    # loads every table with api's bulk functions (Solution, MemorySolution, ...)
+    def load(self, api) -> None:
+        api.addMovies(self.movieRows())
+        api.addActors(self.actorRows())
+        api.addCritics(self.criticRows())
+        api.addStudios(self.studioRows())
+        api.bulkProduced(self.producedRows())
+        api.bulkRated(self.ratedRows())
+        api.bulkPlayedIn(self.playedInRows())
+
+    def describe(self) -> dict:
+        return {"scale": self.scale, "seed": self.seed, "skew": self.skew, "movies": self.movies,
+                "actors": self.actors, "critics": self.critics, "studios": self.studios,
+                "ratings": self.ratings, "cast": self.cast}
+
+    # draws keys with the dataset's popularity, for the reads of a benchmark
+    def sampler(self, seed=0) -> "Sampler":
+        return Sampler(self, random.Random(str(self.seed) + "/sampler/" + str(seed)))
+
+
+class Sampler:
+    def __init__(self, dataset: Dataset, rng: random.Random):
+        self.rng = rng
+        self.__movie = Skewed(rng, dataset.movies, dataset.skew)
+        self.__actor = Skewed(rng, dataset.actors, dataset.skew / 2)
+        self.__critic = Skewed(rng, dataset.critics, dataset.skew)
+        self.__studio = Skewed(rng, dataset.studios, dataset.skew)
+
+    def movie(self) -> Tuple[str, int]:
+        return Dataset.movie(self.__movie())
+
+    def actor(self) -> int:
+        return self.__actor() + 1
+
+    def critic(self) -> int:
+        return self.__critic() + 1
+
+    def studio(self) -> int:
+        return self.__studio() + 1
@@ -0,0 +1,100 @@
+import random
+import sys
+import time
+
+import Solution
+import Utility.DBConnector as Connector
+from Business.Actor import Actor
+from Business.Critic import Critic
+from Business.Movie import Movie
+from Business.Studio import Studio
+
+'''
+    Cascade deletes and Advanced API queries with and without the secondary indexes of createTables.
+    Run from the repository root (so Utility/database.ini is found):
+        python -m Benchmarks.IndexBenchmark [ratings]
+'''
+
+GENRES = ['Drama', 'Action', 'Comedy', 'Horror']
+
+
+def populate(ratings: int, seed=236363) -> None:
+    rng = random.Random(seed)
+    movies = max(ratings // 100, 10)
+    critics = max(ratings // movies * 2, 10)
+    studios = max(movies // 100, 2)
+    actors = max(movies // 2, 10)
+    Solution.addMovies(Movie(movie_name="movie" + str(i), year=1900 + i % 120, genre=GENRES[i % 4])
+                       for i in range(movies))
+    Solution.addCritics(Critic(critic_id=i, critic_name="critic" + str(i)) for i in range(1, critics + 1))
+    Solution.addStudios(Studio(studio_id=i, studio_name="studio" + str(i)) for i in range(1, studios + 1))
+    Solution.addActors(Actor(actor_id=i, actor_name="actor" + str(i), age=rng.randint(18, 90),
+                             height=rng.randint(150, 200)) for i in range(1, actors + 1))
+    Solution.bulkProduced((rng.randint(1, studios), "movie" + str(i), 1900 + i % 120, rng.randint(0, 10 ** 6),
+                           rng.randint(0, 10 ** 7)) for i in range(movies))
+    Solution.bulkPlayedIn(("movie" + str(i), 1900 + i % 120, actor_id, rng.randint(1, 10 ** 5), ["role"])
+                          for i in range(movies) for actor_id in rng.sample(range(1, actors + 1), 5))
+    Solution.bulkRated(("movie" + str(i), 1900 + i % 120, critic_id, rng.randint(1, 5))
+                       for critic_id in range(1, critics + 1) for i in rng.sample(range(movies), ratings // critics))
+
+
+# runs call inside a transaction that is rolled back, so destructive calls can be repeated
+def timed(call, repeat=5) -> float:
+    best = None
+    for _ in range(repeat):
+        with Solution.transaction(savepoints=False) as tx:
+            start = time.perf_counter()
+            call()
+            elapsed = time.perf_counter() - start
+            tx.rollback()
+        best = elapsed if best is None else min(best, elapsed)
+    return best * 1000
+
+
+def dropIndexes() -> None:
+    conn = Connector.DBConnector()
+    try:
+        for name, _ in Solution.INDEXES:
+            conn.execute("DROP INDEX IF EXISTS " + name)
+        conn.execute("ANALYZE")
+    finally:
+        conn.close()
+
+
+def createIndexes() -> None:
+    conn = Connector.DBConnector()
+    try:
+        for _, index in Solution.INDEXES:
+            conn.execute(index)
+        conn.execute("ANALYZE")
+    finally:
+        conn.close()
+
+
+CALLS = (("deleteCritic", lambda: Solution.deleteCritic(7)),
+         ("deleteStudio", lambda: Solution.deleteStudio(1)),
+         ("deleteMovie", lambda: Solution.deleteMovie("movie7", 1907)),
+         ("stageCrewBudget", lambda: Solution.stageCrewBudget("movie7", 1907)),
+         ("studioRevenueByYear", Solution.studioRevenueByYear),
+         ("getFanCritics", Solution.getFanCritics),
+         ("getExclusiveActors", Solution.getExclusiveActors))
+
+
+def main(ratings=10 ** 6) -> None:
+    Solution.createTables()
+    try:
+        populate(ratings)
+        results = {}
+        for label, setup in (("without indexes", dropIndexes), ("with indexes", createIndexes)):
+            setup()
+            results[label] = [timed(call) for _, call in CALLS]
+        print("".ljust(22) + "".join(label.rjust(18) for label in results))
+        for index, (name, _) in enumerate(CALLS):
+            print(name.ljust(22) + "".join(("%.2fms" % times[index]).rjust(18) for times in results.values()))
+        print("missing indexes: " + str(Solution.verifyIndexes()))
+    finally:
+        Solution.dropTables()
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10 ** 6)
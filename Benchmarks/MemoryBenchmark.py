@@ -0,0 +1,67 @@
+import sys
+import time
+
+import MemorySolution
+import Solution
+import Utility.DBConnector as Connector
+from Business.Actor import Actor
+from Business.Critic import Critic
+from Business.Movie import Movie
+from Business.Studio import Studio
+
+'''
+    Single-threaded latency of the in-memory engine against Solution.py on the backend of database.ini.
+    Run from the repository root (so Utility/database.ini is found):
+        python -m Benchmarks.MemoryBenchmark [movies]
+'''
+
+
+# writes then reads, the mix of a simulation step
+def workload(api, movies: int) -> int:
+    calls = 0
+    for studio_id in range(1, 11):
+        api.addStudio(Studio(studio_id=studio_id, studio_name="studio" + str(studio_id)))
+    for critic_id in range(1, 21):
+        api.addCritic(Critic(critic_id=critic_id, critic_name="critic" + str(critic_id)))
+    for actor_id in range(1, 51):
+        api.addActor(Actor(actor_id=actor_id, actor_name="actor" + str(actor_id), age=20 + actor_id, height=180))
+    calls += 80
+    for index in range(movies):
+        name = "movie" + str(index)
+        api.addMovie(Movie(movie_name=name, year=1990 + index % 30, genre="Drama"))
+        api.studioProducedMovie(index % 10 + 1, name, 1990 + index % 30, 1000, index)
+        api.actorPlayedInMovie(name, 1990 + index % 30, index % 50 + 1, 10, ["role"])
+        api.criticRatedMovie(name, 1990 + index % 30, index % 20 + 1, index % 5 + 1)
+        api.averageRating(name, 1990 + index % 30)
+        api.stageCrewBudget(name, 1990 + index % 30)
+        api.getActorProfile(index % 50 + 1)
+        calls += 7
+    for actor_id in range(1, 51):
+        api.averageActorRating(actor_id)
+        api.bestPerformance(actor_id)
+        calls += 2
+    api.franchiseRevenue()
+    api.getFanCritics()
+    api.getExclusiveActors()
+    return calls + 3
+
+
+def timed(api, movies: int) -> float:
+    api.createTables()
+    try:
+        start = time.perf_counter()
+        calls = workload(api, movies)
+        return (time.perf_counter() - start) / calls * 1000
+    finally:
+        api.dropTables()
+
+
+def main(movies=1000) -> None:
+    database = timed(Solution, movies)
+    memory = timed(MemorySolution, movies)
+    print(("Solution (" + Connector.dialect() + ")").ljust(24) + "per call=%.4fms" % database)
+    print("MemorySolution".ljust(24) + "per call=%.4fms  (%.0fx)" % (memory, database / memory))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000)
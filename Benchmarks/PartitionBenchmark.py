@@ -0,0 +1,54 @@
+import os
+import sys
+import time
+
+import Solution
+import Utility.Config as Config
+from Benchmarks import SuiteBenchmark
+from Benchmarks.Generator import Dataset
+
+'''
+    Every Solution.py function on the plain and the year-partitioned layout of createTables ([schema] partitioned),
+    over the same generated dataset (see Benchmarks/Generator.py). PostgreSQL only, SQLite has no partitioning.
+    Run from the repository root (so Utility/database.ini is found):
+        python -m Benchmarks.PartitionBenchmark [scale] [iterations]
+'''
+
+LAYOUTS = (("plain", "false"), ("partitioned", "true"))
+
+
+def measure(dataset: Dataset, partitioned: str, iterations: int) -> dict:
+    os.environ["DB_SCHEMA__PARTITIONED"] = partitioned
+    Config.reload()  # new connections get the layout's session settings
+    Solution.createTables()
+    try:
+        start = time.perf_counter()
+        dataset.load(Solution)
+        print("loaded in %.1fs (partitioned=%s)" % (time.perf_counter() - start, partitioned))
+        return SuiteBenchmark.run(dataset, iterations)
+    finally:
+        Solution.dropTables()
+
+
+def main(scale=10 ** 7, iterations=100) -> None:
+    saved = os.environ.get("DB_SCHEMA__PARTITIONED")
+    dataset = Dataset(scale)
+    Solution.configureProfileCache(enabled=False)
+    Solution.configureAdvancedCache(enabled=False)
+    try:
+        results = {label: measure(dataset, partitioned, iterations) for label, partitioned in LAYOUTS}
+    finally:
+        if saved is None:
+            os.environ.pop("DB_SCHEMA__PARTITIONED", None)
+        else:
+            os.environ["DB_SCHEMA__PARTITIONED"] = saved
+        Config.reload()
+    print("".ljust(26) + "".join((label + " p50").rjust(18) for label in results) + "p95 ratio".rjust(12))
+    for name in results["plain"]:
+        plain, partitioned = results["plain"][name], results["partitioned"][name]
+        print(name.ljust(26) + "".join(("%.3fms" % result[name]["p50_ms"]).rjust(18) for result in results.values())
+              + ("%.2f" % (partitioned["p95_ms"] / plain["p95_ms"])).rjust(12))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10 ** 7, int(sys.argv[2]) if len(sys.argv) > 2 else 100)
@@ -0,0 +1,227 @@
+import json
+import sys
+import time
+
+import Solution
+import Utility.DBConnector as Connector
+from Benchmarks.Generator import Dataset
+
+'''
+    Query plans of the Basic and Advanced API over a generated dataset (see Benchmarks/Generator.py), captured with
+    EXPLAIN (ANALYZE, BUFFERS) on PostgreSQL. Writes are explained inside a transaction that is rolled back.
+    Run from the repository root (so Utility/database.ini is found):
+        python -m Benchmarks.PlanBenchmark capture [scale] [plans.json]
+    report what got worse between two captures (new sequential scans, row estimates off by more than blowup times,
+    costs above threshold times the old ones), exiting with 1 if anything did:
+        python -m Benchmarks.PlanBenchmark check old.json new.json [threshold] [blowup]
+    and run the alternative formulations of a query side by side, checking they return the same rows:
+        python -m Benchmarks.PlanBenchmark alternatives [scale]
+'''
+
+THRESHOLD = 1.5
+BLOWUP = 10.0
+
+# prepared statement -> its parameters, drawn from a Sampler with the dataset's skew
+BASIC = {
+    "getCriticProfile": lambda s: (s.critic(),),
+    "getActorProfile": lambda s: (s.actor(),),
+    "getMovieProfile": lambda s: s.movie(),
+    "getStudioProfile": lambda s: (s.studio(),),
+    "getActorsRoleInMovie": lambda s: (s.actor(),) + s.movie(),
+    "averageRating": lambda s: s.movie(),
+    "averageActorRating": lambda s: (s.actor(),),
+    "bestPerformance": lambda s: (s.actor(),),
+    "stageCrewBudget": lambda s: s.movie(),
+    "overlyInvestedInMovie": lambda s: s.movie() + (s.actor(),),
+    "averageRatings": lambda s: tuple(map(list, zip(*[s.movie() for _ in range(10)]))),
+    "averageActorRatings": lambda s: ([s.actor() for _ in range(10)],),
+    "getActorProfiles": lambda s: ([s.actor() for _ in range(10)],),
+    "criticDidntRateMovie": lambda s: s.movie() + (s.critic(),),
+    "actorDidntPlayInMovie": lambda s: s.movie() + (s.actor(),),
+    "studioDidntProduceMovie": lambda s: s.movie() + (s.studio(),),
+    "deleteCritic": lambda s: (s.critic(),),
+    "deleteActor": lambda s: (s.actor(),),
+    "deleteMovie": lambda s: s.movie(),
+    "deleteStudio": lambda s: (s.studio(),),
+}
+
+# query -> {formulation: SQL}, the first one is what Solution.py runs
+ALTERNATIVES = {
+    "getFanCritics": {
+        "maintained counts": Solution.ADVANCED_QUERIES["getFanCritics"],
+        "grouped counts": "SELECT critic_id, q1.studio_id\
+                           FROM (\
+                           SELECT r.critic_id, studio_id, COUNT(studio_id) AS num_reviews\
+                           FROM rated r JOIN produced p\
+                           ON r.movie_name = p.movie_name AND r.year = p.year\
+                           GROUP BY r.critic_id, p.studio_id\
+                           ) AS q1 JOIN (\
+                           SELECT studio_id, COUNT(studio_id) AS num_movies\
+                           FROM produced p\
+                           GROUP BY p.studio_id\
+                           ) AS q2\
+                           ON q1.studio_id = q2.studio_id AND q1.num_reviews = q2.num_movies\
+                           ORDER BY critic_id DESC, q1.studio_id DESC",
+        "not exists / not in": "SELECT C.critic_id, S.studio_id\
+                                FROM critics C, studios S\
+                                WHERE EXISTS(SELECT * FROM rated ra WHERE C.critic_id = ra.critic_id)\
+                                AND EXISTS(SELECT * FROM produced pa WHERE S.studio_id = pa.studio_id)\
+                                AND NOT EXISTS(\
+                                SELECT p.movie_name, p.year\
+                                FROM produced p\
+                                WHERE p.studio_id = S.studio_id AND (\
+                                (p.movie_name, p.year) NOT IN(\
+                                SELECT r.movie_name, r.year\
+                                FROM rated r\
+                                WHERE r.critic_id = C.critic_id)))\
+                                ORDER BY C.critic_id DESC, S.studio_id DESC",
+    },
+}
+
+
+# every node of an EXPLAIN (FORMAT JSON) plan, depth first
+def nodes(plan: dict):
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from nodes(child)
+
+
+# how far the planner's row estimate of a node was off, in either direction (per loop, as EXPLAIN reports both)
+def misestimate(node: dict) -> float:
+    estimated, actual = node.get("Plan Rows", 0), node.get("Actual Rows", 0)
+    return max(estimated, actual, 1) / max(min(estimated, actual), 1)
+
+
+# the parts of an EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) output the checks compare, and the plan itself
+def summarize(explained: list) -> dict:
+    root = explained[0]
+    plan = root["Plan"]
+    worst = max(nodes(plan), key=misestimate)
+    return {"cost": plan["Total Cost"], "execution_ms": root.get("Execution Time", 0.0),
+            "planning_ms": root.get("Planning Time", 0.0),
+            "buffers": plan.get("Shared Hit Blocks", 0) + plan.get("Shared Read Blocks", 0),
+            "seq_scans": sorted({node.get("Relation Name", "?") for node in nodes(plan)
+                                 if node["Node Type"] == "Seq Scan"}),
+            "misestimate": misestimate(worst), "misestimated_node": worst["Node Type"] + (
+                " on " + worst["Relation Name"] if "Relation Name" in worst else ""),
+            "plan": explained}
+
+
+# "name: what got worse" for every query whose plan regressed from old to new
+def regressions(old: dict, new: dict, threshold=THRESHOLD, blowup=BLOWUP) -> list:
+    found = []
+    for name, after in new["plans"].items():
+        before = old["plans"].get(name)
+        if before is None:
+            continue
+        for relation in after["seq_scans"]:
+            if relation not in before["seq_scans"]:
+                found.append(name + ": new sequential scan on " + relation)
+        if after["misestimate"] > blowup >= before["misestimate"]:
+            found.append(name + ": row estimate off by %.0fx at %s" % (after["misestimate"],
+                                                                         after["misestimated_node"]))
+        if before["cost"] and after["cost"] > before["cost"] * threshold:
+            found.append(name + ": cost %.1f -> %.1f (x%.2f)" % (before["cost"], after["cost"],
+                                                                  after["cost"] / before["cost"]))
+    return found
+
+
+def explain(conn: Connector.DBConnector, query: str) -> dict:
+    _, result = conn.execute("EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " + query)
+    explained = result.rows[0][0]
+    return summarize(json.loads(explained) if isinstance(explained, str) else explained)
+
+
+# runs the EXPLAINs of one query on a transaction that is rolled back, so explained writes leave no trace
+def explainRolledBack(query_of) -> dict:
+    with Solution.transaction(savepoints=False) as tx:
+        conn = Connector.DBConnector()
+        try:
+            return explain(conn, query_of(conn))
+        finally:
+            conn.close()
+            tx.rollback()
+
+
+def requirePostgreSQL() -> None:
+    if Connector.dialect() != "postgresql":
+        raise SystemExit("EXPLAIN (ANALYZE, BUFFERS) needs the postgresql backend, not " + Connector.dialect())
+
+
+def load(dataset: Dataset) -> None:
+    Solution.createTables()
+    dataset.load(Solution)
+    conn = Connector.DBConnector()
+    try:
+        conn.execute("ANALYZE")
+    finally:
+        conn.close()
+
+
+def capture(scale=10 ** 5, output="plans.json") -> None:
+    requirePostgreSQL()
+    dataset = Dataset(scale)
+    plans = {}
+    try:
+        load(dataset)
+        sampler = dataset.sampler()
+        for name, params in BASIC.items():
+            values = params(sampler)
+            plans[name] = explainRolledBack(lambda conn: conn.inlined(name, values))
+        for name, query in Solution.ADVANCED_QUERIES.items():
+            plans[name] = explainRolledBack(lambda conn: query)
+    finally:
+        Solution.dropTables()
+    for name, plan in plans.items():
+        print(name.ljust(26) + "cost=%-10.1f %8.3fms  buffers=%-6d seq scans=%s" % (
+            plan["cost"], plan["execution_ms"], plan["buffers"], ",".join(plan["seq_scans"]) or "-"))
+    meta = {"dataset": dataset.describe(), "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S")}
+    with open(output, "w") as f:
+        json.dump({"meta": meta, "plans": plans}, f, indent=2)
+    print("plans written to " + output)
+
+
+def check(old_file: str, new_file: str, threshold=THRESHOLD, blowup=BLOWUP) -> int:
+    with open(old_file) as f:
+        old = json.load(f)
+    with open(new_file) as f:
+        new = json.load(f)
+    found = regressions(old, new, threshold, blowup)
+    for line in found:
+        print(line)
+    print(str(len(found)) + " plan regressions")
+    return 1 if found else 0
+
+
+def alternatives(scale=10 ** 5) -> None:
+    requirePostgreSQL()
+    dataset = Dataset(scale)
+    try:
+        load(dataset)
+        for name, formulations in ALTERNATIVES.items():
+            print(name)
+            results = {}
+            for label, query in formulations.items():
+                conn = Connector.DBConnector()
+                try:
+                    results[label] = conn.execute(query)[1].rows
+                finally:
+                    conn.close()
+                plan = explainRolledBack(lambda conn: query)
+                print("    " + label.ljust(24) + "cost=%-10.1f %8.3fms  buffers=%-6d seq scans=%s" % (
+                    plan["cost"], plan["execution_ms"], plan["buffers"], ",".join(plan["seq_scans"]) or "-"))
+            rows = list(results.values())
+            print("    same rows: " + str(all(other == rows[0] for other in rows)))
+    finally:
+        Solution.dropTables()
+
+
+if __name__ == '__main__':
+    mode = sys.argv[1] if len(sys.argv) > 1 else "capture"
+    if mode == "check":
+        sys.exit(check(sys.argv[2], sys.argv[3], float(sys.argv[4]) if len(sys.argv) > 4 else THRESHOLD,
+                       float(sys.argv[5]) if len(sys.argv) > 5 else BLOWUP))
+    elif mode == "alternatives":
+        alternatives(int(sys.argv[2]) if len(sys.argv) > 2 else 10 ** 5)
+    else:
+        capture(int(sys.argv[2]) if len(sys.argv) > 2 else 10 ** 5, sys.argv[3] if len(sys.argv) > 3 else "plans.json")
@@ -0,0 +1,47 @@
+import statistics
+import sys
+import time
+
+import Solution
+import Utility.DBConnector as Connector
+from Business.Critic import Critic
+
+'''
+    Per-call latency of getCriticProfile with a fresh connection per call vs. the connection pool.
+    Run from the repository root (so Utility/database.ini is found):
+        python -m Benchmarks.PoolBenchmark [calls]
+'''
+
+
+def timeCalls(calls: int) -> list:
+    latencies = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        Solution.getCriticProfile(1)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def report(label: str, latencies: list) -> None:
+    latencies = sorted(latencies)
+    p50 = latencies[len(latencies) // 2] * 1000
+    p99 = latencies[int(len(latencies) * 0.99)] * 1000
+    mean = statistics.mean(latencies) * 1000
+    print(label.ljust(12) + "mean=%.3fms  p50=%.3fms  p99=%.3fms" % (mean, p50, p99))
+
+
+def main(calls=2000) -> None:
+    Solution.createTables()
+    Solution.addCritic(Critic(critic_id=1, critic_name="Roger Ebert"))
+    try:
+        for label, enabled in (("no pool", False), ("pool", True)):
+            Connector.configurePool(enabled=enabled)
+            timeCalls(min(calls, 50))  # warm up
+            report(label, timeCalls(calls))
+    finally:
+        Connector.configurePool()
+        Solution.dropTables()
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -0,0 +1,76 @@
+import json
+import sys
+import time
+
+import Solution
+import Utility.DBConnector as Connector
+from Business.Actor import Actor
+from Business.Critic import Critic
+from Business.Movie import Movie
+from Business.Studio import Studio
+
+'''
+    Planning time and per-call latency of the Basic API with and without server-side prepared statements.
+    Run from the repository root (so Utility/database.ini is found):
+        python -m Benchmarks.PreparedBenchmark [calls]
+'''
+
+CALLS = (("averageRating", lambda: Solution.averageRating("Heat", 1995), ("Heat", 1995)),
+         ("stageCrewBudget", lambda: Solution.stageCrewBudget("Heat", 1995), ("Heat", 1995)),
+         ("overlyInvestedInMovie", lambda: Solution.overlyInvestedInMovie("Heat", 1995, 1), ("Heat", 1995, 1)))
+
+
+def populate() -> None:
+    Solution.addMovie(Movie(movie_name="Heat", year=1995, genre="Action"))
+    Solution.addStudio(Studio(studio_id=1, studio_name="Warner Bros"))
+    Solution.studioProducedMovie(1, "Heat", 1995, 60000000, 187000000)
+    for actor_id in range(1, 21):
+        Solution.addActor(Actor(actor_id=actor_id, actor_name="actor" + str(actor_id), age=40, height=180))
+        Solution.actorPlayedInMovie("Heat", 1995, actor_id, 1000 * actor_id, ["role" + str(actor_id)])
+    for critic_id in range(1, 101):
+        Solution.addCritic(Critic(critic_id=critic_id, critic_name="critic" + str(critic_id)))
+        Solution.criticRatedMovie("Heat", 1995, critic_id, critic_id % 5 + 1)
+
+
+# server-reported planning time of one execution, in ms
+def planningTime(name: str, params: tuple, prepared: bool) -> float:
+    conn = Connector.DBConnector()
+    try:
+        if prepared:
+            for _ in range(6):  # past the custom-plan phase, the server now reuses a generic plan
+                conn.executePrepared(name, params)
+            query = "EXPLAIN (ANALYZE, FORMAT JSON) EXECUTE " + name + "(" + ", ".join(["%s"] * len(params)) + ")"
+            _, result = conn.execute(query, params=params)
+        else:
+            _, result = conn.execute("EXPLAIN (ANALYZE, FORMAT JSON) " + conn.inlined(name, params))
+        plan = result.rows[0][0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return plan[0]["Planning Time"]
+    finally:
+        conn.close()
+
+
+def main(calls=2000) -> None:
+    Solution.createTables()
+    populate()
+    try:
+        for name, call, params in CALLS:
+            for prepared in (False, True):
+                Connector.configurePreparedStatements(prepared)
+                for _ in range(min(calls, 50)):  # warm up
+                    call()
+                start = time.perf_counter()
+                for _ in range(calls):
+                    call()
+                per_call = (time.perf_counter() - start) / calls * 1000
+                label = name + (" (prepared)" if prepared else " (plain)")
+                print(label.ljust(36) + "planning=%.3fms  per call=%.3fms" % (planningTime(name, params, prepared),
+                                                                             per_call))
+    finally:
+        Connector.configurePreparedStatements()
+        Solution.dropTables()
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -0,0 +1,75 @@
+import sys
+import time
+import tracemalloc
+from collections import namedtuple
+
+from Utility.DBConnector import ResultSet, ResultSetDict
+
+'''
+    Building, indexing and printing a large ResultSet, against the previous implementation
+    (copied rows, one dict per row access, string concatenation). Needs no database:
+        python -m Benchmarks.ResultSetBenchmark [rows]
+'''
+
+Column = namedtuple("Column", ["name"])
+DESCRIPTION = [Column("studio_id"), Column("year"), Column("total_revenue")]
+
+
+# the ResultSet as it was before rows became shared tuples
+class LegacyResultSet:
+    def __init__(self, description=None, results=None):
+        self.rows = []
+        self.cols_header = []
+        self.cols = ResultSetDict()
+        if results is not None and len(results) > 0:
+            self.rows = results.copy()
+            self.cols_header = [d.name for d in description]
+            for col, index in zip(self.cols_header, range(len(results[0]))):
+                self.cols[col] = index
+
+    def __getitem__(self, row):
+        row_to_return = ResultSetDict()
+        for val, col in zip(self.rows[row], self.cols_header):
+            row_to_return[col] = val
+        return row_to_return
+
+    def __str__(self):
+        string = ""
+        for col in self.cols_header:
+            string += str(col) + "   "
+        string += '\n'
+        for row in self.rows:
+            for val in row:
+                string += str(val) + "   "
+            string += '\n'
+        return string
+
+
+# time without tracing, then peak memory in a second, traced run
+def measure(label: str, action) -> None:
+    start = time.perf_counter()
+    action()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    action()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(label.ljust(28) + "%8.3fs  peak=%7.1fMB" % (elapsed, peak / 2 ** 20))
+
+
+def run(cls, rows: list) -> None:
+    name = cls.__name__
+    result = cls(DESCRIPTION, rows)
+    measure(name + " build", lambda: cls(DESCRIPTION, rows))
+    measure(name + " [i]['col']", lambda: sum(result[i]["total_revenue"] for i in range(len(rows))))
+    measure(name + " str()", lambda: str(result))
+
+
+def main(count=10 ** 6) -> None:
+    rows = [(i % 100, 1900 + i % 120, i) for i in range(count)]
+    for cls in (LegacyResultSet, ResultSet):
+        run(cls, rows)
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10 ** 6)
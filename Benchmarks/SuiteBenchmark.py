@@ -0,0 +1,163 @@
+import json
+import math
+import platform
+import sys
+import time
+
+import Solution
+import Utility.Config as Config
+import Utility.DBConnector as Connector
+from Benchmarks.Generator import Dataset
+from Business.Actor import Actor
+from Business.Critic import Critic
+from Business.Movie import Movie
+from Business.Studio import Studio
+
+'''
+    Latency of every Solution.py function over a generated dataset (see Benchmarks/Generator.py), on the backend
+    of database.ini. Keys are drawn with the dataset's skew, so popular movies and critics are hit the most.
+    Writes use fresh keys and are undone by the matching deletes, the dataset is the same for every read.
+    Run from the repository root (so Utility/database.ini is found):
+        python -m Benchmarks.SuiteBenchmark [scale] [results.json] [iterations] [nocache]
+    and compare two result files, exiting with 1 when a function got slower than threshold times its old p50/p95:
+        python -m Benchmarks.SuiteBenchmark compare old.json new.json [threshold]
+'''
+
+THRESHOLD = 1.25
+ROLES = ["lead", "extra"]
+
+
+# (name, call(sampler, k)) in the order they run, k = 0 .. iterations-1. the writes add keys above the dataset's,
+# the relations between them are removed before the entities they reference
+def cases(dataset: Dataset) -> list:
+    critic = lambda k: dataset.critics + 1 + k
+    actor = lambda k: dataset.actors + 1 + k
+    studio = lambda k: dataset.studios + 1 + k
+    movie = lambda k: ("new" + str(k), 2000)
+    rated, played, produced = {}, {}, {}  # k -> the sampled key, so the matching removal hits the same row
+    pick = lambda picked, k, key: picked.setdefault(k, key)
+    return [
+        ("addCritic", lambda s, k: Solution.addCritic(Critic(critic_id=critic(k), critic_name="new"))),
+        ("addActor", lambda s, k: Solution.addActor(Actor(actor_id=actor(k), actor_name="new", age=30, height=180))),
+        ("addMovie", lambda s, k: Solution.addMovie(Movie(*movie(k), genre="Drama"))),
+        ("addStudio", lambda s, k: Solution.addStudio(Studio(studio_id=studio(k), studio_name="new"))),
+        ("criticRatedMovie", lambda s, k: Solution.criticRatedMovie(*pick(rated, k, s.movie()), critic(k), 3)),
+        ("actorPlayedInMovie", lambda s, k: Solution.actorPlayedInMovie(*pick(played, k, s.movie()), actor(k), 100,
+                                                                           ROLES)),
+        ("studioProducedMovie", lambda s, k: Solution.studioProducedMovie(pick(produced, k, s.studio()), *movie(k),
+                                                                            100, 200)),
+        ("getCriticProfile", lambda s, k: Solution.getCriticProfile(s.critic())),
+        ("getActorProfile", lambda s, k: Solution.getActorProfile(s.actor())),
+        ("getMovieProfile", lambda s, k: Solution.getMovieProfile(*s.movie())),
+        ("getStudioProfile", lambda s, k: Solution.getStudioProfile(s.studio())),
+        ("getActorsRoleInMovie", lambda s, k: Solution.getActorsRoleInMovie(s.actor(), *s.movie())),
+        ("averageRating", lambda s, k: Solution.averageRating(*s.movie())),
+        ("averageActorRating", lambda s, k: Solution.averageActorRating(s.actor())),
+        ("bestPerformance", lambda s, k: Solution.bestPerformance(s.actor())),
+        ("stageCrewBudget", lambda s, k: Solution.stageCrewBudget(*s.movie())),
+        ("overlyInvestedInMovie", lambda s, k: Solution.overlyInvestedInMovie(*s.movie(), s.actor())),
+        ("averageRatings", lambda s, k: Solution.averageRatings([s.movie() for _ in range(10)])),
+        ("averageActorRatings", lambda s, k: Solution.averageActorRatings([s.actor() for _ in range(10)])),
+        ("getActorProfiles", lambda s, k: Solution.getActorProfiles([s.actor() for _ in range(10)])),
+        ("franchiseRevenue", lambda s, k: Solution.franchiseRevenue()),
+        ("studioRevenueByYear", lambda s, k: Solution.studioRevenueByYear()),
+        ("getFanCritics", lambda s, k: Solution.getFanCritics()),
+        ("averageAgeByGenre", lambda s, k: Solution.averageAgeByGenre()),
+        ("getExclusiveActors", lambda s, k: Solution.getExclusiveActors()),
+        ("criticDidntRateMovie", lambda s, k: Solution.criticDidntRateMovie(*rated[k], critic(k))),
+        ("actorDidntPlayInMovie", lambda s, k: Solution.actorDidntPlayInMovie(*played[k], actor(k))),
+        ("studioDidntProduceMovie", lambda s, k: Solution.studioDidntProduceMovie(produced[k], *movie(k))),
+        ("deleteMovie", lambda s, k: Solution.deleteMovie(*movie(k))),
+        ("deleteStudio", lambda s, k: Solution.deleteStudio(studio(k))),
+        ("deleteActor", lambda s, k: Solution.deleteActor(actor(k))),
+        ("deleteCritic", lambda s, k: Solution.deleteCritic(critic(k))),
+    ]
+
+
+# nearest-rank percentile of sorted values
+def percentile(values: list, p: float) -> float:
+    return values[max(math.ceil(p / 100 * len(values)) - 1, 0)]
+
+
+def summarize(nanoseconds: list) -> dict:
+    values = sorted(nanoseconds)
+    total = sum(values)
+    return {"calls": len(values), "p50_ms": percentile(values, 50) / 1e6, "p95_ms": percentile(values, 95) / 1e6,
+            "p99_ms": percentile(values, 99) / 1e6, "mean_ms": total / len(values) / 1e6,
+            "throughput": len(values) / (total / 1e9) if total else math.inf}
+
+
+def run(dataset: Dataset, iterations: int) -> dict:
+    results = {}
+    for name, call in cases(dataset):
+        sampler = dataset.sampler(len(results))  # the same keys in every run
+        timings = []
+        for k in range(iterations):
+            start = time.perf_counter_ns()
+            call(sampler, k)
+            timings.append(time.perf_counter_ns() - start)
+        results[name] = summarize(timings)
+    return results
+
+
+# name -> (old p50, new p50, ratio) for the functions slower than threshold times before, at p50 or p95
+def regressions(old: dict, new: dict, threshold=THRESHOLD) -> dict:
+    slower = {}
+    for name, result in new["results"].items():
+        before = old["results"].get(name)
+        if before is None:
+            continue
+        ratio = max(result[p] / before[p] if before[p] else 1.0 for p in ("p50_ms", "p95_ms"))
+        if ratio > threshold:
+            slower[name] = (before["p50_ms"], result["p50_ms"], ratio)
+    return slower
+
+
+def compare(old_file: str, new_file: str, threshold=THRESHOLD) -> int:
+    with open(old_file) as f:
+        old = json.load(f)
+    with open(new_file) as f:
+        new = json.load(f)
+    if old["meta"]["dataset"] != new["meta"]["dataset"] or old["meta"]["backend"] != new["meta"]["backend"]:
+        print("warning: the runs used different datasets or backends")
+    slower = regressions(old, new, threshold)
+    for name, result in new["results"].items():
+        before = old["results"].get(name)
+        if before is None:
+            print(name.ljust(26) + "new")
+            continue
+        print(name.ljust(26) + "p50 %.4fms -> %.4fms  p95 %.4fms -> %.4fms%s" % (
+            before["p50_ms"], result["p50_ms"], before["p95_ms"], result["p95_ms"],
+            "  REGRESSION x%.2f" % slower[name][2] if name in slower else ""))
+    return 1 if slower else 0
+
+
+def main(scale=10 ** 4, output="suite.json", iterations=200, caches=True) -> None:
+    if not caches:
+        Solution.configureProfileCache(enabled=False)
+        Solution.configureAdvancedCache(enabled=False)
+    dataset = Dataset(scale)
+    Solution.createTables()
+    try:
+        start = time.perf_counter()
+        dataset.load(Solution)
+        print("loaded %s in %.1fs" % (dataset.describe(), time.perf_counter() - start))
+        results = run(dataset, iterations)
+    finally:
+        Solution.dropTables()
+    for name, result in results.items():
+        print(name.ljust(26) + "p50=%.4fms  p95=%.4fms  p99=%.4fms  %.0f calls/s" % (
+            result["p50_ms"], result["p95_ms"], result["p99_ms"], result["throughput"]))
+    meta = {"dataset": dataset.describe(), "iterations": iterations, "caches": caches,
+            "backend": Config.get("connector", "backend") or Connector.dialect(),
+            "python": platform.python_version(), "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S")}
+    with open(output, "w") as f:
+        json.dump({"meta": meta, "results": results}, f, indent=2)
+    print("results written to " + output)
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1 and sys.argv[1] == "compare":
+        sys.exit(compare(sys.argv[2], sys.argv[3], float(sys.argv[4]) if len(sys.argv) > 4 else THRESHOLD))
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10 ** 4, sys.argv[2] if len(sys.argv) > 2 else "suite.json",
+         int(sys.argv[3]) if len(sys.argv) > 3 else 200, not (len(sys.argv) > 4 and sys.argv[4] == "nocache"))
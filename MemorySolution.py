@@ -0,0 +1,827 @@
+import re
+import threading
+from collections import namedtuple
+from typing import Iterable, Iterator, List, Tuple
+
+import Utility.Columnar as Columnar
+from Utility.Exceptions import DatabaseException
+from Utility.ReturnValue import ReturnValue
+
+from Business.Movie import Movie
+from Business.Studio import Studio
+from Business.Critic import Critic
+from Business.Actor import Actor
+
+# the Solution.py API without a database, for simulation and load tests. selected at import time with
+# backend=memory in the [connector] section of database.ini (or DB_CONNECTOR__BACKEND=memory): Solution.py then
+# re-exports every function of this module, AsyncSolution.py follows.
+# tables are dicts keyed by the primary keys of the SQL schema, with hash indexes on the foreign keys. every call
+# enforces the schema's NOT NULL / CHECK / UNIQUE / FOREIGN KEY constraints and ON DELETE CASCADE, reporting the
+# first violation in the order PostgreSQL does (NOT NULL and CHECK, then UNIQUE, then FOREIGN KEY), so the
+# ReturnValues are the same. values are converted to the column types as PostgreSQL would, a value it rejects is
+# an ERROR. text is ordered by code point (PostgreSQL's C collation).
+# calls are serialized by one lock, a transaction holds it for its whole block
+
+__all__ = ["transaction", "createTables", "clearTables", "dropTables",
+           "addCritic", "deleteCritic", "getCriticProfile", "addActor", "deleteActor", "getActorProfile",
+           "addMovie", "deleteMovie", "getMovieProfile", "addStudio", "deleteStudio", "getStudioProfile",
+           "criticRatedMovie", "criticDidntRateMovie", "actorPlayedInMovie", "actorDidntPlayInMovie",
+           "getActorsRoleInMovie", "studioProducedMovie", "studioDidntProduceMovie", "averageRating",
+           "averageActorRating", "bestPerformance", "stageCrewBudget", "overlyInvestedInMovie",
+           "franchiseRevenue", "studioRevenueByYear", "getFanCritics", "averageAgeByGenre", "getExclusiveActors",
+           "franchiseRevenueStream", "studioRevenueByYearStream", "getFanCriticsStream", "averageAgeByGenreStream",
+           "getExclusiveActorsStream", "franchiseRevenueColumns", "studioRevenueByYearColumns",
+           "getFanCriticsColumns", "averageAgeByGenreColumns", "getExclusiveActorsColumns",
+           "getIndexes", "verifyIndexes", "addCritics", "addActors", "addMovies", "addStudios", "bulkRated",
+           "bulkProduced", "bulkPlayedIn", "actorsPlayedInMovie", "averageRatings", "averageActorRatings",
+           "getActorProfiles"]
+
+_lock = threading.RLock()
+_transaction = None  # innermost transaction of the thread holding _lock
+_MISSING = object()
+
+GENRES = ("Drama", "Action", "Comedy", "Horror")
+_INT_MIN, _INT_MAX = -2 ** 31, 2 ** 31 - 1
+_INTEGER = re.compile(r"\s*[+-]?\d+\s*")
+
+
+# python value -> INTEGER column value, raises ValueError for what PostgreSQL would reject
+def _integer(value):
+    if type(value) is int and _INT_MIN <= value <= _INT_MAX:
+        return value
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        raise ValueError("boolean is not an integer")
+    if isinstance(value, float):
+        value = int(value + 0.5) if value >= 0 else -int(-value + 0.5)  # numeric -> integer rounds half away from 0
+    elif not isinstance(value, int):
+        value = str(value)
+        if not _INTEGER.fullmatch(value):
+            raise ValueError("invalid input syntax for type integer: " + value)
+        value = int(value)
+    if not _INT_MIN <= value <= _INT_MAX:
+        raise ValueError("integer out of range")
+    return value
+
+
+def _text(value):
+    if value is None:
+        return None
+    value = value if isinstance(value, str) else str(value)
+    if "\x00" in value:
+        raise ValueError("text can not contain NUL")
+    return value
+
+
+def _notNull(*values):
+    if any(value is None for value in values):
+        raise DatabaseException.NOT_NULL_VIOLATION("NOT_NULL_VIOLATION")
+
+
+def _check(condition):
+    if not condition:
+        raise DatabaseException.CHECK_VIOLATION("CHECK_VIOLATION")
+
+
+def _unique(table, key):
+    if key in table:
+        raise DatabaseException.UNIQUE_VIOLATION("UNIQUE_VIOLATION")
+
+
+def _references(table, key):
+    if key not in table:
+        raise DatabaseException.FOREIGN_KEY_VIOLATION("FOREIGN_KEY_VIOLATION")
+
+
+# ---------------------------------- tables ----------------------------------
+class _Tables:
+    def __init__(self):
+        self.critics = {}  # critic_id -> critic_name
+        self.actors = {}  # actor_id -> (actor_name, age, height)
+        self.movies = {}  # (movie_name, year) -> genre
+        self.studios = {}  # studio_id -> studio_name
+        self.played_in = {}  # (actor_id, movie_name, year) -> (salary, roles), roles are the PlayedInRole rows
+        self.produced = {}  # (movie_name, year) -> (studio_id, budget, revenue)
+        self.rated = {}  # (movie_name, year, critic_id) -> rating
+        # hash indexes
+        self.rated_by_movie = {}  # (movie_name, year) -> {critic_id}
+        self.rated_by_critic = {}  # critic_id -> {(movie_name, year)}
+        self.rating_stats = {}  # (movie_name, year) -> (SUM(rating), COUNT(*)), as MovieRatingStats
+        self.played_by_movie = {}  # (movie_name, year) -> {actor_id}
+        self.played_by_actor = {}  # actor_id -> {(movie_name, year)}
+        self.produced_by_studio = {}  # studio_id -> {(movie_name, year)}
+
+
+_tables = None  # None until createTables(), as after dropTables()
+
+
+def _db() -> _Tables:
+    if _tables is None:
+        raise DatabaseException.UNKNOWN_ERROR("relation does not exist")
+    return _tables
+
+
+# every change goes through these, inside a transaction they log how to undo it
+def _set(mapping, key, value):
+    old = mapping.get(key, _MISSING)
+    mapping[key] = value
+    if _transaction is not None:
+        _transaction.undo.append(lambda: mapping.pop(key) if old is _MISSING else mapping.__setitem__(key, old))
+
+
+def _pop(mapping, key):
+    old = mapping.pop(key)
+    if _transaction is not None:
+        _transaction.undo.append(lambda: mapping.__setitem__(key, old))
+    return old
+
+
+def _indexAdd(index, key, member):
+    members = index.get(key)
+    if members is None:
+        members = index[key] = set()
+    members.add(member)
+    if _transaction is not None:
+        _transaction.undo.append(lambda: members.discard(member))
+
+
+def _indexRemove(index, key, member):
+    members = index[key]
+    members.discard(member)
+    if _transaction is not None:
+        _transaction.undo.append(lambda: members.add(member))
+
+
+def _swapTables(tables):
+    global _tables
+    old = _tables
+    _tables = tables
+
+    def undo():
+        global _tables
+        _tables = old
+    if _transaction is not None:
+        _transaction.undo.append(undo)
+
+
+def _removeRating(db, key):
+    movie, critic_id = key[:2], key[2]
+    rating = _pop(db.rated, key)
+    _indexRemove(db.rated_by_movie, movie, critic_id)
+    _indexRemove(db.rated_by_critic, critic_id, movie)
+    total, count = db.rating_stats[movie]
+    if count == 1:
+        _pop(db.rating_stats, movie)
+    else:
+        _set(db.rating_stats, movie, (total - rating, count - 1))
+
+
+def _removePlayedIn(db, key):
+    actor_id, movie = key[0], key[1:]
+    _pop(db.played_in, key)
+    _indexRemove(db.played_by_movie, movie, actor_id)
+    _indexRemove(db.played_by_actor, actor_id, movie)
+
+
+def _removeProduced(db, movie):
+    studio_id = _pop(db.produced, movie)[0]
+    _indexRemove(db.produced_by_studio, studio_id, movie)
+
+
+# ---------------------------------- transactions ----------------------------------
+def currentTransaction():
+    with _lock:
+        return _transaction
+
+
+# same semantics as Solution.transaction(): the calls of the block are undone together by tx.rollback() or an
+# exception escaping the block, a nested transaction is a savepoint. the block holds the engine lock.
+# with savepoints=False a failing call aborts the block: later calls fail and the block is rolled back
+class Transaction:
+    def __init__(self, savepoints=True):
+        self.savepoints = savepoints
+        self.outer = None
+        self.undo = None
+        self.mark = 0
+        self.rollback_only = False
+        self.aborted = False
+        self.callbacks = []
+
+    def __enter__(self):
+        global _transaction
+        _lock.acquire()
+        self.outer = _transaction
+        self.undo = self.outer.undo if self.outer is not None else []
+        self.mark = len(self.undo)
+        _transaction = self
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        global _transaction
+        _transaction = self.outer
+        try:
+            if exc_type is not None or self.rollback_only or self.aborted:
+                while len(self.undo) > self.mark:
+                    self.undo.pop()()
+            if self.outer is not None:
+                self.outer.callbacks.extend(self.callbacks)
+            else:
+                for callback in self.callbacks:
+                    callback()
+        finally:
+            _lock.release()
+        return False
+
+    # commit the work so far, the transaction stays open
+    def commit(self):
+        if self.outer is not None:
+            raise DatabaseException.UNKNOWN_ERROR("Can not commit a nested transaction")
+        if self.aborted:
+            raise DatabaseException.UNKNOWN_ERROR("current transaction is aborted")
+        self.undo.clear()
+        self.mark = 0
+
+    # discard the work of this transaction when the block ends
+    def rollback(self):
+        self.rollback_only = True
+
+    # run callback once the outermost transaction ended, whether it committed or not
+    def afterEnd(self, callback):
+        self.callbacks.append(callback)
+
+
+def transaction(savepoints=True) -> Transaction:
+    return Transaction(savepoints)
+
+
+_VIOLATIONS = ((DatabaseException.NOT_NULL_VIOLATION, ReturnValue.BAD_PARAMS),
+               (DatabaseException.CHECK_VIOLATION, ReturnValue.BAD_PARAMS),
+               (DatabaseException.UNIQUE_VIOLATION, ReturnValue.ALREADY_EXISTS),
+               (DatabaseException.FOREIGN_KEY_VIOLATION, ReturnValue.NOT_EXISTS))
+
+
+# runs a write, its constraint violation as a ReturnValue. a write either applies completely or not at all
+def _write(function, *args) -> ReturnValue:
+    with _lock:
+        tx = _transaction
+        if tx is not None and tx.aborted:
+            return ReturnValue.ERROR
+        try:
+            return function(_db(), *args) or ReturnValue.OK
+        except Exception as e:
+            res = next((value for violation, value in _VIOLATIONS if isinstance(e, violation)), ReturnValue.ERROR)
+            if tx is not None and not tx.savepoints:
+                tx.aborted = True
+            return res
+
+
+# runs a read, default on any error
+def _read(function, default, *args):
+    with _lock:
+        tx = _transaction
+        if tx is not None and tx.aborted:
+            return default
+        try:
+            return function(_db(), *args)
+        except Exception as e:
+            print(e)
+            if tx is not None and not tx.savepoints:
+                tx.aborted = True
+            return default
+
+
+# ---------------------------------- CRUD API: ----------------------------------
+
+def createTables():
+    with _lock:
+        if _tables is None:
+            _swapTables(_Tables())
+
+
+def clearTables():
+    with _lock:
+        if _tables is not None:
+            _swapTables(_Tables())
+
+
+def dropTables():
+    with _lock:
+        _swapTables(None)
+
+
+def _addCritic(db, critic_id, critic_name):
+    critic_id, critic_name = _integer(critic_id), _text(critic_name)
+    _notNull(critic_id, critic_name)
+    _check(critic_id > 0)
+    _unique(db.critics, critic_id)
+    _set(db.critics, critic_id, critic_name)
+
+
+def addCritic(critic: Critic) -> ReturnValue:
+    return _write(_addCritic, critic.getCriticID(), critic.getName())
+
+
+def _deleteCritic(db, critic_id):
+    critic_id = _integer(critic_id)
+    if critic_id not in db.critics:
+        return ReturnValue.NOT_EXISTS
+    for movie in list(db.rated_by_critic.get(critic_id, ())):
+        _removeRating(db, movie + (critic_id,))
+    _pop(db.critics, critic_id)
+
+
+def deleteCritic(critic_id: int) -> ReturnValue:
+    return _write(_deleteCritic, critic_id)
+
+
+def _getCriticProfile(db, critic_id):
+    critic_id = _integer(critic_id)
+    if critic_id not in db.critics:
+        return Critic.badCritic()
+    return Critic(critic_id=critic_id, critic_name=db.critics[critic_id])
+
+
+def getCriticProfile(critic_id: int) -> Critic:
+    return _read(_getCriticProfile, Critic.badCritic(), critic_id)
+
+
+def _addActor(db, actor_id, actor_name, age, height):
+    actor_id, actor_name, age, height = _integer(actor_id), _text(actor_name), _integer(age), _integer(height)
+    _notNull(actor_id, actor_name, age, height)
+    _check(actor_id > 0 and age > 0 and height > 0)
+    _unique(db.actors, actor_id)
+    _set(db.actors, actor_id, (actor_name, age, height))
+
+
+def addActor(actor: Actor) -> ReturnValue:
+    return _write(_addActor, actor.getActorID(), actor.getActorName(), actor.getAge(), actor.getHeight())
+
+
+def _deleteActor(db, actor_id):
+    actor_id = _integer(actor_id)
+    if actor_id not in db.actors:
+        return ReturnValue.NOT_EXISTS
+    for movie in list(db.played_by_actor.get(actor_id, ())):
+        _removePlayedIn(db, (actor_id,) + movie)
+    _pop(db.actors, actor_id)
+
+
+def deleteActor(actor_id: int) -> ReturnValue:
+    return _write(_deleteActor, actor_id)
+
+
+def _getActorProfile(db, actor_id):
+    actor_id = _integer(actor_id)
+    if actor_id not in db.actors:
+        return Actor.badActor()
+    actor_name, age, height = db.actors[actor_id]
+    return Actor(actor_id=actor_id, actor_name=actor_name, age=age, height=height)
+
+
+def getActorProfile(actor_id: int) -> Actor:
+    return _read(_getActorProfile, Actor.badActor(), actor_id)
+
+
+def _addMovie(db, movie_name, year, genre):
+    movie_name, year, genre = _text(movie_name), _integer(year), _text(genre)
+    _notNull(movie_name, year, genre)
+    _check(year >= 1895 and genre in GENRES)
+    _unique(db.movies, (movie_name, year))
+    _set(db.movies, (movie_name, year), genre)
+
+
+def addMovie(movie: Movie) -> ReturnValue:
+    return _write(_addMovie, movie.getMovieName(), movie.getYear(), movie.getGenre())
+
+
+def _deleteMovie(db, movie_name, year):
+    movie = (_text(movie_name), _integer(year))
+    if movie not in db.movies:
+        return ReturnValue.NOT_EXISTS
+    for actor_id in list(db.played_by_movie.get(movie, ())):
+        _removePlayedIn(db, (actor_id,) + movie)
+    for critic_id in list(db.rated_by_movie.get(movie, ())):
+        _removeRating(db, movie + (critic_id,))
+    if movie in db.produced:
+        _removeProduced(db, movie)
+    _pop(db.movies, movie)
+
+
+def deleteMovie(movie_name: str, year: int) -> ReturnValue:
+    return _write(_deleteMovie, movie_name, year)
+
+
+def _getMovieProfile(db, movie_name, year):
+    movie = (_text(movie_name), _integer(year))
+    if movie not in db.movies:
+        return Movie.badMovie()
+    return Movie(movie_name=movie[0], year=movie[1], genre=db.movies[movie])
+
+
+def getMovieProfile(movie_name: str, year: int) -> Movie:
+    return _read(_getMovieProfile, Movie.badMovie(), movie_name, year)
+
+
+def _addStudio(db, studio_id, studio_name):
+    studio_id, studio_name = _integer(studio_id), _text(studio_name)
+    _notNull(studio_id, studio_name)
+    _check(studio_id > 0)
+    _unique(db.studios, studio_id)
+    _set(db.studios, studio_id, studio_name)
+
+
+def addStudio(studio: Studio) -> ReturnValue:
+    return _write(_addStudio, studio.getStudioID(), studio.getStudioName())
+
+
+def _deleteStudio(db, studio_id):
+    studio_id = _integer(studio_id)
+    if studio_id not in db.studios:
+        return ReturnValue.NOT_EXISTS
+    for movie in list(db.produced_by_studio.get(studio_id, ())):
+        _removeProduced(db, movie)
+    _pop(db.studios, studio_id)
+
+
+def deleteStudio(studio_id: int) -> ReturnValue:
+    return _write(_deleteStudio, studio_id)
+
+
+def _getStudioProfile(db, studio_id):
+    studio_id = _integer(studio_id)
+    if studio_id not in db.studios:
+        return Studio.badStudio()
+    return Studio(studio_id=studio_id, studio_name=db.studios[studio_id])
+
+
+def getStudioProfile(studio_id: int) -> Studio:
+    return _read(_getStudioProfile, Studio.badStudio(), studio_id)
+
+
+# -----------------------------------------Basic API--------------------------------------------------------
+
+def _criticRatedMovie(db, movie_name, year, critic_id, rating):
+    movie_name, year, critic_id, rating = _text(movie_name), _integer(year), _integer(critic_id), _integer(rating)
+    _notNull(movie_name, year, critic_id, rating)
+    _check(1 <= rating <= 5)
+    movie = (movie_name, year)
+    _unique(db.rated, movie + (critic_id,))
+    _references(db.movies, movie)
+    _references(db.critics, critic_id)
+    _set(db.rated, movie + (critic_id,), rating)
+    _indexAdd(db.rated_by_movie, movie, critic_id)
+    _indexAdd(db.rated_by_critic, critic_id, movie)
+    total, count = db.rating_stats.get(movie, (0, 0))
+    _set(db.rating_stats, movie, (total + rating, count + 1))
+
+
+def criticRatedMovie(movieName: str, movieYear: int, criticID: int, rating: int) -> ReturnValue:
+    return _write(_criticRatedMovie, movieName, movieYear, criticID, rating)
+
+
+def _criticDidntRateMovie(db, movie_name, year, critic_id):
+    key = (_text(movie_name), _integer(year), _integer(critic_id))
+    if key not in db.rated:
+        return ReturnValue.NOT_EXISTS
+    _removeRating(db, key)
+
+
+def criticDidntRateMovie(movieName: str, movieYear: int, criticID: int) -> ReturnValue:
+    return _write(_criticDidntRateMovie, movieName, movieYear, criticID)
+
+
+# the PlayedIn row first, then one PlayedInRole row per role in order, as the two INSERTs of Solution.py
+def _actorPlayedInMovie(db, movie_name, year, actor_id, salary, roles):
+    movie_name, year, actor_id, salary = _text(movie_name), _integer(year), _integer(actor_id), _integer(salary)
+    roles = [_text(role) for role in roles] if roles is not None else None
+    num_roles = len(roles) if roles is not None else None
+    _notNull(movie_name, year, actor_id, salary, num_roles)
+    _check(salary > 0 and num_roles > 0)
+    movie = (movie_name, year)
+    _unique(db.played_in, (actor_id,) + movie)
+    _references(db.movies, movie)
+    _references(db.actors, actor_id)
+    seen = set()
+    for role in roles:
+        _notNull(role)
+        _unique(seen, role)
+        seen.add(role)
+    _set(db.played_in, (actor_id,) + movie, (salary, tuple(roles)))
+    _indexAdd(db.played_by_movie, movie, actor_id)
+    _indexAdd(db.played_by_actor, actor_id, movie)
+
+
+def actorPlayedInMovie(movieName: str, movieYear: int, actorID: int, salary: int, roles: List[str]) -> ReturnValue:
+    return _write(_actorPlayedInMovie, movieName, movieYear, actorID, salary, roles)
+
+
+def _actorDidntPlayInMovie(db, movie_name, year, actor_id):
+    key = (_integer(actor_id), _text(movie_name), _integer(year))
+    if key not in db.played_in:
+        return ReturnValue.NOT_EXISTS
+    _removePlayedIn(db, key)
+
+
+def actorDidntPlayInMovie(movieName: str, movieYear: int, actorID: int) -> ReturnValue:
+    return _write(_actorDidntPlayInMovie, movieName, movieYear, actorID)
+
+
+def _getActorsRoleInMovie(db, actor_id, movie_name, year):
+    played = db.played_in.get((_integer(actor_id), _text(movie_name), _integer(year)))
+    return sorted(played[1], reverse=True) if played is not None else []
+
+
+def getActorsRoleInMovie(actor_id: int, movie_name: str, movieYear: int):
+    return _read(_getActorsRoleInMovie, [], actor_id, movie_name, movieYear)
+
+
+def _studioProducedMovie(db, studio_id, movie_name, year, budget, revenue):
+    movie_name, year, studio_id = _text(movie_name), _integer(year), _integer(studio_id)
+    budget, revenue = _integer(budget), _integer(revenue)
+    _notNull(movie_name, year, studio_id, budget, revenue)
+    _check(budget >= 0 and revenue >= 0)
+    movie = (movie_name, year)
+    _unique(db.produced, movie)
+    _references(db.movies, movie)
+    _references(db.studios, studio_id)
+    _set(db.produced, movie, (studio_id, budget, revenue))
+    _indexAdd(db.produced_by_studio, studio_id, movie)
+
+
+def studioProducedMovie(studioID: int, movieName: str, movieYear: int, budget: int, revenue: int) -> ReturnValue:
+    return _write(_studioProducedMovie, studioID, movieName, movieYear, budget, revenue)
+
+
+def _studioDidntProduceMovie(db, studio_id, movie_name, year):
+    movie = (_text(movie_name), _integer(year))
+    produced = db.produced.get(movie)
+    if produced is None or produced[0] != _integer(studio_id):
+        return ReturnValue.NOT_EXISTS
+    _removeProduced(db, movie)
+
+
+def studioDidntProduceMovie(studioID: int, movieName: str, movieYear: int) -> ReturnValue:
+    return _write(_studioDidntProduceMovie, studioID, movieName, movieYear)
+
+
+# AVG(rating) of the movie, 0 without ratings
+def _movieAverage(db, movie) -> float:
+    stats = db.rating_stats.get(movie)
+    return stats[0] / stats[1] if stats is not None else float(0)
+
+
+def _averageRating(db, movie_name, year):
+    return _movieAverage(db, (_text(movie_name), _integer(year)))
+
+
+def averageRating(movieName: str, movieYear: int) -> float:
+    return _read(_averageRating, float(0), movieName, movieYear)
+
+
+def _averageActorRating(db, actor_id):
+    movies = db.played_by_actor.get(_integer(actor_id))
+    if not movies:
+        return float(0)
+    return sum(_movieAverage(db, movie) for movie in movies) / len(movies)
+
+
+def averageActorRating(actorID: int) -> float:
+    return _read(_averageActorRating, float(0), actorID)
+
+
+# highest average, then the older movie, then the larger name
+def _bestPerformance(db, actor_id):
+    movies = db.played_by_actor.get(_integer(actor_id))
+    if not movies:
+        return Movie.badMovie()
+    movies = sorted(movies, key=lambda movie: movie[0], reverse=True)
+    movies.sort(key=lambda movie: movie[1])
+    best = max(movies, key=lambda movie: _movieAverage(db, movie))  # the first of the maximal ones
+    return Movie(movie_name=best[0], year=best[1], genre=db.movies[best])
+
+
+def bestPerformance(actor_id: int) -> Movie:
+    return _read(_bestPerformance, Movie.badMovie(), actor_id)
+
+
+def _stageCrewBudget(db, movie_name, year):
+    movie = (_text(movie_name), _integer(year))
+    if movie not in db.movies:
+        return -1
+    budget = db.produced[movie][1] if movie in db.produced else 0
+    return budget - sum(db.played_in[(actor_id,) + movie][0] for actor_id in db.played_by_movie.get(movie, ()))
+
+
+def stageCrewBudget(movieName: str, movieYear: int) -> int:
+    return _read(_stageCrewBudget, -1, movieName, movieYear)
+
+
+def _overlyInvestedInMovie(db, movie_name, year, actor_id):
+    movie = (_text(movie_name), _integer(year))
+    played = db.played_in.get((_integer(actor_id),) + movie)
+    if played is None:
+        return False
+    total = sum(len(db.played_in[(other,) + movie][1]) for other in db.played_by_movie[movie])
+    return len(played[1]) / total >= 0.5
+
+
+def overlyInvestedInMovie(movie_name: str, movie_year: int, actor_id: int) -> bool:
+    return _read(_overlyInvestedInMovie, False, movie_name, movie_year, actor_id)
+
+
+# ---------------------------------- ADVANCED API: ----------------------------------
+
+def _franchiseRevenue(db):
+    revenues = dict.fromkeys((movie_name for movie_name, _ in db.movies), 0)
+    for (movie_name, _), (_, _, revenue) in db.produced.items():
+        revenues[movie_name] += revenue
+    return sorted(revenues.items(), reverse=True)
+
+
+def franchiseRevenue() -> List[Tuple[str, int]]:
+    return _read(_franchiseRevenue, [])
+
+
+def _studioRevenueByYear(db):
+    revenues = {}
+    for (_, year), (studio_id, _, revenue) in db.produced.items():
+        revenues[(studio_id, year)] = revenues.get((studio_id, year), 0) + revenue
+    return sorted(((studio_id, year, revenue) for (studio_id, year), revenue in revenues.items()), reverse=True)
+
+
+def studioRevenueByYear() -> List[Tuple[int, int, int]]:
+    return _read(_studioRevenueByYear, [])
+
+
+# critics that rated every movie of a studio (that produced at least one)
+def _getFanCritics(db):
+    fans = []
+    for studio_id, movies in db.produced_by_studio.items():
+        if not movies:
+            continue
+        counts = {}
+        for movie in movies:
+            for critic_id in db.rated_by_movie.get(movie, ()):
+                counts[critic_id] = counts.get(critic_id, 0) + 1
+        fans.extend((critic_id, studio_id) for critic_id, count in counts.items() if count == len(movies))
+    return sorted(fans, reverse=True)
+
+
+def getFanCritics() -> List[Tuple[int, int]]:
+    return _read(_getFanCritics, [])
+
+
+# average age of the actors that played in a movie of the genre, each actor counted once
+def _averageAgeByGenre(db):
+    actors = {}
+    for (actor_id, movie_name, year) in db.played_in:
+        actors.setdefault(db.movies[(movie_name, year)], set()).add(actor_id)
+    return sorted((genre, sum(db.actors[actor_id][1] for actor_id in ids) / len(ids)) for genre, ids in actors.items())
+
+
+def averageAgeByGenre() -> List[Tuple[str, float]]:
+    return _read(_averageAgeByGenre, [])
+
+
+# actors whose produced movies all come from one studio
+def _getExclusiveActors(db):
+    exclusive = []
+    for actor_id, movies in db.played_by_actor.items():
+        studios = set(db.produced[movie][0] for movie in movies if movie in db.produced)
+        if len(studios) == 1:
+            exclusive.append((actor_id, studios.pop()))
+    return sorted(exclusive, reverse=True)
+
+
+def getExclusiveActors() -> List[Tuple[int, int]]:
+    return _read(_getExclusiveActors, [])
+
+
+# ---------------------------------- STREAMING / COLUMNAR ADVANCED API: ----------------------------------
+# the results are computed at once, fetchSize is accepted for compatibility.
+# columns carry the PostgreSQL type OIDs of the SQL results, so Columnar builds the same typed arrays
+Column = namedtuple("Column", ["name", "type_code"])
+_INT4, _INT8, _FLOAT8, _TEXT = 23, 20, 701, 25
+DESCRIPTIONS = {
+    "franchiseRevenue": [Column("movie_name", _TEXT), Column("revenue", _INT8)],
+    "studioRevenueByYear": [Column("studio_id", _INT4), Column("year", _INT4), Column("total_revenue", _INT8)],
+    "getFanCritics": [Column("critic_id", _INT4), Column("studio_id", _INT4)],
+    "averageAgeByGenre": [Column("genre", _TEXT), Column("avg", _FLOAT8)],
+    "getExclusiveActors": [Column("actor_id", _INT4), Column("studio_id", _INT4)],
+}
+
+
+def _stream(rows):
+    yield from rows
+
+
+def franchiseRevenueStream(fetchSize=None) -> Iterator[Tuple[str, int]]:
+    return _stream(franchiseRevenue())
+
+
+def studioRevenueByYearStream(fetchSize=None) -> Iterator[Tuple[int, int, int]]:
+    return _stream(studioRevenueByYear())
+
+
+def getFanCriticsStream(fetchSize=None) -> Iterator[Tuple[int, int]]:
+    return _stream(getFanCritics())
+
+
+def averageAgeByGenreStream(fetchSize=None) -> Iterator[Tuple[str, float]]:
+    return _stream(averageAgeByGenre())
+
+
+def getExclusiveActorsStream(fetchSize=None) -> Iterator[Tuple[int, int]]:
+    return _stream(getExclusiveActors())
+
+
+def franchiseRevenueColumns(fetchSize=None) -> Columnar.Columns:
+    return Columnar.fromRows(DESCRIPTIONS["franchiseRevenue"], franchiseRevenue())
+
+
+def studioRevenueByYearColumns(fetchSize=None) -> Columnar.Columns:
+    return Columnar.fromRows(DESCRIPTIONS["studioRevenueByYear"], studioRevenueByYear())
+
+
+def getFanCriticsColumns(fetchSize=None) -> Columnar.Columns:
+    return Columnar.fromRows(DESCRIPTIONS["getFanCritics"], getFanCritics())
+
+
+def averageAgeByGenreColumns(fetchSize=None) -> Columnar.Columns:
+    return Columnar.fromRows(DESCRIPTIONS["averageAgeByGenre"], averageAgeByGenre())
+
+
+def getExclusiveActorsColumns(fetchSize=None) -> Columnar.Columns:
+    return Columnar.fromRows(DESCRIPTIONS["getExclusiveActors"], getExclusiveActors())
+
+
+# ---------------------------------- INDEX INSPECTION: ----------------------------------
+# the hash indexes, named after the PostgreSQL index serving the same lookups: (table, index, definition)
+def getIndexes() -> List[Tuple[str, str, str]]:
+    return [("playedin", "playedin_movie_idx", "played_by_movie HASH (movie_name, year)"),
+            ("playedin", "playedin_pkey", "played_by_actor HASH (actor_id)"),
+            ("produced", "produced_studio_year_idx", "produced_by_studio HASH (studio_id)"),
+            ("rated", "rated_critic_idx", "rated_by_critic HASH (critic_id)"),
+            ("rated", "rated_pkey", "rated_by_movie HASH (movie_name, year)")]
+
+
+def verifyIndexes() -> List[str]:
+    return []
+
+
+# ---------------------------------- BULK API: ----------------------------------
+# one call per row, in one transaction: the same ReturnValues as the single-row functions
+
+def _bulk(function, rows) -> List[ReturnValue]:
+    with transaction():
+        return [function(*row) for row in rows]
+
+
+def addCritics(critics: Iterable[Critic]) -> List[ReturnValue]:
+    return _bulk(addCritic, ((critic,) for critic in critics))
+
+
+def addActors(actors: Iterable[Actor]) -> List[ReturnValue]:
+    return _bulk(addActor, ((actor,) for actor in actors))
+
+
+def addMovies(movies: Iterable[Movie]) -> List[ReturnValue]:
+    return _bulk(addMovie, ((movie,) for movie in movies))
+
+
+def addStudios(studios: Iterable[Studio]) -> List[ReturnValue]:
+    return _bulk(addStudio, ((studio,) for studio in studios))
+
+
+def bulkRated(ratings: Iterable[Tuple[str, int, int, int]]) -> List[ReturnValue]:
+    return _bulk(criticRatedMovie, ratings)
+
+
+def bulkProduced(productions: Iterable[Tuple[int, str, int, int, int]]) -> List[ReturnValue]:
+    return _bulk(studioProducedMovie, productions)
+
+
+def bulkPlayedIn(casts: Iterable[Tuple[str, int, int, int, List[str]]]) -> List[ReturnValue]:
+    return _bulk(actorPlayedInMovie, casts)
+
+
+def actorsPlayedInMovie(movieName: str, movieYear: int, cast: Iterable[Tuple[int, int, List[str]]]) -> List[ReturnValue]:
+    return bulkPlayedIn((movieName, movieYear, actorID, salary, roles) for actorID, salary, roles in cast)
+
+
+# ---------------------------------- BATCH API: ----------------------------------
+
+def averageRatings(movies: Iterable[Tuple[str, int]]) -> List[float]:
+    with _lock:
+        return [averageRating(movie_name, year) for movie_name, year in movies]
+
+
+def averageActorRatings(actor_ids: Iterable[int]) -> List[float]:
+    with _lock:
+        return [averageActorRating(actor_id) for actor_id in actor_ids]
+
+
+def getActorProfiles(actor_ids: Iterable[int]) -> List[Actor]:
+    with _lock:
+        return [getActorProfile(actor_id) for actor_id in actor_ids]
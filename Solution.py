@@ -1,7 +1,11 @@
-from typing import List, Tuple
+import re
+from typing import Iterable, Iterator, List, Tuple
 from psycopg2 import sql
 
+import Utility.Columnar as Columnar
+import Utility.Config as Config
 import Utility.DBConnector as Connector
+from Utility.Cache import DependencyCache, LRUCache
 from Utility.ReturnValue import ReturnValue
 from Utility.Exceptions import DatabaseException
 from Utility.DBConnector import ResultSet
@@ -54,72 +58,768 @@ def ConvertResultSetToList(result_set: ResultSet, rows_affected: int) -> List:
             res.append(result_set.rows[i][0])
     return res
 
+
+# ---------------------------------- profile cache ----------------------------------
+# get*Profile results keyed by primary key, including "not found" results. add*/delete* invalidate their key,
+# nothing else changes an entity row (cascades only remove relation rows). results read inside a transaction
+# are not cached since they may never commit. configure in the [cache] section of database.ini
+_profile_cache = LRUCache(capacity=Config.getInt("cache", "profile_capacity", 10000),
+                          ttl=Config.getFloat("cache", "profile_ttl"),
+                          enabled=Config.getBool("cache", "profile_enabled", True))
+
+
+# enabled=False turns the cache off for strict consistency (e.g. other processes write to the database)
+def configureProfileCache(enabled=True, capacity=10000, ttl=None) -> None:
+    _profile_cache.enabled = enabled
+    _profile_cache.capacity = capacity
+    _profile_cache.ttl = ttl
+    _profile_cache.clear()
+
+
+def profileCacheStats() -> dict:
+    return _profile_cache.stats()
+
+
+_PROFILE_KEY_TYPES = {"critic": (int,), "actor": (int,), "studio": (int,), "movie": (str, int)}
+
+
+# a key only when the values have the column's exact python type, "1" and 1 are the same row for the database
+def _profileKey(kind: str, *values):
+    for value, value_type in zip(values, _PROFILE_KEY_TYPES[kind]):
+        if type(value) is not value_type:
+            return None
+    return (kind,) + values
+
+
+def _cachedProfile(key):
+    return _profile_cache.get(key) if key is not None else None
+
+
+# nor results a read replica served: it may lag behind a write that already invalidated the key
+def _cacheProfile(key, value, token, conn) -> None:
+    if key is not None and Connector.currentTransaction() is None and conn.replica is None:
+        _profile_cache.put(key, value, token)
+
+
+# also invalidated once the surrounding transaction ends, a concurrent reader may have cached the old row meanwhile
+def _invalidateProfile(key) -> None:
+    invalidate = _profile_cache.clear if key is None else (lambda: _profile_cache.invalidate(key))
+    invalidate()
+    tx = Connector.currentTransaction()
+    if tx is not None:
+        tx.afterEnd(invalidate)
+
+
+# ---------------------------------- advanced cache ----------------------------------
+# Advanced API results, served until a Solution.py write touches one of the tables (or views' base tables)
+# the query reads. configure in the [cache] section of database.ini
+_advanced_cache = DependencyCache(capacity=Config.getInt("cache", "advanced_capacity", 1000),
+                                  ttl=Config.getFloat("cache", "advanced_ttl"),
+                                  enabled=Config.getBool("cache", "advanced_enabled", True))
+
+ADVANCED_DEPENDENCIES = {
+    "franchiseRevenue": ("Movies", "Produced"),
+    "studioRevenueByYear": ("Produced",),
+    "getFanCritics": ("Rated", "Produced"),
+    "averageAgeByGenre": ("PlayedIn", "Actors", "Movies"),
+    "getExclusiveActors": ("PlayedIn", "Produced"),  # actor_movie_studio
+}
+
+# tables whose rows are deleted together with a row of the key (ON DELETE CASCADE and triggers)
+CASCADES = {
+    "Movies": ("PlayedIn", "Produced", "Rated", "MovieRatingStats"),
+    "Actors": ("PlayedIn",),
+    "Critics": ("Rated",),
+    "Studios": ("Produced",),
+    "PlayedIn": ("PlayedInRole",),
+    "Rated": ("MovieRatingStats",),
+}
+
+
+# enabled=False turns the cache off for strict consistency (e.g. other processes write to the database)
+def configureAdvancedCache(enabled=True, capacity=1000, ttl=None) -> None:
+    _advanced_cache.configure(enabled, capacity, ttl)
+
+
+def advancedCacheStats() -> dict:
+    return _advanced_cache.stats()
+
+
+# the rows of a cached Advanced API call (a copy, callers may modify it), None on a miss
+def _cachedAdvanced(name: str):
+    rows = _advanced_cache.get(name, ADVANCED_DEPENDENCIES[name])
+    return list(rows) if rows is not None else None
+
+
+def _advancedVersions(name: str) -> tuple:
+    return _advanced_cache.versions(ADVANCED_DEPENDENCIES[name])
+
+
+# results read inside a transaction or from a read replica are not cached, see _cacheProfile
+def _cacheAdvanced(name: str, rows, versions, conn) -> None:
+    if Connector.currentTransaction() is None and conn.replica is None:
+        _advanced_cache.put(name, list(rows), versions)
+
+
+# tables written by a Solution.py call, with their cascades when rows were deleted. None means every table
+def _invalidateTables(tables, deleted=False) -> None:
+    if tables is None:
+        invalidate = _advanced_cache.clear
+    else:
+        written = set()
+        pending = list(tables)
+        while pending:
+            table = pending.pop()
+            if table not in written:
+                written.add(table)
+                if deleted:
+                    pending.extend(CASCADES.get(table, ()))
+        invalidate = lambda: _advanced_cache.invalidate(*written)
+    invalidate()
+    tx = Connector.currentTransaction()
+    if tx is not None:
+        tx.afterEnd(invalidate)
+
+
+# ---------------------------------- transactions ----------------------------------
+# with transaction() as tx:
+#     addActor(...)
+#     actorPlayedInMovie(...)
+# every call inside the block shares one connection and one commit. each call still returns its usual
+# ReturnValue: a failing statement is rolled back to its savepoint without aborting the rest of the block.
+# tx.rollback() discards the whole block, an exception escaping the block does the same.
+# savepoints=False saves two round trips per statement, but then a failing call aborts the whole block
+def transaction(savepoints=True) -> Connector.Transaction:
+    return Connector.Transaction(savepoints)
+
+
+# ---------------------------------- prepared statements ----------------------------------
+# every point query is PREPAREd once per pooled connection and EXECUTEd with bound parameters afterwards.
+# the texts are portable SQL, dialects= holds the SQLite text where PostgreSQL's arrays / functions are used
+Connector.DBConnector.prepare("addCritic", "INSERT INTO Critics(critic_id, critic_name) VALUES($1, $2)")
+Connector.DBConnector.prepare("deleteCritic", "DELETE FROM Critics WHERE critic_id=$1")
+Connector.DBConnector.prepare("getCriticProfile", "SELECT * FROM Critics WHERE critic_id=$1")
+Connector.DBConnector.prepare("addActor", "INSERT INTO Actors(actor_id, actor_name, age, height) VALUES($1, $2, $3, $4)")
+Connector.DBConnector.prepare("deleteActor", "DELETE FROM Actors WHERE actor_id=$1")
+Connector.DBConnector.prepare("getActorProfile", "SELECT * FROM Actors WHERE actor_id=$1")
+Connector.DBConnector.prepare("addMovie", "INSERT INTO Movies(movie_name, year, genre) VALUES($1, $2, $3)")
+Connector.DBConnector.prepare("deleteMovie", "DELETE FROM Movies WHERE movie_name=$1 AND year=$2")
+Connector.DBConnector.prepare("getMovieProfile", "SELECT * FROM Movies WHERE movie_name=$1 AND year=$2")
+Connector.DBConnector.prepare("addStudio", "INSERT INTO Studios(studio_id, studio_name) VALUES($1, $2)")
+Connector.DBConnector.prepare("deleteStudio", "DELETE FROM Studios WHERE studio_id=$1")
+Connector.DBConnector.prepare("getStudioProfile", "SELECT * FROM Studios WHERE studio_id=$1")
+Connector.DBConnector.prepare("criticRatedMovie", "INSERT INTO Rated(movie_name,year,critic_id,rating) VALUES($1,$2,$3,$4)")
+Connector.DBConnector.prepare("criticDidntRateMovie", "DELETE FROM Rated WHERE movie_name=$1 AND year=$2 AND critic_id=$3")
+Connector.DBConnector.prepare("actorPlayedInMovie", "SELECT actor_played_in_movie($1, $2, $3, $4, $5, $6)",
+                              ["TEXT", "INTEGER", "INTEGER", "INTEGER", "INTEGER", "TEXT[]"],
+                              dialects={"sqlite": [
+                                  "INSERT INTO PlayedIn(actor_id, movie_name, year, salary, num_roles)\
+                                  VALUES($3, $1, $2, $4, $5)",
+                                  "INSERT INTO PlayedInRole(actor_id, movie_name, year, actor_role)\
+                                  SELECT $3, $1, $2, value FROM json_each($6) ORDER BY key"]})
+Connector.DBConnector.prepare("actorDidntPlayInMovie",
+                              "DELETE FROM PlayedIn WHERE movie_name=$1 AND year=$2 AND actor_id=$3")
+Connector.DBConnector.prepare("getActorsRoleInMovie", "select actor_role\
+                        from playedinrole\
+                        where actor_id=$1 AND movie_name=$2 and year=$3 \
+                        ORDER BY actor_role DESC")
+Connector.DBConnector.prepare("studioProducedMovie",
+                              "INSERT INTO Produced(movie_name,year,studio_id,budget,revenue) VALUES($1,$2,$3,$4,$5)")
+Connector.DBConnector.prepare("studioDidntProduceMovie",
+                              "DELETE FROM Produced WHERE movie_name=$1 AND year=$2 AND studio_id=$3")
+Connector.DBConnector.prepare("averageRating", "SELECT CAST(average AS FLOAT) FROM movie_avg_rating where movie_name=$1 And year=$2")
+Connector.DBConnector.prepare("averageActorRating", "SELECT CAST(COALESCE(AVG(average),0) AS FLOAT) AS avg_rating \
+                        FROM actor_movie_avg_rating where actor_id=$1")
+Connector.DBConnector.prepare("bestPerformance", "SELECT ac.movie_name, ac.year , mo.genre \
+                        FROM actor_movie_avg_rating ac LEFT JOIN movies mo ON ac.movie_name = mo.movie_name and ac.year = mo.year \
+                        where actor_id=$1 \
+                        ORDER BY average desc, ac.year ASC, ac.movie_name DESC LIMIT 1")
+# the year is repeated on the joined tables, so a partitioned layout (see _partitioned) prunes them at plan time
+Connector.DBConnector.prepare("stageCrewBudget", "SELECT q.budget - SUM(COALESCE (pl.salary,0)) as diff\
+                        FROM (\
+                        SELECT s.movie_name, s.year , COALESCE (pr.budget, 0) as budget \
+                        from movies s LEFT JOIN produced pr ON s.movie_name = pr.movie_name AND s.year = pr.year AND pr.year = $2 \
+                        WHERE s.movie_name = $1 and s.year = $2 \
+                        )q LEFT JOIN playedin pl on q.movie_name = pl.movie_name AND q.year = pl.year AND pl.year = $2\
+                        GROUP BY q.movie_name, q.year, q.budget")
+Connector.DBConnector.prepare("overlyInvestedInMovie", "SELECT * \
+        FROM(\
+        SELECT CAST(num_roles AS FLOAT)/total as res\
+        FROM (\
+        SELECT movie_name, year, SUM(num_roles) as total\
+        from playedin\
+        WHERE movie_name = $1 and year = $2\
+        GROUP BY movie_name, year\
+        ) aa join (\
+        SELECT movie_name, year, actor_id, num_roles\
+        FROM playedin\
+        WHERE movie_name = $1 and year = $2 AND actor_id = $3\
+        ) bb on aa.movie_name = bb.movie_name And aa.year = bb.year\
+        ) as q\
+        WHERE res >= 0.5")
+# batched point queries: the keys are unnested WITH ORDINALITY, so the answers come back in input order.
+# SQLite gets the arrays as JSON, json_each's key is the ordinal
+Connector.DBConnector.prepare("averageRatings", "SELECT CAST(COALESCE(r.average, 0) AS FLOAT) \
+                        FROM unnest($1, $2) WITH ORDINALITY AS k(movie_name, year, ord) \
+                        LEFT JOIN movie_avg_rating r ON r.movie_name = k.movie_name AND r.year = k.year \
+                        ORDER BY k.ord", ["TEXT[]", "INTEGER[]"],
+                              dialects={"sqlite": "SELECT CAST(COALESCE(r.average, 0) AS FLOAT) \
+                        FROM json_each($1) n JOIN json_each($2) y ON y.key = n.key \
+                        LEFT JOIN movie_avg_rating r ON r.movie_name = n.value AND r.year = y.value \
+                        ORDER BY n.key"})
+Connector.DBConnector.prepare("averageActorRatings", "SELECT CAST(COALESCE(AVG(a.average),0) AS FLOAT) \
+                        FROM unnest($1) WITH ORDINALITY AS k(actor_id, ord) \
+                        LEFT JOIN actor_movie_avg_rating a ON a.actor_id = k.actor_id \
+                        GROUP BY k.ord ORDER BY k.ord", ["INTEGER[]"],
+                              dialects={"sqlite": "SELECT CAST(COALESCE(AVG(a.average),0) AS FLOAT) \
+                        FROM json_each($1) k LEFT JOIN actor_movie_avg_rating a ON a.actor_id = k.value \
+                        GROUP BY k.key ORDER BY k.key"})
+Connector.DBConnector.prepare("getActorProfiles", "SELECT a.* \
+                        FROM unnest($1) WITH ORDINALITY AS k(actor_id, ord) \
+                        LEFT JOIN Actors a ON a.actor_id = k.actor_id \
+                        ORDER BY k.ord", ["INTEGER[]"],
+                              dialects={"sqlite": "SELECT a.* \
+                        FROM json_each($1) k LEFT JOIN Actors a ON a.actor_id = k.value \
+                        ORDER BY k.key"})
+
+# ---------------------------------- indexes ----------------------------------
+# secondary indexes created by createTables, the primary keys already cover lookups by
+# (movie_name, year[, critic_id]) on Rated, by actor_id on PlayedIn and by PlayedIn's key on PlayedInRole
+INDEXES = [
+    # ON DELETE CASCADE from deleteCritic
+    ("rated_critic_idx", "CREATE INDEX IF NOT EXISTS rated_critic_idx ON Rated(critic_id)"),
+    # cascade from deleteStudio, per-studio counts of getFanCritics
+    ("produced_studio_year_idx",
+     "CREATE INDEX IF NOT EXISTS produced_studio_year_idx ON Produced(studio_id, year) INCLUDE (revenue)"),
+    # cascade from deleteMovie, stageCrewBudget, overlyInvestedInMovie and the joins of the views
+    ("playedin_movie_idx",
+     "CREATE INDEX IF NOT EXISTS playedin_movie_idx ON PlayedIn(movie_name, year) INCLUDE (salary, num_roles)"),
+]
+_INCLUDE = re.compile(r"\s+INCLUDE\s*\([^)]*\)")  # covering columns, SQLite has no INCLUDE
+
+# ---------------------------------- partitioned layout ----------------------------------
+# with partitioned=true in the [schema] section of database.ini, createTables range-partitions Rated, PlayedIn and
+# Produced by year on PostgreSQL, partition_years years per partition (rated_y1990 holds 1990 .. 1999 for 10).
+# a BEFORE INSERT trigger on Movies creates the partitions of a movie's year before any row can reference it, so
+# they appear as the data does. the DEFAULT partitions only ever see rows about to fail their foreign key (a
+# missing movie stays NOT_EXISTS instead of a "no partition" CHECK violation). connections of the layout join and
+# aggregate partition by partition, see Utility/Backends.py. SQLite and the memory engine ignore the setting.
+# two transactions inserting the first movies of a new range would both find its partitions missing and race on
+# CREATE TABLE (IF NOT EXISTS checks before it locks, the loser fails on the catalog's unique index), so the
+# creation holds a transaction-level advisory lock per range and looks again once it has it
+def _partitioned() -> bool:
+    return Config.getBool("schema", "partitioned", False)
+
+
+PARTITIONED_TABLES = ["Rated", "PlayedIn", "Produced"]
+
+
+def _partitionStatements(span: int) -> List[str]:
+    statements = ["CREATE TABLE IF NOT EXISTS " + table + "_default PARTITION OF " + table + " DEFAULT"
+                  for table in PARTITIONED_TABLES]
+    statements.append("CREATE OR REPLACE FUNCTION ensure_year_partitions(y INTEGER) RETURNS VOID AS $$\
+                      DECLARE\
+                          first INTEGER := y - y % " + str(span) + ";\
+                          t TEXT;\
+                      BEGIN\
+                          IF y IS NULL OR y < 1895 OR to_regclass('rated_y' || first) IS NOT NULL THEN\
+                              RETURN;\
+                          END IF;\
+                          PERFORM pg_advisory_xact_lock(hashtext('ensure_year_partitions'), first);\
+                          IF to_regclass('rated_y' || first) IS NOT NULL THEN\
+                              RETURN;\
+                          END IF;\
+                          FOREACH t IN ARRAY ARRAY['rated', 'playedin', 'produced'] LOOP\
+                              EXECUTE format('CREATE TABLE IF NOT EXISTS %I PARTITION OF %I FOR VALUES FROM (%s) TO (%s)',\
+                                             t || '_y' || first, t, first, first + " + str(span) + ");\
+                          END LOOP;\
+                      END $$ LANGUAGE plpgsql")
+    statements.append("CREATE OR REPLACE FUNCTION movies_year_partitions() RETURNS TRIGGER AS $$\
+                      BEGIN\
+                          PERFORM ensure_year_partitions(NEW.year);\
+                          RETURN NEW;\
+                      END $$ LANGUAGE plpgsql")
+    statements.append("CREATE TRIGGER movies_partitions BEFORE INSERT ON Movies\
+                      FOR EACH ROW EXECUTE PROCEDURE movies_year_partitions()")
+    return statements
+
+
+# ---------------------------------- SQLite schema ----------------------------------
+# the schema of createTables for the SQLite backend (see Utility/Backends.py). STRICT tables reject values of the
+# wrong type, WITHOUT ROWID keeps a NULL INTEGER PRIMARY KEY a NOT NULL violation instead of an auto id.
+# MovieRatingStats, FranchiseRevenue, StudioYearRevenue, StudioMovieCount and CriticStudioCoverage are maintained
+# by row-level triggers, SQLite has no transition tables
+SQLITE_SCHEMA = [
+    "CREATE TABLE IF NOT EXISTS Actors(actor_id INTEGER PRIMARY KEY CHECK (actor_id>0),\
+    actor_name TEXT NOT NULL,\
+    age INTEGER NOT NULL CHECK (age>0),\
+    height INTEGER NOT NULL CHECK (height>0)\
+    ) STRICT, WITHOUT ROWID",
+    "CREATE TABLE IF NOT EXISTS Movies(movie_name TEXT NOT NULL,\
+    year INTEGER NOT NULL CHECK(year>=1895),\
+    genre TEXT NOT NULL CHECK(genre in ('Drama','Action','Comedy','Horror')),\
+    PRIMARY KEY(movie_name,year)\
+    ) STRICT, WITHOUT ROWID",
+    "CREATE TABLE IF NOT EXISTS Studios(studio_id INTEGER PRIMARY KEY CHECK (studio_id>0),\
+    studio_name TEXT NOT NULL\
+    ) STRICT, WITHOUT ROWID",
+    "CREATE TABLE IF NOT EXISTS Critics(critic_id INTEGER PRIMARY KEY CHECK (critic_id>0),\
+    critic_name TEXT NOT NULL\
+    ) STRICT, WITHOUT ROWID",
+    "CREATE TABLE IF NOT EXISTS PlayedIn(actor_id INTEGER NOT NULL,\
+    movie_name TEXT NOT NULL,\
+    year INTEGER NOT NULL,\
+    salary INTEGER NOT NULL CHECK (salary>0),\
+    num_roles INTEGER NOT NULL CHECK (num_roles>0),\
+    PRIMARY KEY (actor_id,movie_name,year),\
+    FOREIGN KEY (movie_name,year) REFERENCES Movies ON DELETE CASCADE,\
+    FOREIGN KEY (actor_id) REFERENCES Actors ON DELETE CASCADE\
+    ) STRICT, WITHOUT ROWID",
+    "CREATE TABLE IF NOT EXISTS PlayedInRole(actor_id INTEGER NOT NULL,\
+    movie_name TEXT NOT NULL,\
+    year INTEGER NOT NULL,\
+    actor_role TEXT NOT NULL,\
+    PRIMARY KEY (actor_id,movie_name,year,actor_role),\
+    FOREIGN KEY (actor_id,movie_name,year) REFERENCES PlayedIn ON DELETE CASCADE\
+    ) STRICT, WITHOUT ROWID",
+    "CREATE TABLE IF NOT EXISTS Produced(movie_name TEXT NOT NULL,\
+    year INTEGER NOT NULL,\
+    studio_id INTEGER NOT NULL,\
+    budget INTEGER NOT NULL CHECK(budget>=0),\
+    revenue INTEGER NOT NULL CHECK(revenue>=0),\
+    PRIMARY KEY(movie_name,year),\
+    FOREIGN KEY(movie_name,year) REFERENCES Movies ON DELETE CASCADE,\
+    FOREIGN KEY(studio_id) REFERENCES Studios ON DELETE CASCADE\
+    ) STRICT, WITHOUT ROWID",
+    "CREATE TABLE IF NOT EXISTS Rated(movie_name TEXT NOT NULL,\
+    year INTEGER NOT NULL,\
+    critic_id INTEGER NOT NULL,\
+    rating INTEGER NOT NULL CHECK(rating>=1 AND rating<=5),\
+    PRIMARY KEY(movie_name,year,critic_id),\
+    FOREIGN KEY(movie_name,year) REFERENCES Movies ON DELETE CASCADE,\
+    FOREIGN KEY(critic_id) REFERENCES Critics ON DELETE CASCADE\
+    ) STRICT, WITHOUT ROWID",
+    "CREATE TABLE IF NOT EXISTS MovieRatingStats(movie_name TEXT NOT NULL,\
+    year INTEGER NOT NULL,\
+    rating_sum INTEGER NOT NULL,\
+    rating_count INTEGER NOT NULL,\
+    PRIMARY KEY(movie_name,year),\
+    FOREIGN KEY(movie_name,year) REFERENCES Movies ON DELETE CASCADE\
+    ) STRICT, WITHOUT ROWID",
+    "CREATE TRIGGER IF NOT EXISTS rated_stats_insert AFTER INSERT ON Rated BEGIN\
+    INSERT INTO MovieRatingStats(movie_name, year, rating_sum, rating_count) VALUES(NEW.movie_name, NEW.year, NEW.rating, 1)\
+    ON CONFLICT (movie_name, year) DO UPDATE\
+    SET rating_sum = rating_sum + EXCLUDED.rating_sum, rating_count = rating_count + 1;\
+    END",
+    "CREATE TRIGGER IF NOT EXISTS rated_stats_delete AFTER DELETE ON Rated BEGIN\
+    UPDATE MovieRatingStats SET rating_sum = rating_sum - OLD.rating, rating_count = rating_count - 1\
+    WHERE movie_name = OLD.movie_name AND year = OLD.year;\
+    DELETE FROM MovieRatingStats WHERE movie_name = OLD.movie_name AND year = OLD.year AND rating_count = 0;\
+    END",
+    "CREATE TRIGGER IF NOT EXISTS rated_stats_update AFTER UPDATE ON Rated BEGIN\
+    UPDATE MovieRatingStats SET rating_sum = rating_sum - OLD.rating, rating_count = rating_count - 1\
+    WHERE movie_name = OLD.movie_name AND year = OLD.year;\
+    DELETE FROM MovieRatingStats WHERE movie_name = OLD.movie_name AND year = OLD.year AND rating_count = 0;\
+    INSERT INTO MovieRatingStats(movie_name, year, rating_sum, rating_count) VALUES(NEW.movie_name, NEW.year, NEW.rating, 1)\
+    ON CONFLICT (movie_name, year) DO UPDATE\
+    SET rating_sum = rating_sum + EXCLUDED.rating_sum, rating_count = rating_count + 1;\
+    END",
+    "CREATE TABLE IF NOT EXISTS FranchiseRevenue(movie_name TEXT PRIMARY KEY,\
+    movie_count INTEGER NOT NULL,\
+    revenue INTEGER NOT NULL\
+    ) STRICT, WITHOUT ROWID",
+    "CREATE TABLE IF NOT EXISTS StudioYearRevenue(studio_id INTEGER NOT NULL,\
+    year INTEGER NOT NULL,\
+    revenue INTEGER NOT NULL,\
+    production_count INTEGER NOT NULL,\
+    PRIMARY KEY(studio_id,year),\
+    FOREIGN KEY(studio_id) REFERENCES Studios ON DELETE CASCADE\
+    ) STRICT, WITHOUT ROWID",
+    "CREATE TRIGGER IF NOT EXISTS movies_revenue_insert AFTER INSERT ON Movies BEGIN\
+    INSERT INTO FranchiseRevenue(movie_name, movie_count, revenue) VALUES(NEW.movie_name, 1, 0)\
+    ON CONFLICT (movie_name) DO UPDATE SET movie_count = movie_count + 1;\
+    END",
+    "CREATE TRIGGER IF NOT EXISTS movies_revenue_delete AFTER DELETE ON Movies BEGIN\
+    UPDATE FranchiseRevenue SET movie_count = movie_count - 1 WHERE movie_name = OLD.movie_name;\
+    DELETE FROM FranchiseRevenue WHERE movie_name = OLD.movie_name AND movie_count = 0;\
+    END",
+    "CREATE TRIGGER IF NOT EXISTS movies_revenue_update AFTER UPDATE OF movie_name ON Movies BEGIN\
+    UPDATE FranchiseRevenue SET movie_count = movie_count - 1 WHERE movie_name = OLD.movie_name;\
+    DELETE FROM FranchiseRevenue WHERE movie_name = OLD.movie_name AND movie_count = 0;\
+    INSERT INTO FranchiseRevenue(movie_name, movie_count, revenue) VALUES(NEW.movie_name, 1, 0)\
+    ON CONFLICT (movie_name) DO UPDATE SET movie_count = movie_count + 1;\
+    END",
+    "CREATE TRIGGER IF NOT EXISTS produced_revenue_insert AFTER INSERT ON Produced BEGIN\
+    UPDATE FranchiseRevenue SET revenue = revenue + NEW.revenue WHERE movie_name = NEW.movie_name;\
+    INSERT INTO StudioYearRevenue(studio_id, year, revenue, production_count) VALUES(NEW.studio_id, NEW.year, NEW.revenue, 1)\
+    ON CONFLICT (studio_id, year) DO UPDATE\
+    SET revenue = revenue + EXCLUDED.revenue, production_count = production_count + 1;\
+    END",
+    "CREATE TRIGGER IF NOT EXISTS produced_revenue_delete AFTER DELETE ON Produced BEGIN\
+    UPDATE FranchiseRevenue SET revenue = revenue - OLD.revenue WHERE movie_name = OLD.movie_name;\
+    UPDATE StudioYearRevenue SET revenue = revenue - OLD.revenue, production_count = production_count - 1\
+    WHERE studio_id = OLD.studio_id AND year = OLD.year;\
+    DELETE FROM StudioYearRevenue WHERE studio_id = OLD.studio_id AND year = OLD.year AND production_count = 0;\
+    END",
+    "CREATE TRIGGER IF NOT EXISTS produced_revenue_update AFTER UPDATE ON Produced BEGIN\
+    UPDATE FranchiseRevenue SET revenue = revenue - OLD.revenue WHERE movie_name = OLD.movie_name;\
+    UPDATE StudioYearRevenue SET revenue = revenue - OLD.revenue, production_count = production_count - 1\
+    WHERE studio_id = OLD.studio_id AND year = OLD.year;\
+    DELETE FROM StudioYearRevenue WHERE studio_id = OLD.studio_id AND year = OLD.year AND production_count = 0;\
+    UPDATE FranchiseRevenue SET revenue = revenue + NEW.revenue WHERE movie_name = NEW.movie_name;\
+    INSERT INTO StudioYearRevenue(studio_id, year, revenue, production_count) VALUES(NEW.studio_id, NEW.year, NEW.revenue, 1)\
+    ON CONFLICT (studio_id, year) DO UPDATE\
+    SET revenue = revenue + EXCLUDED.revenue, production_count = production_count + 1;\
+    END",
+    "CREATE TABLE IF NOT EXISTS StudioMovieCount(studio_id INTEGER PRIMARY KEY,\
+    movie_count INTEGER NOT NULL,\
+    FOREIGN KEY(studio_id) REFERENCES Studios ON DELETE CASCADE\
+    ) STRICT, WITHOUT ROWID",
+    "CREATE TABLE IF NOT EXISTS CriticStudioCoverage(critic_id INTEGER NOT NULL,\
+    studio_id INTEGER NOT NULL,\
+    rated_count INTEGER NOT NULL,\
+    PRIMARY KEY(critic_id,studio_id),\
+    FOREIGN KEY(critic_id) REFERENCES Critics ON DELETE CASCADE,\
+    FOREIGN KEY(studio_id) REFERENCES Studios ON DELETE CASCADE\
+    ) STRICT, WITHOUT ROWID",
+    "CREATE TRIGGER IF NOT EXISTS rated_coverage_insert AFTER INSERT ON Rated BEGIN\
+    INSERT INTO CriticStudioCoverage(critic_id, studio_id, rated_count)\
+    SELECT NEW.critic_id, studio_id, 1 FROM Produced WHERE movie_name = NEW.movie_name AND year = NEW.year\
+    ON CONFLICT (critic_id, studio_id) DO UPDATE SET rated_count = rated_count + 1;\
+    END",
+    "CREATE TRIGGER IF NOT EXISTS rated_coverage_delete AFTER DELETE ON Rated BEGIN\
+    UPDATE CriticStudioCoverage SET rated_count = rated_count - 1\
+    WHERE critic_id = OLD.critic_id\
+    AND studio_id IN (SELECT studio_id FROM Produced WHERE movie_name = OLD.movie_name AND year = OLD.year);\
+    DELETE FROM CriticStudioCoverage WHERE critic_id = OLD.critic_id AND rated_count = 0;\
+    END",
+    "CREATE TRIGGER IF NOT EXISTS rated_coverage_update AFTER UPDATE ON Rated BEGIN\
+    UPDATE CriticStudioCoverage SET rated_count = rated_count - 1\
+    WHERE critic_id = OLD.critic_id\
+    AND studio_id IN (SELECT studio_id FROM Produced WHERE movie_name = OLD.movie_name AND year = OLD.year);\
+    DELETE FROM CriticStudioCoverage WHERE critic_id = OLD.critic_id AND rated_count = 0;\
+    INSERT INTO CriticStudioCoverage(critic_id, studio_id, rated_count)\
+    SELECT NEW.critic_id, studio_id, 1 FROM Produced WHERE movie_name = NEW.movie_name AND year = NEW.year\
+    ON CONFLICT (critic_id, studio_id) DO UPDATE SET rated_count = rated_count + 1;\
+    END",
+    "CREATE TRIGGER IF NOT EXISTS produced_coverage_insert AFTER INSERT ON Produced BEGIN\
+    INSERT INTO StudioMovieCount(studio_id, movie_count) VALUES(NEW.studio_id, 1)\
+    ON CONFLICT (studio_id) DO UPDATE SET movie_count = movie_count + 1;\
+    INSERT INTO CriticStudioCoverage(critic_id, studio_id, rated_count)\
+    SELECT critic_id, NEW.studio_id, 1 FROM Rated WHERE movie_name = NEW.movie_name AND year = NEW.year\
+    ON CONFLICT (critic_id, studio_id) DO UPDATE SET rated_count = rated_count + 1;\
+    END",
+    "CREATE TRIGGER IF NOT EXISTS produced_coverage_delete AFTER DELETE ON Produced BEGIN\
+    UPDATE StudioMovieCount SET movie_count = movie_count - 1 WHERE studio_id = OLD.studio_id;\
+    DELETE FROM StudioMovieCount WHERE studio_id = OLD.studio_id AND movie_count = 0;\
+    UPDATE CriticStudioCoverage SET rated_count = rated_count - 1\
+    WHERE studio_id = OLD.studio_id\
+    AND critic_id IN (SELECT critic_id FROM Rated WHERE movie_name = OLD.movie_name AND year = OLD.year);\
+    DELETE FROM CriticStudioCoverage WHERE studio_id = OLD.studio_id AND rated_count = 0;\
+    END",
+    "CREATE TRIGGER IF NOT EXISTS produced_coverage_update AFTER UPDATE ON Produced BEGIN\
+    UPDATE StudioMovieCount SET movie_count = movie_count - 1 WHERE studio_id = OLD.studio_id;\
+    DELETE FROM StudioMovieCount WHERE studio_id = OLD.studio_id AND movie_count = 0;\
+    UPDATE CriticStudioCoverage SET rated_count = rated_count - 1\
+    WHERE studio_id = OLD.studio_id\
+    AND critic_id IN (SELECT critic_id FROM Rated WHERE movie_name = OLD.movie_name AND year = OLD.year);\
+    DELETE FROM CriticStudioCoverage WHERE studio_id = OLD.studio_id AND rated_count = 0;\
+    INSERT INTO StudioMovieCount(studio_id, movie_count) VALUES(NEW.studio_id, 1)\
+    ON CONFLICT (studio_id) DO UPDATE SET movie_count = movie_count + 1;\
+    INSERT INTO CriticStudioCoverage(critic_id, studio_id, rated_count)\
+    SELECT critic_id, NEW.studio_id, 1 FROM Rated WHERE movie_name = NEW.movie_name AND year = NEW.year\
+    ON CONFLICT (critic_id, studio_id) DO UPDATE SET rated_count = rated_count + 1;\
+    END",
+    "CREATE VIEW IF NOT EXISTS movie_AVG_rating AS\
+    SELECT movie_name,year,CAST(rating_sum AS REAL) / rating_count average\
+    FROM MovieRatingStats",
+    "CREATE VIEW IF NOT EXISTS actor_movie_AVG_rating AS\
+    SELECT DISTINCT actor_id, p.movie_name, p.year, COALESCE(average,0) as average\
+    FROM PlayedIn p LEFT JOIN movie_AVG_rating r ON p.movie_name=r.movie_name and p.year=r.year",
+    "CREATE VIEW IF NOT EXISTS actor_movie_studio AS\
+    SELECT Distinct actor_id, pl.movie_name, pl.year, pr.studio_id\
+    from playedin pl JOIN produced pr On pl.movie_name=pr.movie_name AND pl.year=pr.year",
+]
+# dropTables without CASCADE: the views, then every table after the tables referencing it
+SQLITE_DROP = ["DROP VIEW IF EXISTS actor_movie_studio", "DROP VIEW IF EXISTS actor_movie_AVG_rating",
+               "DROP VIEW IF EXISTS movie_AVG_rating"] + \
+              ["DROP TABLE IF EXISTS " + table for table in ("PlayedInRole", "PlayedIn", "Produced", "Rated",
+                                                            "MovieRatingStats", "FranchiseRevenue",
+                                                            "StudioYearRevenue", "StudioMovieCount",
+                                                            "CriticStudioCoverage", "Actors", "Movies", "Critics", "Studios")]
+
 # ---------------------------------- CRUD API: ----------------------------------
 
 def createTables():
     conn = None
     try:
-        conn = Connector.DBConnector()
-        conn.execute("CREATE TABLE IF NOT EXISTS Actors(actor_id INTEGER PRIMARY KEY CHECK (actor_id>0),\
-                    actor_name TEXT NOT NULL,\
-                    age INTEGER NOT NULL CHECK (age>0),\
-                    height INTEGER NOT NULL CHECK (height>0)\
-                    )")
-        conn.execute("CREATE TABLE IF NOT EXISTS Movies(movie_name TEXT NOT NULL,\
-                    year INTEGER NOT NULL CHECK(year>=1895),\
-                    genre TEXT NOT NULL CHECK(genre in ('Drama','Action','Comedy','Horror')),\
-                    PRIMARY KEY(movie_name,year)\
-                    )")
-        conn.execute("CREATE TABLE IF NOT EXISTS Studios(studio_id INTEGER PRIMARY KEY CHECK (studio_id>0),\
-                    studio_name TEXT NOT NULL\
-                    )")
-        conn.execute("CREATE TABLE IF NOT EXISTS Critics(critic_id INTEGER PRIMARY KEY CHECK (critic_id>0),\
-                    critic_name TEXT NOT NULL\
-                    )")
-        conn.execute("CREATE TABLE IF NOT EXISTS PlayedIn(actor_id INTEGER NOT NULL,\
-                    movie_name TEXT NOT NULL,\
-                    year INTEGER NOT NULL,\
-                    salary INTEGER NOT NULL CHECK (salary>0),\
-                    num_roles INTEGER NOT NULL CHECK (num_roles>0),\
-                    PRIMARY KEY (actor_id,movie_name,year),\
-                    FOREIGN KEY (movie_name,year) REFERENCES Movies ON DELETE CASCADE,\
-                    FOREIGN KEY (actor_id) REFERENCES Actors ON DELETE CASCADE\
-                    )")
-        conn.execute("CREATE TABLE IF NOT EXISTS PlayedInRole(actor_id INTEGER NOT NULL,\
-                    movie_name TEXT NOT NULL,\
-                    year INTEGER NOT NULL,\
-                    actor_role TEXT NOT NULL,\
-                    PRIMARY KEY (actor_id,movie_name,year,actor_role),\
-                    FOREIGN KEY (actor_id,movie_name,year) REFERENCES PlayedIn ON DELETE CASCADE\
-                    )")
-        conn.execute("CREATE TABLE IF NOT EXISTS Produced(movie_name TEXT NOT NULL,\
-                    year INTEGER NOT NULL,\
-                    studio_id INTEGER NOT NULL,\
-                    budget INTEGER NOT NULL CHECK(budget>=0),\
-                    revenue INTEGER NOT NULL CHECK(revenue>=0),\
-                    PRIMARY KEY(movie_name,year),\
-                    FOREIGN KEY(movie_name,year) REFERENCES Movies ON DELETE CASCADE,\
-                    FOREIGN KEY(studio_id) REFERENCES Studios ON DELETE CASCADE\
-                    )")
-        conn.execute("CREATE TABLE IF NOT EXISTS Rated(movie_name TEXT NOT NULL,\
-                    year INTEGER NOT NULL,\
-                    critic_id INTEGER NOT NULL,\
-                    rating INTEGER NOT NULL CHECK(rating>=1 AND rating<=5),\
-                    PRIMARY KEY(movie_name,year,critic_id),\
-                    FOREIGN KEY(movie_name,year) REFERENCES Movies ON DELETE CASCADE,\
-                    FOREIGN KEY(critic_id) REFERENCES Critics ON DELETE CASCADE\
-                    )")
-        conn.execute("CREATE VIEW movie_AVG_rating AS\
-                    SELECT movie_name,year,AVG(rating) average\
-                    FROM Rated\
-                    GROUP BY movie_name,year")
-        conn.execute("CREATE VIEW actor_movie_AVG_rating AS\
-                    SELECT DISTINCT actor_id, p.movie_name, p.year, COALESCE(average,0) as average\
-                    FROM PlayedIn p LEFT JOIN movie_AVG_rating r ON p.movie_name=r.movie_name and p.year=r.year")
-        conn.execute("CREATE VIEW actor_movie_studio AS\
-                    SELECT Distinct actor_id, pl.movie_name, pl.year, pr.studio_id\
-                    from playedin pl JOIN produced pr On pl.movie_name=pr.movie_name AND pl.year=pr.year")
-
+        # one commit for the whole sequence
+        with Connector.Transaction(savepoints=False):
+            conn = Connector.DBConnector()
+            if Connector.dialect() == "sqlite":
+                for statement in SQLITE_SCHEMA:
+                    conn.execute(statement)
+            else:
+                conn.execute("CREATE TABLE IF NOT EXISTS Actors(actor_id INTEGER PRIMARY KEY CHECK (actor_id>0),\
+                            actor_name TEXT NOT NULL,\
+                            age INTEGER NOT NULL CHECK (age>0),\
+                            height INTEGER NOT NULL CHECK (height>0)\
+                            )")
+                conn.execute("CREATE TABLE IF NOT EXISTS Movies(movie_name TEXT NOT NULL,\
+                            year INTEGER NOT NULL CHECK(year>=1895),\
+                            genre TEXT NOT NULL CHECK(genre in ('Drama','Action','Comedy','Horror')),\
+                            PRIMARY KEY(movie_name,year)\
+                            )")
+                conn.execute("CREATE TABLE IF NOT EXISTS Studios(studio_id INTEGER PRIMARY KEY CHECK (studio_id>0),\
+                            studio_name TEXT NOT NULL\
+                            )")
+                conn.execute("CREATE TABLE IF NOT EXISTS Critics(critic_id INTEGER PRIMARY KEY CHECK (critic_id>0),\
+                            critic_name TEXT NOT NULL\
+                            )")
+                partition = " PARTITION BY RANGE (year)" if _partitioned() else ""
+                conn.execute("CREATE TABLE IF NOT EXISTS PlayedIn(actor_id INTEGER NOT NULL,\
+                            movie_name TEXT NOT NULL,\
+                            year INTEGER NOT NULL,\
+                            salary INTEGER NOT NULL CHECK (salary>0),\
+                            num_roles INTEGER NOT NULL CHECK (num_roles>0),\
+                            PRIMARY KEY (actor_id,movie_name,year),\
+                            FOREIGN KEY (movie_name,year) REFERENCES Movies ON DELETE CASCADE,\
+                            FOREIGN KEY (actor_id) REFERENCES Actors ON DELETE CASCADE\
+                            )" + partition)
+                conn.execute("CREATE TABLE IF NOT EXISTS PlayedInRole(actor_id INTEGER NOT NULL,\
+                            movie_name TEXT NOT NULL,\
+                            year INTEGER NOT NULL,\
+                            actor_role TEXT NOT NULL,\
+                            PRIMARY KEY (actor_id,movie_name,year,actor_role),\
+                            FOREIGN KEY (actor_id,movie_name,year) REFERENCES PlayedIn ON DELETE CASCADE\
+                            )")
+                conn.execute("CREATE TABLE IF NOT EXISTS Produced(movie_name TEXT NOT NULL,\
+                            year INTEGER NOT NULL,\
+                            studio_id INTEGER NOT NULL,\
+                            budget INTEGER NOT NULL CHECK(budget>=0),\
+                            revenue INTEGER NOT NULL CHECK(revenue>=0),\
+                            PRIMARY KEY(movie_name,year),\
+                            FOREIGN KEY(movie_name,year) REFERENCES Movies ON DELETE CASCADE,\
+                            FOREIGN KEY(studio_id) REFERENCES Studios ON DELETE CASCADE\
+                            )" + partition)
+                conn.execute("CREATE TABLE IF NOT EXISTS Rated(movie_name TEXT NOT NULL,\
+                            year INTEGER NOT NULL,\
+                            critic_id INTEGER NOT NULL,\
+                            rating INTEGER NOT NULL CHECK(rating>=1 AND rating<=5),\
+                            PRIMARY KEY(movie_name,year,critic_id),\
+                            FOREIGN KEY(movie_name,year) REFERENCES Movies ON DELETE CASCADE,\
+                            FOREIGN KEY(critic_id) REFERENCES Critics ON DELETE CASCADE\
+                            )" + partition)
+                if partition:
+                    for statement in _partitionStatements(Config.getInt("schema", "partition_years", 10)):
+                        conn.execute(statement)
+                # per-movie SUM / COUNT of Rated, kept up to date by triggers (including cascaded deletes),
+                # so the rating reads are a primary key lookup instead of an aggregation over Rated
+                conn.execute("CREATE TABLE IF NOT EXISTS MovieRatingStats(movie_name TEXT NOT NULL,\
+                            year INTEGER NOT NULL,\
+                            rating_sum BIGINT NOT NULL,\
+                            rating_count BIGINT NOT NULL,\
+                            PRIMARY KEY(movie_name,year),\
+                            FOREIGN KEY(movie_name,year) REFERENCES Movies ON DELETE CASCADE\
+                            )")
+                conn.execute("CREATE OR REPLACE FUNCTION rated_movie_stats() RETURNS TRIGGER AS $$\
+                            BEGIN\
+                                IF TG_OP IN ('DELETE', 'UPDATE') THEN\
+                                    UPDATE MovieRatingStats s\
+                                    SET rating_sum = s.rating_sum - d.rating_sum, rating_count = s.rating_count - d.rating_count\
+                                    FROM (SELECT movie_name, year, SUM(rating) AS rating_sum, COUNT(*) AS rating_count\
+                                          FROM old_rows GROUP BY movie_name, year) d\
+                                    WHERE s.movie_name = d.movie_name AND s.year = d.year;\
+                                    DELETE FROM MovieRatingStats s USING old_rows o\
+                                    WHERE s.movie_name = o.movie_name AND s.year = o.year AND s.rating_count = 0;\
+                                END IF;\
+                                IF TG_OP IN ('INSERT', 'UPDATE') THEN\
+                                    INSERT INTO MovieRatingStats(movie_name, year, rating_sum, rating_count)\
+                                    SELECT movie_name, year, SUM(rating), COUNT(*) FROM new_rows GROUP BY movie_name, year\
+                                    ON CONFLICT (movie_name, year) DO UPDATE\
+                                    SET rating_sum = MovieRatingStats.rating_sum + EXCLUDED.rating_sum,\
+                                        rating_count = MovieRatingStats.rating_count + EXCLUDED.rating_count;\
+                                END IF;\
+                                RETURN NULL;\
+                            END $$ LANGUAGE plpgsql")
+                conn.execute("CREATE TRIGGER rated_stats_insert AFTER INSERT ON Rated\
+                            REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE PROCEDURE rated_movie_stats()")
+                conn.execute("CREATE TRIGGER rated_stats_delete AFTER DELETE ON Rated\
+                            REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT EXECUTE PROCEDURE rated_movie_stats()")
+                conn.execute("CREATE TRIGGER rated_stats_update AFTER UPDATE ON Rated\
+                            REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows\
+                            FOR EACH STATEMENT EXECUTE PROCEDURE rated_movie_stats()")
+                # per-movie-name and per-(studio, year) revenue of Produced, kept up to date by triggers on Movies and
+                # Produced (including cascaded deletes), so franchiseRevenue and studioRevenueByYear read them in key
+                # order instead of aggregating Produced. FranchiseRevenue has a row for every movie name, produced or not
+                conn.execute("CREATE TABLE IF NOT EXISTS FranchiseRevenue(movie_name TEXT PRIMARY KEY,\
+                            movie_count BIGINT NOT NULL,\
+                            revenue BIGINT NOT NULL\
+                            )")
+                conn.execute("CREATE TABLE IF NOT EXISTS StudioYearRevenue(studio_id INTEGER NOT NULL,\
+                            year INTEGER NOT NULL,\
+                            revenue BIGINT NOT NULL,\
+                            production_count BIGINT NOT NULL,\
+                            PRIMARY KEY(studio_id,year),\
+                            FOREIGN KEY(studio_id) REFERENCES Studios ON DELETE CASCADE\
+                            )")
+                conn.execute("CREATE OR REPLACE FUNCTION movies_franchise_revenue() RETURNS TRIGGER AS $$\
+                            BEGIN\
+                                IF TG_OP IN ('DELETE', 'UPDATE') THEN\
+                                    UPDATE FranchiseRevenue f SET movie_count = f.movie_count - d.movie_count\
+                                    FROM (SELECT movie_name, COUNT(*) AS movie_count FROM old_rows GROUP BY movie_name) d\
+                                    WHERE f.movie_name = d.movie_name;\
+                                    DELETE FROM FranchiseRevenue f USING old_rows o\
+                                    WHERE f.movie_name = o.movie_name AND f.movie_count = 0;\
+                                END IF;\
+                                IF TG_OP IN ('INSERT', 'UPDATE') THEN\
+                                    INSERT INTO FranchiseRevenue(movie_name, movie_count, revenue)\
+                                    SELECT movie_name, COUNT(*), 0 FROM new_rows GROUP BY movie_name\
+                                    ON CONFLICT (movie_name) DO UPDATE\
+                                    SET movie_count = FranchiseRevenue.movie_count + EXCLUDED.movie_count;\
+                                END IF;\
+                                RETURN NULL;\
+                            END $$ LANGUAGE plpgsql")
+                conn.execute("CREATE OR REPLACE FUNCTION produced_revenue() RETURNS TRIGGER AS $$\
+                            BEGIN\
+                                IF TG_OP IN ('DELETE', 'UPDATE') THEN\
+                                    UPDATE FranchiseRevenue f SET revenue = f.revenue - d.revenue\
+                                    FROM (SELECT movie_name, SUM(revenue) AS revenue FROM old_rows GROUP BY movie_name) d\
+                                    WHERE f.movie_name = d.movie_name;\
+                                    UPDATE StudioYearRevenue s\
+                                    SET revenue = s.revenue - d.revenue, production_count = s.production_count - d.production_count\
+                                    FROM (SELECT studio_id, year, SUM(revenue) AS revenue, COUNT(*) AS production_count\
+                                          FROM old_rows GROUP BY studio_id, year) d\
+                                    WHERE s.studio_id = d.studio_id AND s.year = d.year;\
+                                    DELETE FROM StudioYearRevenue s USING old_rows o\
+                                    WHERE s.studio_id = o.studio_id AND s.year = o.year AND s.production_count = 0;\
+                                END IF;\
+                                IF TG_OP IN ('INSERT', 'UPDATE') THEN\
+                                    UPDATE FranchiseRevenue f SET revenue = f.revenue + d.revenue\
+                                    FROM (SELECT movie_name, SUM(revenue) AS revenue FROM new_rows GROUP BY movie_name) d\
+                                    WHERE f.movie_name = d.movie_name;\
+                                    INSERT INTO StudioYearRevenue(studio_id, year, revenue, production_count)\
+                                    SELECT studio_id, year, SUM(revenue), COUNT(*) FROM new_rows GROUP BY studio_id, year\
+                                    ON CONFLICT (studio_id, year) DO UPDATE\
+                                    SET revenue = StudioYearRevenue.revenue + EXCLUDED.revenue,\
+                                        production_count = StudioYearRevenue.production_count + EXCLUDED.production_count;\
+                                END IF;\
+                                RETURN NULL;\
+                            END $$ LANGUAGE plpgsql")
+                for operation, transition in (("INSERT", "NEW TABLE AS new_rows"), ("DELETE", "OLD TABLE AS old_rows"),
+                                              ("UPDATE", "OLD TABLE AS old_rows NEW TABLE AS new_rows")):
+                    conn.execute("CREATE TRIGGER movies_revenue_" + operation.lower() + " AFTER " + operation +
+                                 " ON Movies REFERENCING " + transition +
+                                 " FOR EACH STATEMENT EXECUTE PROCEDURE movies_franchise_revenue()")
+                    conn.execute("CREATE TRIGGER produced_revenue_" + operation.lower() + " AFTER " + operation +
+                                 " ON Produced REFERENCING " + transition +
+                                 " FOR EACH STATEMENT EXECUTE PROCEDURE produced_revenue()")
+                # per-studio number of produced movies and per-(critic, studio) number of that studio's movies the
+                # critic rated, kept up to date by triggers on Rated and Produced (including cascaded deletes). a fan
+                # is a coverage row whose count is the studio's. each side joins the other table, so the triggers
+                # first lock the movies involved: a rating and a production of the same movie written concurrently
+                # are then counted by whichever commits second instead of by neither
+                lock = lambda rows: "PERFORM 1 FROM Movies m JOIN (SELECT DISTINCT movie_name, year FROM " + rows + \
+                                    ") t ON m.movie_name = t.movie_name AND m.year = t.year\
+                                    ORDER BY m.movie_name, m.year FOR NO KEY UPDATE OF m;"
+                conn.execute("CREATE TABLE IF NOT EXISTS StudioMovieCount(studio_id INTEGER PRIMARY KEY,\
+                            movie_count BIGINT NOT NULL,\
+                            FOREIGN KEY(studio_id) REFERENCES Studios ON DELETE CASCADE\
+                            )")
+                conn.execute("CREATE TABLE IF NOT EXISTS CriticStudioCoverage(critic_id INTEGER NOT NULL,\
+                            studio_id INTEGER NOT NULL,\
+                            rated_count BIGINT NOT NULL,\
+                            PRIMARY KEY(critic_id,studio_id),\
+                            FOREIGN KEY(critic_id) REFERENCES Critics ON DELETE CASCADE,\
+                            FOREIGN KEY(studio_id) REFERENCES Studios ON DELETE CASCADE\
+                            )")
+                conn.execute("CREATE OR REPLACE FUNCTION rated_studio_coverage() RETURNS TRIGGER AS $$\
+                            BEGIN\
+                                IF TG_OP IN ('DELETE', 'UPDATE') THEN\
+                                    " + lock("old_rows") + "\
+                                    UPDATE CriticStudioCoverage c SET rated_count = c.rated_count - d.rated_count\
+                                    FROM (SELECT o.critic_id, p.studio_id, COUNT(*) AS rated_count\
+                                          FROM old_rows o JOIN Produced p ON p.movie_name = o.movie_name AND p.year = o.year\
+                                          GROUP BY o.critic_id, p.studio_id) d\
+                                    WHERE c.critic_id = d.critic_id AND c.studio_id = d.studio_id;\
+                                    DELETE FROM CriticStudioCoverage c USING old_rows o\
+                                    WHERE c.critic_id = o.critic_id AND c.rated_count = 0;\
+                                END IF;\
+                                IF TG_OP IN ('INSERT', 'UPDATE') THEN\
+                                    " + lock("new_rows") + "\
+                                    INSERT INTO CriticStudioCoverage(critic_id, studio_id, rated_count)\
+                                    SELECT n.critic_id, p.studio_id, COUNT(*)\
+                                    FROM new_rows n JOIN Produced p ON p.movie_name = n.movie_name AND p.year = n.year\
+                                    GROUP BY n.critic_id, p.studio_id\
+                                    ON CONFLICT (critic_id, studio_id) DO UPDATE\
+                                    SET rated_count = CriticStudioCoverage.rated_count + EXCLUDED.rated_count;\
+                                END IF;\
+                                RETURN NULL;\
+                            END $$ LANGUAGE plpgsql")
+                conn.execute("CREATE OR REPLACE FUNCTION produced_studio_coverage() RETURNS TRIGGER AS $$\
+                            BEGIN\
+                                IF TG_OP IN ('DELETE', 'UPDATE') THEN\
+                                    " + lock("old_rows") + "\
+                                    UPDATE StudioMovieCount s SET movie_count = s.movie_count - d.movie_count\
+                                    FROM (SELECT studio_id, COUNT(*) AS movie_count FROM old_rows GROUP BY studio_id) d\
+                                    WHERE s.studio_id = d.studio_id;\
+                                    DELETE FROM StudioMovieCount s USING old_rows o\
+                                    WHERE s.studio_id = o.studio_id AND s.movie_count = 0;\
+                                    UPDATE CriticStudioCoverage c SET rated_count = c.rated_count - d.rated_count\
+                                    FROM (SELECT r.critic_id, o.studio_id, COUNT(*) AS rated_count\
+                                          FROM old_rows o JOIN Rated r ON r.movie_name = o.movie_name AND r.year = o.year\
+                                          GROUP BY r.critic_id, o.studio_id) d\
+                                    WHERE c.critic_id = d.critic_id AND c.studio_id = d.studio_id;\
+                                    DELETE FROM CriticStudioCoverage c USING old_rows o\
+                                    WHERE c.studio_id = o.studio_id AND c.rated_count = 0;\
+                                END IF;\
+                                IF TG_OP IN ('INSERT', 'UPDATE') THEN\
+                                    " + lock("new_rows") + "\
+                                    INSERT INTO StudioMovieCount(studio_id, movie_count)\
+                                    SELECT studio_id, COUNT(*) FROM new_rows GROUP BY studio_id\
+                                    ON CONFLICT (studio_id) DO UPDATE\
+                                    SET movie_count = StudioMovieCount.movie_count + EXCLUDED.movie_count;\
+                                    INSERT INTO CriticStudioCoverage(critic_id, studio_id, rated_count)\
+                                    SELECT r.critic_id, n.studio_id, COUNT(*)\
+                                    FROM new_rows n JOIN Rated r ON r.movie_name = n.movie_name AND r.year = n.year\
+                                    GROUP BY r.critic_id, n.studio_id\
+                                    ON CONFLICT (critic_id, studio_id) DO UPDATE\
+                                    SET rated_count = CriticStudioCoverage.rated_count + EXCLUDED.rated_count;\
+                                END IF;\
+                                RETURN NULL;\
+                            END $$ LANGUAGE plpgsql")
+                for operation, transition in (("INSERT", "NEW TABLE AS new_rows"), ("DELETE", "OLD TABLE AS old_rows"),
+                                              ("UPDATE", "OLD TABLE AS old_rows NEW TABLE AS new_rows")):
+                    conn.execute("CREATE TRIGGER rated_coverage_" + operation.lower() + " AFTER " + operation +
+                                 " ON Rated REFERENCING " + transition +
+                                 " FOR EACH STATEMENT EXECUTE PROCEDURE rated_studio_coverage()")
+                    conn.execute("CREATE TRIGGER produced_coverage_" + operation.lower() + " AFTER " + operation +
+                                 " ON Produced REFERENCING " + transition +
+                                 " FOR EACH STATEMENT EXECUTE PROCEDURE produced_studio_coverage()")
+                # actorPlayedInMovie as one call: the PlayedIn row, then one role row per element of the roles array.
+                # two statements, so constraint violations surface in the same order as two separate INSERTs
+                conn.execute("CREATE OR REPLACE FUNCTION actor_played_in_movie(TEXT, INTEGER, INTEGER, INTEGER, INTEGER, TEXT[])\
+                            RETURNS VOID AS $$\
+                            BEGIN\
+                                INSERT INTO PlayedIn(actor_id, movie_name, year, salary, num_roles) VALUES($3, $1, $2, $4, $5);\
+                                INSERT INTO PlayedInRole(actor_id, movie_name, year, actor_role)\
+                                SELECT $3, $1, $2, role FROM unnest($6) WITH ORDINALITY AS r(role, ord) ORDER BY ord;\
+                            END $$ LANGUAGE plpgsql")
+                # average over MovieRatingStats is exactly AVG(rating): numeric SUM / COUNT
+                conn.execute("CREATE VIEW movie_AVG_rating AS\
+                            SELECT movie_name,year,rating_sum::NUMERIC / rating_count average\
+                            FROM MovieRatingStats")
+                conn.execute("CREATE VIEW actor_movie_AVG_rating AS\
+                            SELECT DISTINCT actor_id, p.movie_name, p.year, COALESCE(average,0) as average\
+                            FROM PlayedIn p LEFT JOIN movie_AVG_rating r ON p.movie_name=r.movie_name and p.year=r.year")
+                conn.execute("CREATE VIEW actor_movie_studio AS\
+                            SELECT Distinct actor_id, pl.movie_name, pl.year, pr.studio_id\
+                            from playedin pl JOIN produced pr On pl.movie_name=pr.movie_name AND pl.year=pr.year")
+            for _, index in INDEXES:
+                conn.execute(index if Connector.dialect() != "sqlite" else _INCLUDE.sub("", index))
+            Connector.DBConnector.invalidatePrepared()
+        _invalidateProfile(None)
+        _invalidateTables(None)
     except DatabaseException.ConnectionInvalid as e:
         print(e)
     except Exception as e:
@@ -128,14 +828,28 @@ def createTables():
         conn.close()
 
 
+# every table of the schema, what clearTables empties
+TABLES = ["Actors", "Movies", "Critics", "Studios", "PlayedIn", "PlayedInRole", "Produced", "Rated", "MovieRatingStats",
+          "FranchiseRevenue", "StudioYearRevenue", "StudioMovieCount", "CriticStudioCoverage"]
+
+
 def clearTables():
     conn = None
     try:
-        conn = Connector.DBConnector()
-        conn.execute("DELETE FROM Actors")
-        conn.execute("DELETE FROM Movies")
-        conn.execute("DELETE FROM Critics")
-        conn.execute("DELETE FROM Studios")
+        # one commit for the whole sequence
+        with Connector.Transaction(savepoints=False):
+            conn = Connector.DBConnector()
+            if Connector.dialect() == "sqlite":
+                conn.execute("DELETE FROM Actors")
+                conn.execute("DELETE FROM Movies")
+                conn.execute("DELETE FROM Critics")
+                conn.execute("DELETE FROM Studios")
+            else:
+                # one statement, no per-row cascades or trigger calls. TRUNCATE fires no row triggers, so the
+                # trigger-maintained tables are listed too
+                conn.execute("TRUNCATE " + ", ".join(TABLES) + " RESTART IDENTITY CASCADE")
+        _invalidateProfile(None)
+        _invalidateTables(None)
     except DatabaseException.ConnectionInvalid as e:
         print(e)
     except Exception as e:
@@ -147,15 +861,37 @@ def clearTables():
 def dropTables():
     conn = None
     try:
-        conn = Connector.DBConnector()
-        conn.execute("DROP TABLE IF EXISTS Actors CASCADE")
-        conn.execute("DROP TABLE IF EXISTS Movies CASCADE")
-        conn.execute("DROP TABLE IF EXISTS Critics CASCADE")
-        conn.execute("DROP TABLE IF EXISTS Studios CASCADE")
-        conn.execute("DROP TABLE IF EXISTS playedin CASCADE")
-        conn.execute("DROP TABLE IF EXISTS playedinrole CASCADE")
-        conn.execute("DROP TABLE IF EXISTS produced CASCADE")
-        conn.execute("DROP TABLE IF EXISTS rated CASCADE")
+        # one commit for the whole sequence
+        with Connector.Transaction(savepoints=False):
+            conn = Connector.DBConnector()
+            if Connector.dialect() == "sqlite":
+                for statement in SQLITE_DROP:
+                    conn.execute(statement)
+            else:
+                conn.execute("DROP TABLE IF EXISTS Actors CASCADE")
+                conn.execute("DROP TABLE IF EXISTS Movies CASCADE")
+                conn.execute("DROP TABLE IF EXISTS Critics CASCADE")
+                conn.execute("DROP TABLE IF EXISTS Studios CASCADE")
+                conn.execute("DROP TABLE IF EXISTS playedin CASCADE")
+                conn.execute("DROP TABLE IF EXISTS playedinrole CASCADE")
+                conn.execute("DROP TABLE IF EXISTS produced CASCADE")
+                conn.execute("DROP TABLE IF EXISTS rated CASCADE")
+                conn.execute("DROP TABLE IF EXISTS MovieRatingStats CASCADE")
+                conn.execute("DROP TABLE IF EXISTS FranchiseRevenue CASCADE")
+                conn.execute("DROP TABLE IF EXISTS StudioYearRevenue CASCADE")
+                conn.execute("DROP TABLE IF EXISTS StudioMovieCount CASCADE")
+                conn.execute("DROP TABLE IF EXISTS CriticStudioCoverage CASCADE")
+                conn.execute("DROP FUNCTION IF EXISTS rated_movie_stats() CASCADE")
+                conn.execute("DROP FUNCTION IF EXISTS movies_franchise_revenue() CASCADE")
+                conn.execute("DROP FUNCTION IF EXISTS produced_revenue() CASCADE")
+                conn.execute("DROP FUNCTION IF EXISTS rated_studio_coverage() CASCADE")
+                conn.execute("DROP FUNCTION IF EXISTS produced_studio_coverage() CASCADE")
+                conn.execute("DROP FUNCTION IF EXISTS actor_played_in_movie(TEXT, INTEGER, INTEGER, INTEGER, INTEGER, TEXT[])")
+                conn.execute("DROP FUNCTION IF EXISTS movies_year_partitions() CASCADE")
+                conn.execute("DROP FUNCTION IF EXISTS ensure_year_partitions(INTEGER)")
+            Connector.DBConnector.invalidatePrepared()
+        _invalidateProfile(None)
+        _invalidateTables(None)
     except DatabaseException.ConnectionInvalid as e:
         print(e)
     finally:
@@ -169,9 +905,9 @@ def addCritic(critic: Critic) -> ReturnValue:
         critic_id = critic.getCriticID()
         critic_name = critic.getName()
         conn = Connector.DBConnector()
-        query = sql.SQL("INSERT INTO Critics(critic_id, critic_name) VALUES({id}, {name})").format(
-            id=sql.Literal(critic_id), name=sql.Literal(critic_name))
-        conn.execute(query)
+        conn.executePrepared("addCritic", (critic_id, critic_name))
+        _invalidateProfile(_profileKey("critic", critic_id))
+        _invalidateTables(["Critics"])
     except DatabaseException.NOT_NULL_VIOLATION as e:
         print(e)
         res = ReturnValue.BAD_PARAMS
@@ -197,10 +933,12 @@ def deleteCritic(critic_id: int) -> ReturnValue:
     res = ReturnValue.OK
     try:
         conn = Connector.DBConnector()
-        query = sql.SQL("DELETE FROM Critics WHERE critic_id={id}").format(id=sql.Literal(critic_id))
-        rows_effected, _ = conn.execute(query)
+        rows_effected, _ = conn.executePrepared("deleteCritic", (critic_id,))
         if rows_effected == 0:
             res = ReturnValue.NOT_EXISTS
+        else:
+            _invalidateProfile(_profileKey("critic", critic_id))
+            _invalidateTables(["Critics"], deleted=True)
     except DatabaseException.ConnectionInvalid as e:
         print(e)
         res = ReturnValue.ERROR
@@ -216,10 +954,16 @@ def getCriticProfile(critic_id: int) -> Critic:
     conn = None
     result = ResultSet()
     rows_in_output = 0
+    key = _profileKey("critic", critic_id)
+    cached = _cachedProfile(key)
+    if cached is not None:
+        rows_in_output, result = cached
+        return CreateCriticFromResultSet(result, rows_in_output)
+    token = _profile_cache.token()
     try:
-        conn = Connector.DBConnector()
-        query = sql.SQL("SELECT * FROM Critics WHERE critic_id={id}").format(id=sql.Literal(critic_id))
-        rows_in_output, result = conn.execute(query)
+        conn = Connector.DBConnector(readOnly=True)
+        rows_in_output, result = conn.executePrepared("getCriticProfile", (critic_id,))
+        _cacheProfile(key, (rows_in_output, result), token, conn)
     except DatabaseException.ConnectionInvalid as e:
         print(e)
     except Exception as e:
@@ -238,9 +982,9 @@ def addActor(actor: Actor) -> ReturnValue:
         age = actor.getAge()
         height = actor.getHeight()
         conn = Connector.DBConnector()
-        query = sql.SQL("INSERT INTO Actors(actor_id, actor_name, age, height) VALUES({id}, {name}, {a}, {h})").format(
-            id=sql.Literal(actor_id), name=sql.Literal(actor_name), a=sql.Literal(age), h=sql.Literal(height))
-        conn.execute(query)
+        conn.executePrepared("addActor", (actor_id, actor_name, age, height))
+        _invalidateProfile(_profileKey("actor", actor_id))
+        _invalidateTables(["Actors"])
     except DatabaseException.NOT_NULL_VIOLATION as e:
         print(e)
         res = ReturnValue.BAD_PARAMS
@@ -266,10 +1010,12 @@ def deleteActor(actor_id: int) -> ReturnValue:
     res = ReturnValue.OK
     try:
         conn = Connector.DBConnector()
-        query = sql.SQL("DELETE FROM Actors WHERE actor_id={id}").format(id=sql.Literal(actor_id))
-        rows_effected, _ = conn.execute(query)
+        rows_effected, _ = conn.executePrepared("deleteActor", (actor_id,))
         if rows_effected == 0:
             res = ReturnValue.NOT_EXISTS
+        else:
+            _invalidateProfile(_profileKey("actor", actor_id))
+            _invalidateTables(["Actors"], deleted=True)
     except DatabaseException.ConnectionInvalid as e:
         print(e)
         res = ReturnValue.ERROR
@@ -285,10 +1031,16 @@ def getActorProfile(actor_id: int) -> Actor:
     conn = None
     result = ResultSet()
     rows_in_output = 0
+    key = _profileKey("actor", actor_id)
+    cached = _cachedProfile(key)
+    if cached is not None:
+        rows_in_output, result = cached
+        return CreateActorFromResultSet(result, rows_in_output)
+    token = _profile_cache.token()
     try:
-        conn = Connector.DBConnector()
-        query = sql.SQL("SELECT * FROM Actors WHERE actor_id={id}").format(id=sql.Literal(actor_id))
-        rows_in_output, result = conn.execute(query)
+        conn = Connector.DBConnector(readOnly=True)
+        rows_in_output, result = conn.executePrepared("getActorProfile", (actor_id,))
+        _cacheProfile(key, (rows_in_output, result), token, conn)
     except DatabaseException.ConnectionInvalid as e:
         print(e)
     except Exception as e:
@@ -306,9 +1058,9 @@ def addMovie(movie: Movie) -> ReturnValue:
         year = movie.getYear()
         genre = movie.getGenre()
         conn = Connector.DBConnector()
-        query = sql.SQL("INSERT INTO Movies(movie_name, year, genre) VALUES({name}, {y}, {g})").format(
-            name=sql.Literal(movie_name), y=sql.Literal(year), g=sql.Literal(genre))
-        conn.execute(query)
+        conn.executePrepared("addMovie", (movie_name, year, genre))
+        _invalidateProfile(_profileKey("movie", movie_name, year))
+        _invalidateTables(["Movies"])
     except DatabaseException.NOT_NULL_VIOLATION as e:
         print(e)
         res = ReturnValue.BAD_PARAMS
@@ -334,11 +1086,12 @@ def deleteMovie(movie_name: str, year: int) -> ReturnValue:
     res = ReturnValue.OK
     try:
         conn = Connector.DBConnector()
-        query = sql.SQL("DELETE FROM Movies WHERE movie_name={name} AND year={y}").format(name=sql.Literal(movie_name),
-                                                                                          y=sql.Literal(year))
-        rows_effected, _ = conn.execute(query)
+        rows_effected, _ = conn.executePrepared("deleteMovie", (movie_name, year))
         if rows_effected == 0:
             res = ReturnValue.NOT_EXISTS
+        else:
+            _invalidateProfile(_profileKey("movie", movie_name, year))
+            _invalidateTables(["Movies"], deleted=True)
     except DatabaseException.ConnectionInvalid as e:
         print(e)
         res = ReturnValue.ERROR
@@ -354,11 +1107,16 @@ def getMovieProfile(movie_name: str, year: int) -> Movie:
     conn = None
     result = ResultSet()
     rows_in_output = 0
+    key = _profileKey("movie", movie_name, year)
+    cached = _cachedProfile(key)
+    if cached is not None:
+        rows_in_output, result = cached
+        return CreateMovieFromResultSet(result, rows_in_output)
+    token = _profile_cache.token()
     try:
-        conn = Connector.DBConnector()
-        query = sql.SQL("SELECT * FROM Movies WHERE movie_name={name} AND year={y}").format(
-            name=sql.Literal(movie_name), y=sql.Literal(year))
-        rows_in_output, result = conn.execute(query)
+        conn = Connector.DBConnector(readOnly=True)
+        rows_in_output, result = conn.executePrepared("getMovieProfile", (movie_name, year))
+        _cacheProfile(key, (rows_in_output, result), token, conn)
     except DatabaseException.ConnectionInvalid as e:
         print(e)
     except Exception as e:
@@ -375,9 +1133,9 @@ def addStudio(studio: Studio) -> ReturnValue:
         studio_id = studio.getStudioID()
         studio_name = studio.getStudioName()
         conn = Connector.DBConnector()
-        query = sql.SQL("INSERT INTO Studios(studio_id, studio_name) VALUES({id}, {name})").format(
-            id=sql.Literal(studio_id), name=sql.Literal(studio_name))
-        conn.execute(query)
+        conn.executePrepared("addStudio", (studio_id, studio_name))
+        _invalidateProfile(_profileKey("studio", studio_id))
+        _invalidateTables(["Studios"])
     except DatabaseException.NOT_NULL_VIOLATION as e:
         print(e)
         res = ReturnValue.BAD_PARAMS
@@ -403,10 +1161,12 @@ def deleteStudio(studio_id: int) -> ReturnValue:
     res = ReturnValue.OK
     try:
         conn = Connector.DBConnector()
-        query = sql.SQL("DELETE FROM Studios WHERE studio_id={id}").format(id=sql.Literal(studio_id))
-        rows_effected, _ = conn.execute(query)
+        rows_effected, _ = conn.executePrepared("deleteStudio", (studio_id,))
         if rows_effected == 0:
             res = ReturnValue.NOT_EXISTS
+        else:
+            _invalidateProfile(_profileKey("studio", studio_id))
+            _invalidateTables(["Studios"], deleted=True)
     except DatabaseException.ConnectionInvalid as e:
         print(e)
         res = ReturnValue.ERROR
@@ -422,10 +1182,16 @@ def getStudioProfile(studio_id: int) -> Studio:
     conn = None
     result = ResultSet()
     rows_in_output = 0
+    key = _profileKey("studio", studio_id)
+    cached = _cachedProfile(key)
+    if cached is not None:
+        rows_in_output, result = cached
+        return CreateStudioFromResultSet(result,rows_in_output)
+    token = _profile_cache.token()
     try:
-        conn = Connector.DBConnector()
-        query = sql.SQL("SELECT * FROM Studios WHERE studio_id={id}").format(id=sql.Literal(studio_id))
-        rows_in_output, result = conn.execute(query)
+        conn = Connector.DBConnector(readOnly=True)
+        rows_in_output, result = conn.executePrepared("getStudioProfile", (studio_id,))
+        _cacheProfile(key, (rows_in_output, result), token, conn)
     except DatabaseException.ConnectionInvalid as e:
         print(e)
     except Exception as e:
@@ -441,10 +1207,8 @@ def criticRatedMovie(movieName: str, movieYear: int, criticID: int, rating: int)
     res = ReturnValue.OK
     try:
         conn = Connector.DBConnector()
-        query = sql.SQL("INSERT INTO Rated(movie_name,year,critic_id,rating) VALUES({name},{year},{id},{rate})").format(
-            name=sql.Literal(movieName), year=sql.Literal(movieYear), id=sql.Literal(criticID),
-            rate=sql.Literal(rating))
-        conn.execute(query)
+        conn.executePrepared("criticRatedMovie", (movieName, movieYear, criticID, rating))
+        _invalidateTables(["Rated", "MovieRatingStats"])
     except DatabaseException.CHECK_VIOLATION as e:
         print(e)
         res = ReturnValue.BAD_PARAMS
@@ -473,11 +1237,11 @@ def criticDidntRateMovie(movieName: str, movieYear: int, criticID: int) -> Retur
     res = ReturnValue.OK
     try:
         conn = Connector.DBConnector()
-        query = sql.SQL("DELETE FROM Rated WHERE movie_name={name} AND year={y} AND critic_id={id}").format(
-            name=sql.Literal(movieName), y=sql.Literal(movieYear), id=sql.Literal(criticID))
-        rows_effected, _ = conn.execute(query)
+        rows_effected, _ = conn.executePrepared("criticDidntRateMovie", (movieName, movieYear, criticID))
         if rows_effected == 0:
             res = ReturnValue.NOT_EXISTS
+        else:
+            _invalidateTables(["Rated"], deleted=True)
     except DatabaseException.ConnectionInvalid as e:
         print(e)
         res = ReturnValue.ERROR
@@ -495,18 +1259,8 @@ def actorPlayedInMovie(movieName: str, movieYear: int, actorID: int, salary: int
     num_roles = len(roles)
     try:
         conn = Connector.DBConnector()
-        query = sql.SQL(
-            "INSERT INTO PlayedIn(actor_id,movie_name,year,salary,num_roles) Values({id},{name},{year},{s},{n_r});").format(
-            id=sql.Literal(actorID), name=sql.Literal(movieName), year=sql.Literal(movieYear), s=sql.Literal(salary),
-            n_r=sql.Literal(num_roles))
-        for i, r in enumerate(roles):
-            if i == 0:
-                query += sql.SQL("INSERT INTO PlayedInRole(actor_id,movie_name,year,actor_role) Values")
-            query += sql.SQL("({id},{name},{year},{role})").format(id=sql.Literal(actorID), name=sql.Literal(movieName),
-                                                                   year=sql.Literal(movieYear), role=sql.Literal(r))
-            if i < num_roles - 1:
-                query += sql.SQL(",")
-        conn.execute(query)
+        conn.executePrepared("actorPlayedInMovie", (movieName, movieYear, actorID, salary, num_roles, list(roles)))
+        _invalidateTables(["PlayedIn", "PlayedInRole"])
     except DatabaseException.NOT_NULL_VIOLATION as e:
         #print(e)
         res = ReturnValue.BAD_PARAMS
@@ -535,11 +1289,11 @@ def actorDidntPlayInMovie(movieName: str, movieYear: int, actorID: int) -> Retur
     res = ReturnValue.OK
     try:
         conn = Connector.DBConnector()
-        query = sql.SQL("DELETE FROM PlayedIn WHERE movie_name={name} AND year={y} AND actor_id={id}").format(
-            name=sql.Literal(movieName), y=sql.Literal(movieYear), id=sql.Literal(actorID))
-        rows_effected, _ = conn.execute(query)
+        rows_effected, _ = conn.executePrepared("actorDidntPlayInMovie", (movieName, movieYear, actorID))
         if rows_effected == 0:
             res = ReturnValue.NOT_EXISTS
+        else:
+            _invalidateTables(["PlayedIn"], deleted=True)
     except DatabaseException.ConnectionInvalid as e:
         #print(e)
         res = ReturnValue.ERROR
@@ -555,13 +1309,8 @@ def getActorsRoleInMovie(actor_id: int, movie_name: str, movieYear: int):
     result = ResultSet()
     rows_in_output = 0
     try:
-        conn = Connector.DBConnector()
-        query = sql.SQL("select actor_role\
-                        from playedinrole\
-                        where actor_id={id} AND movie_name={name} and year={y} \
-                        ORDER BY actor_role DESC").format(id=sql.Literal(actor_id), name=sql.Literal(movie_name),
-                                                          y=sql.Literal(movieYear))
-        rows_in_output, result = conn.execute(query)
+        conn = Connector.DBConnector(readOnly=True)
+        rows_in_output, result = conn.executePrepared("getActorsRoleInMovie", (actor_id, movie_name, movieYear))
     except DatabaseException.ConnectionInvalid as e:
         print(e)
     except Exception as e:
@@ -576,11 +1325,8 @@ def studioProducedMovie(studioID: int, movieName: str, movieYear: int, budget: i
     res = ReturnValue.OK
     try:
         conn = Connector.DBConnector()
-        query = sql.SQL(
-            "INSERT INTO Produced(movie_name,year,studio_id,budget,revenue) VALUES({name},{year},{id},{bud},{rev})").format(
-            name=sql.Literal(movieName), year=sql.Literal(movieYear), id=sql.Literal(studioID),
-            bud=sql.Literal(budget), rev=sql.Literal(revenue))
-        conn.execute(query)
+        conn.executePrepared("studioProducedMovie", (movieName, movieYear, studioID, budget, revenue))
+        _invalidateTables(["Produced"])
     except DatabaseException.CHECK_VIOLATION as e:
         #print(e)
         res = ReturnValue.BAD_PARAMS
@@ -609,11 +1355,11 @@ def studioDidntProduceMovie(studioID: int, movieName: str, movieYear: int) -> Re
     res = ReturnValue.OK
     try:
         conn = Connector.DBConnector()
-        query = sql.SQL("DELETE FROM Produced WHERE movie_name={name} AND year={y} AND studio_id={id}").format(
-            name=sql.Literal(movieName), y=sql.Literal(movieYear), id=sql.Literal(studioID))
-        rows_effected, _ = conn.execute(query)
+        rows_effected, _ = conn.executePrepared("studioDidntProduceMovie", (movieName, movieYear, studioID))
         if rows_effected == 0:
             res = ReturnValue.NOT_EXISTS
+        else:
+            _invalidateTables(["Produced"], deleted=True)
     except DatabaseException.ConnectionInvalid as e:
         #print(e)
         res = ReturnValue.ERROR
@@ -630,10 +1376,8 @@ def averageRating(movieName: str, movieYear: int) -> float:
     result = ResultSet()
     res = float(0)
     try:
-        conn = Connector.DBConnector()
-        query = sql.SQL("SELECT (average)::FLOAT FROM movie_avg_rating where movie_name={name} And year={y}").format(
-            name=sql.Literal(movieName), y=sql.Literal(movieYear))
-        rows, result = conn.execute(query)
+        conn = Connector.DBConnector(readOnly=True)
+        rows, result = conn.executePrepared("averageRating", (movieName, movieYear))
         if rows > 0:
             res = result.rows[0][0]
     except DatabaseException.ConnectionInvalid as e:
@@ -650,9 +1394,8 @@ def averageActorRating(actorID: int) -> float:
     result = ResultSet()
     res = float(0)
     try:
-        conn = Connector.DBConnector()
-        query = sql.SQL("SELECT (COALESCE(AVG(average),0))::FLOAT AS avg_rating FROM actor_movie_avg_rating where actor_id={id}").format(id=sql.Literal(actorID))
-        rows_affected, result = conn.execute(query)
+        conn = Connector.DBConnector(readOnly=True)
+        rows_affected, result = conn.executePrepared("averageActorRating", (actorID,))
         if rows_affected > 0:
             res = result.rows[0][0]
     except DatabaseException.ConnectionInvalid as e:
@@ -669,12 +1412,8 @@ def bestPerformance(actor_id: int) -> Movie:
     result = ResultSet()
     rows_in_output = 0
     try:
-        conn = Connector.DBConnector()
-        query = sql.SQL("SELECT ac.movie_name, ac.year , mo.genre \
-                        FROM actor_movie_avg_rating ac LEFT JOIN movies mo ON ac.movie_name = mo.movie_name and ac.year = mo.year \
-                        where actor_id={id} \
-                        ORDER BY average desc, year ASC, movie_name DESC LIMIT 1").format(id=sql.Literal(actor_id))
-        rows_in_output, result = conn.execute(query)
+        conn = Connector.DBConnector(readOnly=True)
+        rows_in_output, result = conn.executePrepared("bestPerformance", (actor_id,))
     except DatabaseException.ConnectionInvalid as e:
         print(e)
     except Exception as e:
@@ -689,15 +1428,8 @@ def stageCrewBudget(movieName: str, movieYear: int) -> int:
     rows, result = 0, ResultSet()
     res = -1
     try:
-        conn = Connector.DBConnector()
-        query = sql.SQL("SELECT q.budget - SUM(COALESCE (pl.salary,0)) as diff\
-                        FROM (\
-                        SELECT s.movie_name, s.year , COALESCE (pr.budget, 0) as budget \
-                        from movies s LEFT JOIN produced pr ON s.movie_name = pr.movie_name AND s.year = pr.year \
-                        WHERE s.movie_name = {name} and s.year = {y} \
-                        )q LEFT JOIN playedin pl on q.movie_name = pl.movie_name AND q.year = pl.year\
-                        GROUP BY q.movie_name, q.year, q.budget").format(name=sql.Literal(movieName), y=sql.Literal(movieYear))
-        rows, result = conn.execute(query)
+        conn = Connector.DBConnector(readOnly=True)
+        rows, result = conn.executePrepared("stageCrewBudget", (movieName, movieYear))
         if rows > 0:
             res = result.rows[0][0]
     except DatabaseException.ConnectionInvalid as e:
@@ -714,23 +1446,8 @@ def overlyInvestedInMovie(movie_name: str, movie_year: int, actor_id: int) -> bo
     result = ResultSet()
     res = False
     try:
-        conn = Connector.DBConnector()
-        query = sql.SQL("SELECT * \
-        FROM(\
-        SELECT (num_roles::FLOAT)/total as res\
-        FROM (\
-        SELECT movie_name, year, SUM(num_roles) as total\
-        from playedin\
-        WHERE movie_name = {name} and year = {y}\
-        GROUP BY movie_name, year\
-        ) aa join (\
-        SELECT movie_name, year, actor_id, num_roles\
-        FROM playedin\
-        WHERE movie_name = {name} and year = {y} AND actor_id = {id}\
-        ) bb on aa.movie_name = bb.movie_name And aa.year = bb.year\
-        ) as q\
-        WHERE res >= 0.5").format(name=sql.Literal(movie_name), y=sql.Literal(movie_year), id=sql.Literal(actor_id))
-        _, result = conn.execute(query)
+        conn = Connector.DBConnector(readOnly=True)
+        _, result = conn.executePrepared("overlyInvestedInMovie", (movie_name, movie_year, actor_id))
         if len(result.rows) > 0:
             res = True
     except DatabaseException.ConnectionInvalid as e:
@@ -743,24 +1460,85 @@ def overlyInvestedInMovie(movie_name: str, movie_year: int, actor_id: int) -> bo
 
 
 # ---------------------------------- ADVANCED API: ----------------------------------
+# the queries behind the Advanced API functions, by function name
+ADVANCED_QUERIES = {
+    # FranchiseRevenue and StudioYearRevenue are the GROUP BYs of Produced (by movie name, with 0 for movies never
+    # produced, and by studio and year), maintained by triggers. both reads walk a primary key backwards
+    "franchiseRevenue": "SELECT movie_name, revenue\
+                         FROM FranchiseRevenue\
+                         ORDER BY movie_name DESC",
+    "studioRevenueByYear": "SELECT studio_id, year, revenue AS total_revenue\
+                            FROM StudioYearRevenue\
+                            ORDER BY studio_id DESC, year DESC",
+    # NOTE - this query was not chosen because we believe the other one is more efficient (stated in the dry part)
+    # query = sql.SQL("SELECT  C.critic_id,S.studio_id \
+    #                         FROM critics C, studios S \
+    #                         WHERE EXISTS(SELECT * FROM rated ra WHERE C.critic_id = ra.critic_id) AND EXISTS(SELECT * FROM produced pa WHERE S.studio_id = pa.studio_id) AND not EXISTS( \
+    #                             SELECT p.movie_name, P.year \
+    #                             FROM produced P \
+    #                             WHERE P.studio_id = S.studio_id and ( \
+    #                                 (p.movie_name, p.year) NOT IN( \
+    #                                 SELECT r.movie_name, r.year \
+    #                                 FROM rated r \
+    #                                 WHERE r.critic_id = C.critic_id)) \
+    #                         ) \
+    #                         ORDER BY C.critic_id DESC, S.studio_id DESC")
+    # StudioMovieCount and CriticStudioCoverage are the two grouped counts of the query this replaced (see
+    # Benchmarks/PlanBenchmark.py), maintained by triggers. a walk down CriticStudioCoverage's primary key with a
+    # primary key lookup per row, the ratings of unproduced movies are never touched
+    "getFanCritics": "SELECT c.critic_id, c.studio_id\
+                      FROM CriticStudioCoverage c JOIN StudioMovieCount s\
+                      ON c.studio_id = s.studio_id AND c.rated_count = s.movie_count\
+                      ORDER BY c.critic_id DESC, c.studio_id DESC",
+    "averageAgeByGenre": "SELECT genre, CAST(AVG(age) AS FLOAT)\
+                          FROM (\
+                          SELECT DISTINCT genre, age, actor_id\
+                          FROM (\
+                          SELECT q1.actor_id, q1.movie_name, q1.year, q2.age\
+                          FROM (\
+                          (\
+                          SELECT actor_id, movie_name, year\
+                          FROM playedin\
+                          ) as q1\
+                          JOIN\
+                          (\
+                          SELECT age, actor_id\
+                          FROM actors\
+                          ) as q2 ON q1.actor_id=q2.actor_id)\
+                          ) as q3 JOIN movies m\
+                          ON q3.movie_name=m.movie_name AND q3.year=m.year\
+                          ) as q4\
+                          GROUP BY genre\
+                          ORDER BY genre ASC",
+    "getExclusiveActors": "SELECT DISTINCT q2.actor_id, a.studio_id \
+                           From ( \
+                           SELECT q1.actor_id, q1.num_studios \
+                           FROM ( \
+                           SELECT actor_id, COUNT(DISTINCT studio_id) AS num_studios \
+                           From actor_movie_studio \
+                           GROUP By actor_id \
+                           ) as q1 \
+                           Where num_studios = 1 \
+                           )AS q2 \
+                           Join ( \
+                           SELECT DISTINCT actor_id,studio_id \
+                           FROM actor_movie_studio \
+                           )AS a ON q2.actor_id=a.actor_id \
+                           ORDER BY q2.actor_id DESC",
+}
 
 
 def franchiseRevenue() -> List[Tuple[str, int]]:
     conn = None
     result = ResultSet()
+    cached = _cachedAdvanced("franchiseRevenue")
+    if cached is not None:
+        return cached
+    versions = _advancedVersions("franchiseRevenue")
     try:
-        conn = Connector.DBConnector()
-        query = sql.SQL("SELECT movie_name_from_movies as movie_name, COALESCE(total_rev, 0) as revenue\
-                        FROM (\
-                        (SELECT DISTINCT movie_name as movie_name_from_movies from movies) A\
-                        LEFT JOIN\
-                        (SELECT movie_name, SUM(revenue) as total_rev\
-                        FROM produced\
-                        GROUP by movie_name) B\
-                        ON A.movie_name_from_movies = B.movie_name\
-                        )\
-                        ORDER BY movie_name DESC")
-        _, result = conn.execute(query)
+        conn = Connector.DBConnector(readOnly=True)
+        _, result = conn.execute(sql.SQL(ADVANCED_QUERIES["franchiseRevenue"]))
+        _cacheAdvanced("franchiseRevenue", result.rows, versions, conn)
     except DatabaseException.ConnectionInvalid as e:
         print(e)
     except Exception as e:
@@ -773,13 +1551,14 @@ def franchiseRevenue() -> List[Tuple[str, int]]:
 def studioRevenueByYear() -> List[Tuple[int, int, int]]:
     conn = None
     result = ResultSet()
+    cached = _cachedAdvanced("studioRevenueByYear")
+    if cached is not None:
+        return cached
+    versions = _advancedVersions("studioRevenueByYear")
     try:
-        conn = Connector.DBConnector()
-        query = sql.SQL("SELECT studio_id, year, SUM(revenue) AS total_revenue\
-                        FROM produced\
-                        GROUP BY studio_id, year\
-                        ORDER BY studio_id DESC, year DESC")
-        _, result = conn.execute(query)
+        conn = Connector.DBConnector(readOnly=True)
+        _, result = conn.execute(sql.SQL(ADVANCED_QUERIES["studioRevenueByYear"]))
+        _cacheAdvanced("studioRevenueByYear", result.rows, versions, conn)
     except DatabaseException.ConnectionInvalid as e:
         print(e)
     except Exception as e:
@@ -792,35 +1571,14 @@ def studioRevenueByYear() -> List[Tuple[int, int, int]]:
 def getFanCritics() -> List[Tuple[int, int]]:
     conn = None
     result = ResultSet()
+    cached = _cachedAdvanced("getFanCritics")
+    if cached is not None:
+        return cached
+    versions = _advancedVersions("getFanCritics")
     try:
-        conn = Connector.DBConnector()
-        # NOTE - this query was not chosen because we believe the other one is more efficient (stated in the dry part)
-        # query = sql.SQL("SELECT  C.critic_id,S.studio_id \
-        #                         FROM critics C, studios S \
-        #                         WHERE EXISTS(SELECT * FROM rated ra WHERE C.critic_id = ra.critic_id) AND EXISTS(SELECT * FROM produced pa WHERE S.studio_id = pa.studio_id) AND not EXISTS( \
-        #                             SELECT p.movie_name, P.year \
-        #                             FROM produced P \
-        #                             WHERE P.studio_id = S.studio_id and ( \
-        #                                 (p.movie_name, p.year) NOT IN( \
-        #                                 SELECT r.movie_name, r.year \
-        #                                 FROM rated r \
-        #                                 WHERE r.critic_id = C.critic_id)) \
-        #                         ) \
-        #                         ORDER BY C.critic_id DESC, S.studio_id DESC")
-        query = sql.SQL("SELECT critic_id,q1.studio_id\
-                        from (\
-                        SELECT r.critic_id, studio_id, COUNT(studio_id) as num_reviews\
-                        FROM rated r JOIN produced p\
-                        ON r.movie_name=p.movie_name AND r.year=p.year\
-                        GROUP BY r.critic_id,p.studio_id\
-                        ) AS q1 JOIN (\
-                        SELECT studio_id, COUNT(studio_id) as num_movies\
-                        FROM produced p\
-                        GROUP BY p.studio_id\
-                        ) as q2\
-                        on q1.studio_id = q2.studio_id AND q1.num_reviews = q2.num_movies\
-                        Order BY critic_id DESC, studio_id DESC")
-        _, result = conn.execute(query)
+        conn = Connector.DBConnector(readOnly=True)
+        _, result = conn.execute(sql.SQL(ADVANCED_QUERIES["getFanCritics"]))
+        _cacheAdvanced("getFanCritics", result.rows, versions, conn)
     except DatabaseException.ConnectionInvalid as e:
         print(e)
     except Exception as e:
@@ -833,29 +1591,14 @@ def getFanCritics() -> List[Tuple[int, int]]:
 def averageAgeByGenre() -> List[Tuple[str, float]]:
     conn = None
     result = ResultSet()
+    cached = _cachedAdvanced("averageAgeByGenre")
+    if cached is not None:
+        return cached
+    versions = _advancedVersions("averageAgeByGenre")
     try:
-        conn = Connector.DBConnector()
-        query = sql.SQL("SELECT genre, (AVG(age)::FLOAT)\
-                        FROM (\
-                        SELECT DISTINCT genre, age, actor_id\
-                        FROM (\
-                        SELECT q1.actor_id, q1.movie_name, q1.year, q2.age\
-                        FROM (\
-                            (\
-                            SELECT actor_id, movie_name, year\
-                            FROM playedin\
-                            ) as q1\
-                        JOIN\
-                            (\
-                            SELECT age, actor_id\
-                            FROM actors\
-                            ) as q2 ON q1.actor_id=q2.actor_id)\
-                        ) as q3 JOIN movies m\
-                        ON q3.movie_name=m.movie_name AND q3.year=m.year\
-                        ) as q4\
-                        GROUP BY genre\
-                        ORDER BY genre ASC")
-        _, result = conn.execute(query)
+        conn = Connector.DBConnector(readOnly=True)
+        _, result = conn.execute(sql.SQL(ADVANCED_QUERIES["averageAgeByGenre"]))
+        _cacheAdvanced("averageAgeByGenre", result.rows, versions, conn)
     except DatabaseException.ConnectionInvalid as e:
         print(e)
     except Exception as e:
@@ -868,24 +1611,14 @@ def averageAgeByGenre() -> List[Tuple[str, float]]:
 def getExclusiveActors() -> List[Tuple[int, int]]:
     conn = None
     result = ResultSet()
+    cached = _cachedAdvanced("getExclusiveActors")
+    if cached is not None:
+        return cached
+    versions = _advancedVersions("getExclusiveActors")
     try:
-        conn = Connector.DBConnector()
-        query = sql.SQL("SELECT DISTINCT q2.actor_id, a.studio_id \
-                        From ( \
-                          SELECT q1.actor_id, q1.num_studios \
-                          FROM ( \
-                            SELECT actor_id, COUNT(DISTINCT studio_id) AS num_studios \
-                            From actor_movie_studio \
-                            GROUP By actor_id \
-                            ) as q1 \
-                            Where num_studios = 1 \
-                            )AS q2 \
-                        Join ( \
-                          SELECT DISTINCT actor_id,studio_id \
-                          FROM actor_movie_studio \
-                        )AS a ON q2.actor_id=a.actor_id \
-                        ORDER BY q2.actor_id DESC")
-        _, result = conn.execute(query)
+        conn = Connector.DBConnector(readOnly=True)
+        _, result = conn.execute(sql.SQL(ADVANCED_QUERIES["getExclusiveActors"]))
+        _cacheAdvanced("getExclusiveActors", result.rows, versions, conn)
     except DatabaseException.ConnectionInvalid as e:
         print(e)
     except Exception as e:
@@ -894,4 +1627,505 @@ def getExclusiveActors() -> List[Tuple[int, int]]:
         conn.close()
         return result.rows
 
+
+# ---------------------------------- STREAMING ADVANCED API: ----------------------------------
+# generator variants of the Advanced API for large outputs: rows come from a server-side cursor fetchSize at a
+# time (default: stream_fetch_size in database.ini), so memory stays flat whatever the size of the result.
+# the connection is held until the generator is exhausted or closed. a cached result is replayed instead.
+# a failure before the first row gives an empty stream as the list variants give [], one after it is raised:
+# stopping quietly would pass the rows so far off as the whole result
+def _streamAdvanced(name: str, fetchSize=None):
+    cached = _cachedAdvanced(name)
+    if cached is not None:
+        yield from cached
+        return
+    conn = None
+    streamed = False
+    try:
+        conn = Connector.DBConnector(readOnly=True)
+        for row in conn.stream(sql.SQL(ADVANCED_QUERIES[name]), fetchSize=fetchSize):
+            streamed = True
+            yield row
+    except DatabaseException.ConnectionInvalid as e:
+        if streamed:
+            raise
+        print(e)
+    except Exception as e:
+        if streamed:
+            raise
+        print(e)
+    finally:
+        if conn is not None:
+            conn.close()
+
+
+def franchiseRevenueStream(fetchSize=None) -> Iterator[Tuple[str, int]]:
+    return _streamAdvanced("franchiseRevenue", fetchSize)
+
+
+def studioRevenueByYearStream(fetchSize=None) -> Iterator[Tuple[int, int, int]]:
+    return _streamAdvanced("studioRevenueByYear", fetchSize)
+
+
+def getFanCriticsStream(fetchSize=None) -> Iterator[Tuple[int, int]]:
+    return _streamAdvanced("getFanCritics", fetchSize)
+
+
+def averageAgeByGenreStream(fetchSize=None) -> Iterator[Tuple[str, float]]:
+    return _streamAdvanced("averageAgeByGenre", fetchSize)
+
+
+def getExclusiveActorsStream(fetchSize=None) -> Iterator[Tuple[int, int]]:
+    return _streamAdvanced("getExclusiveActors", fetchSize)
+
+
+# ---------------------------------- COLUMNAR ADVANCED API: ----------------------------------
+# the Advanced API as {column name: array} for vectorized analytics, e.g.
+#     revenue = studioRevenueByYearColumns()["total_revenue"].sum()
+# numeric columns are NumPy arrays (typed array.array without NumPy), see Utility/Columnar.py.
+# built batch by batch from a server-side cursor, an empty Columns on error
+def _columnsAdvanced(name: str, fetchSize=None) -> Columnar.Columns:
+    conn = None
+    result = Columnar.Columns([], [], 0)
+    try:
+        conn = Connector.DBConnector(readOnly=True)
+        result = conn.executeColumnar(sql.SQL(ADVANCED_QUERIES[name]), fetchSize=fetchSize)
+    except DatabaseException.ConnectionInvalid as e:
+        print(e)
+    except Exception as e:
+        print(e)
+    finally:
+        if conn is not None:
+            conn.close()
+        return result
+
+
+def franchiseRevenueColumns(fetchSize=None) -> Columnar.Columns:
+    return _columnsAdvanced("franchiseRevenue", fetchSize)
+
+
+def studioRevenueByYearColumns(fetchSize=None) -> Columnar.Columns:
+    return _columnsAdvanced("studioRevenueByYear", fetchSize)
+
+
+def getFanCriticsColumns(fetchSize=None) -> Columnar.Columns:
+    return _columnsAdvanced("getFanCritics", fetchSize)
+
+
+def averageAgeByGenreColumns(fetchSize=None) -> Columnar.Columns:
+    return _columnsAdvanced("averageAgeByGenre", fetchSize)
+
+
+def getExclusiveActorsColumns(fetchSize=None) -> Columnar.Columns:
+    return _columnsAdvanced("getExclusiveActors", fetchSize)
+
+
+# ---------------------------------- INDEX INSPECTION: ----------------------------------
+# every index on the schema's tables: (table, index, definition)
+def getIndexes() -> List[Tuple[str, str, str]]:
+    conn = None
+    result = ResultSet()
+    try:
+        conn = Connector.DBConnector(readOnly=True)
+        query = sql.SQL("SELECT tablename, indexname, indexdef\
+                        FROM pg_indexes\
+                        WHERE schemaname = current_schema()\
+                        AND tablename IN ('actors','movies','studios','critics','playedin','playedinrole','produced','rated')\
+                        ORDER BY tablename, indexname")
+        if Connector.dialect() == "sqlite":
+            query = sql.SQL("SELECT lower(tbl_name) AS tablename, name AS indexname, sql AS indexdef\
+                            FROM sqlite_master\
+                            WHERE type = 'index'\
+                            AND lower(tbl_name) IN ('actors','movies','studios','critics','playedin','playedinrole','produced','rated')\
+                            ORDER BY tablename, indexname")
+        _, result = conn.execute(query)
+    except DatabaseException.ConnectionInvalid as e:
+        print(e)
+    except Exception as e:
+        print(e)
+    finally:
+        if conn is not None:
+            conn.close()
+        return result.rows
+
+
+# names of the INDEXES that are missing or not valid (e.g. a failed CREATE INDEX CONCURRENTLY), [] when all is well
+def verifyIndexes() -> List[str]:
+    conn = None
+    expected = [name for name, _ in INDEXES]
+    missing = list(expected)
+    try:
+        conn = Connector.DBConnector(readOnly=True)
+        query = "SELECT c.relname\
+                 FROM pg_class c JOIN pg_index i ON i.indexrelid = c.oid\
+                 WHERE c.relname = ANY(%s) AND i.indisvalid AND pg_table_is_visible(c.oid)"
+        if Connector.dialect() == "sqlite":
+            query = "SELECT name FROM sqlite_master WHERE type = 'index' AND name IN (SELECT value FROM json_each(%s))"
+        _, result = conn.execute(query, params=(expected,))
+        present = set(row[0] for row in result.rows)
+        missing = [name for name in expected if name not in present]
+    except DatabaseException.ConnectionInvalid as e:
+        print(e)
+    except Exception as e:
+        print(e)
+    finally:
+        if conn is not None:
+            conn.close()
+        return missing
+
+
+# ---------------------------------- BULK API: ----------------------------------
+# rows are streamed into a temporary staging table with COPY, checked against the same constraints the
+# single-row functions rely on and the valid ones inserted with one INSERT ... SELECT.
+# every function returns one ReturnValue per input row, in input order, exactly as calling the single-row
+# function once per row (in that order) would have: BAD_PARAMS for NOT NULL / CHECK violations, ALREADY_EXISTS
+# for duplicate keys (also within the batch), NOT_EXISTS for missing referenced rows and ERROR for values that
+# are not of the column's type.
+
+_INT_MIN, _INT_MAX = -2 ** 31, 2 ** 31 - 1
+
+
+# backends without COPY (SQLite) load row by row with the single-row function, in one transaction
+def _bulkCopy() -> bool:
+    return Connector.backend().copy
+
+
+def _bulkRows(function, rows) -> List[ReturnValue]:
+    rows = list(rows)
+    outcomes = [ReturnValue.ERROR] * len(rows)
+    try:
+        with transaction():
+            for ordinal, row in enumerate(rows):
+                try:
+                    outcomes[ordinal] = function(*row)
+                except Exception as e:  # e.g. roles=None
+                    print(e)
+    except Exception as e:
+        print(e)
+        outcomes = [ReturnValue.ERROR] * len(rows)
+    return outcomes
+
+
+# python value -> INTEGER column value, raises ValueError like PostgreSQL would reject the literal
+def _bulkInt(value):
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        raise ValueError("boolean is not an integer")
+    if isinstance(value, float):
+        value = int(value + 0.5) if value >= 0 else -int(-value + 0.5)  # numeric -> integer rounds half away from 0
+    elif not isinstance(value, int):
+        value = int(str(value).strip())
+    if not _INT_MIN <= value <= _INT_MAX:
+        raise ValueError("integer out of range")
+    return value
+
+
+def _bulkText(value):
+    if value is None:
+        return None
+    value = value if isinstance(value, str) else str(value)
+    if "\x00" in value:
+        raise ValueError("text can not contain NUL")
+    return value
+
+
+def _bulkTextArray(values):
+    if values is None:
+        return None
+    return [_bulkText(value) for value in values]
+
+
+# stage: (column, type, converter) in the target's column order
+# key: columns of the target's primary key
+# bad: NOT NULL / CHECK violation, missing: foreign key violation, over the staging row s
+# late: (condition, ReturnValue) checks that only fire once the row itself passed, e.g. on its roles
+# inserts: statements inserting the rows of classified with outcome 0
+def _bulkLoad(rows, stage, key, bad, missing, inserts, late=()) -> List[ReturnValue]:
+    conn = None
+    outcomes = []
+    staged = []
+
+    def stageRows():
+        for ordinal, row in enumerate(rows):
+            outcomes.append(ReturnValue.OK)
+            try:
+                staged_row = [ordinal] + [convert(value) for (_, _, convert), value in zip(stage, row)]
+            except Exception:
+                outcomes[ordinal] = ReturnValue.ERROR
+                continue
+            staged.append(ordinal)
+            yield staged_row
+
+    stream = stageRows()
+    target_key = " AND ".join("t." + column + " = s." + column for column in key)
+    late_fail = " OR ".join("(" + condition + ")" for condition, _ in late) or "FALSE"
+    late_cases = "".join(" WHEN " + condition + " THEN " + str(value.value) for condition, value in late)
+    query = "WITH checked AS (\
+                SELECT s.*, (" + bad + ") AS bad, (" + missing + ") AS missing, (" + late_fail + ") AS late,\
+                EXISTS (SELECT 1 FROM " + inserts[0][0] + " t WHERE " + target_key + ") AS taken\
+                FROM bulk_stage s\
+            ), classified AS (\
+                SELECT *, CASE WHEN bad THEN " + str(ReturnValue.BAD_PARAMS.value) + "\
+                WHEN taken OR COALESCE(bool_or(NOT bad AND NOT missing AND NOT late) OVER (\
+                    PARTITION BY " + ", ".join(key) + " ORDER BY ord\
+                    ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING), FALSE)\
+                THEN " + str(ReturnValue.ALREADY_EXISTS.value) + "\
+                WHEN missing THEN " + str(ReturnValue.NOT_EXISTS.value) + late_cases + "\
+                ELSE " + str(ReturnValue.OK.value) + " END AS outcome\
+                FROM checked\
+            )"
+    for index, (_, insert) in enumerate(inserts):
+        query += ", inserted_" + str(index) + " AS (" + insert + ")"
+    query += " SELECT ord, outcome FROM classified WHERE outcome <> " + str(ReturnValue.OK.value)
+    try:
+        conn = Connector.DBConnector()
+        conn.execute("DROP TABLE IF EXISTS pg_temp.bulk_stage;\
+                     CREATE TEMP TABLE bulk_stage(ord INTEGER, " +
+                     ", ".join(column + " " + column_type for column, column_type, _ in stage) + ")")
+        conn.copyFrom("bulk_stage", ["ord"] + [column for column, _, _ in stage], stream)
+        _, result = conn.execute(query)
+        for ordinal, outcome in result.rows:
+            outcomes[ordinal] = ReturnValue(outcome)
+        conn.execute("DROP TABLE bulk_stage")
+        _invalidateTables([table for table, _ in inserts])
+    except Exception as e:
+        print(e)
+        for _ in stream:  # rows not streamed yet still get their outcome
+            pass
+        for ordinal in staged:
+            outcomes[ordinal] = ReturnValue.ERROR
+    finally:
+        if conn is not None:
+            conn.close()
+        return outcomes
+
+
+def addCritics(critics: Iterable[Critic]) -> List[ReturnValue]:
+    if not _bulkCopy():
+        return _bulkRows(addCritic, ((critic,) for critic in critics))
+    outcomes = _bulkLoad(((critic.getCriticID(), critic.getName()) for critic in critics),
+                         [("critic_id", "INTEGER", _bulkInt), ("critic_name", "TEXT", _bulkText)],
+                         key=["critic_id"],
+                         bad="critic_id IS NULL OR critic_name IS NULL OR critic_id <= 0",
+                         missing="FALSE",
+                         inserts=[("Critics", "INSERT INTO Critics(critic_id, critic_name)\
+                                   SELECT critic_id, critic_name FROM classified WHERE outcome = 0")])
+    _invalidateProfile(None)
+    return outcomes
+
+
+def addActors(actors: Iterable[Actor]) -> List[ReturnValue]:
+    if not _bulkCopy():
+        return _bulkRows(addActor, ((actor,) for actor in actors))
+    outcomes = _bulkLoad(((actor.getActorID(), actor.getActorName(), actor.getAge(), actor.getHeight())
+                          for actor in actors),
+                         [("actor_id", "INTEGER", _bulkInt), ("actor_name", "TEXT", _bulkText),
+                          ("age", "INTEGER", _bulkInt), ("height", "INTEGER", _bulkInt)],
+                         key=["actor_id"],
+                         bad="actor_id IS NULL OR actor_name IS NULL OR age IS NULL OR height IS NULL\
+                             OR NOT (actor_id > 0 AND age > 0 AND height > 0)",
+                         missing="FALSE",
+                         inserts=[("Actors", "INSERT INTO Actors(actor_id, actor_name, age, height)\
+                                   SELECT actor_id, actor_name, age, height FROM classified WHERE outcome = 0")])
+    _invalidateProfile(None)
+    return outcomes
+
+
+def addMovies(movies: Iterable[Movie]) -> List[ReturnValue]:
+    if not _bulkCopy():
+        return _bulkRows(addMovie, ((movie,) for movie in movies))
+    outcomes = _bulkLoad(((movie.getMovieName(), movie.getYear(), movie.getGenre()) for movie in movies),
+                         [("movie_name", "TEXT", _bulkText), ("year", "INTEGER", _bulkInt), ("genre", "TEXT", _bulkText)],
+                         key=["movie_name", "year"],
+                         bad="movie_name IS NULL OR year IS NULL OR genre IS NULL\
+                             OR NOT (year >= 1895 AND genre IN ('Drama','Action','Comedy','Horror'))",
+                         missing="FALSE",
+                         inserts=[("Movies", "INSERT INTO Movies(movie_name, year, genre)\
+                                   SELECT movie_name, year, genre FROM classified WHERE outcome = 0")])
+    _invalidateProfile(None)
+    return outcomes
+
+
+def addStudios(studios: Iterable[Studio]) -> List[ReturnValue]:
+    if not _bulkCopy():
+        return _bulkRows(addStudio, ((studio,) for studio in studios))
+    outcomes = _bulkLoad(((studio.getStudioID(), studio.getStudioName()) for studio in studios),
+                         [("studio_id", "INTEGER", _bulkInt), ("studio_name", "TEXT", _bulkText)],
+                         key=["studio_id"],
+                         bad="studio_id IS NULL OR studio_name IS NULL OR studio_id <= 0",
+                         missing="FALSE",
+                         inserts=[("Studios", "INSERT INTO Studios(studio_id, studio_name)\
+                                   SELECT studio_id, studio_name FROM classified WHERE outcome = 0")])
+    _invalidateProfile(None)
+    return outcomes
+
+
+# ratings: (movieName, movieYear, criticID, rating) as for criticRatedMovie
+def bulkRated(ratings: Iterable[Tuple[str, int, int, int]]) -> List[ReturnValue]:
+    if not _bulkCopy():
+        return _bulkRows(criticRatedMovie, ratings)
+    return _bulkLoad(ratings,
+                     [("movie_name", "TEXT", _bulkText), ("year", "INTEGER", _bulkInt),
+                      ("critic_id", "INTEGER", _bulkInt), ("rating", "INTEGER", _bulkInt)],
+                     key=["movie_name", "year", "critic_id"],
+                     bad="movie_name IS NULL OR year IS NULL OR critic_id IS NULL OR rating IS NULL\
+                         OR NOT (rating >= 1 AND rating <= 5)",
+                     missing="NOT EXISTS (SELECT 1 FROM Movies m WHERE m.movie_name = s.movie_name AND m.year = s.year)\
+                             OR NOT EXISTS (SELECT 1 FROM Critics c WHERE c.critic_id = s.critic_id)",
+                     inserts=[("Rated", "INSERT INTO Rated(movie_name, year, critic_id, rating)\
+                               SELECT movie_name, year, critic_id, rating FROM classified WHERE outcome = 0")])
+
+
+# productions: (studioID, movieName, movieYear, budget, revenue) as for studioProducedMovie
+def bulkProduced(productions: Iterable[Tuple[int, str, int, int, int]]) -> List[ReturnValue]:
+    if not _bulkCopy():
+        return _bulkRows(studioProducedMovie, productions)
+    return _bulkLoad(((movie_name, year, studio_id, budget, revenue)
+                      for studio_id, movie_name, year, budget, revenue in productions),
+                     [("movie_name", "TEXT", _bulkText), ("year", "INTEGER", _bulkInt),
+                      ("studio_id", "INTEGER", _bulkInt), ("budget", "INTEGER", _bulkInt),
+                      ("revenue", "INTEGER", _bulkInt)],
+                     key=["movie_name", "year"],
+                     bad="movie_name IS NULL OR year IS NULL OR studio_id IS NULL OR budget IS NULL OR revenue IS NULL\
+                         OR NOT (budget >= 0 AND revenue >= 0)",
+                     missing="NOT EXISTS (SELECT 1 FROM Movies m WHERE m.movie_name = s.movie_name AND m.year = s.year)\
+                             OR NOT EXISTS (SELECT 1 FROM Studios st WHERE st.studio_id = s.studio_id)",
+                     inserts=[("Produced", "INSERT INTO Produced(movie_name, year, studio_id, budget, revenue)\
+                               SELECT movie_name, year, studio_id, budget, revenue FROM classified WHERE outcome = 0")])
+
+
+# casts: (movieName, movieYear, actorID, salary, roles) as for actorPlayedInMovie
+def bulkPlayedIn(casts: Iterable[Tuple[str, int, int, int, List[str]]]) -> List[ReturnValue]:
+    if not _bulkCopy():
+        return _bulkRows(actorPlayedInMovie, casts)
+    return _bulkLoad(casts,
+                     [("movie_name", "TEXT", _bulkText), ("year", "INTEGER", _bulkInt),
+                      ("actor_id", "INTEGER", _bulkInt), ("salary", "INTEGER", _bulkInt),
+                      ("roles", "TEXT[]", _bulkTextArray)],
+                     key=["actor_id", "movie_name", "year"],
+                     bad="movie_name IS NULL OR year IS NULL OR actor_id IS NULL OR salary IS NULL OR roles IS NULL\
+                         OR NOT (salary > 0 AND cardinality(roles) > 0)",
+                     missing="NOT EXISTS (SELECT 1 FROM Movies m WHERE m.movie_name = s.movie_name AND m.year = s.year)\
+                             OR NOT EXISTS (SELECT 1 FROM Actors a WHERE a.actor_id = s.actor_id)",
+                     late=[("array_position(roles, NULL) IS NOT NULL", ReturnValue.BAD_PARAMS),
+                           ("cardinality(roles) <> (SELECT COUNT(DISTINCT r) FROM unnest(roles) r)",
+                            ReturnValue.ALREADY_EXISTS)],
+                     inserts=[("PlayedIn", "INSERT INTO PlayedIn(actor_id, movie_name, year, salary, num_roles)\
+                               SELECT actor_id, movie_name, year, salary, cardinality(roles)\
+                               FROM classified WHERE outcome = 0"),
+                              ("PlayedInRole", "INSERT INTO PlayedInRole(actor_id, movie_name, year, actor_role)\
+                               SELECT actor_id, movie_name, year, unnest(roles) FROM classified WHERE outcome = 0")])
+
+
+# a whole cast of one movie in one call: (actorID, salary, roles) per actor, one ReturnValue each as for
+# actorPlayedInMovie. loaded with bulkPlayedIn
+def actorsPlayedInMovie(movieName: str, movieYear: int, cast: Iterable[Tuple[int, int, List[str]]]) -> List[ReturnValue]:
+    return bulkPlayedIn((movieName, movieYear, actorID, salary, roles) for actorID, salary, roles in cast)
+
+
+# ---------------------------------- BATCH API: ----------------------------------
+# many point queries answered by one set-based query on one connection. results are in input order, with the
+# defaults of the single-row function for missing keys. the keys are converted like the bulk API converts its rows,
+# a key that does not convert gets the default and is left out of the query. a database error fails the whole batch
+# (every answer is the default), where the single-row function would only fail for the offending key
+
+# ordinal -> converted key, for the keys whose values all convert
+def _batchKeys(keys, converters) -> dict:
+    converted = {}
+    for ordinal, key in enumerate(keys):
+        try:
+            key = tuple(key)
+            if len(key) != len(converters):
+                raise ValueError("expected " + str(len(converters)) + " values, got " + str(len(key)))
+            converted[ordinal] = tuple(convert(value) for convert, value in zip(converters, key))
+        except (TypeError, ValueError) as e:
+            print(e)
+    return converted
+
+
+# movies: (movieName, movieYear) pairs, as for averageRating
+def averageRatings(movies: Iterable[Tuple[str, int]]) -> List[float]:
+    conn = None
+    movies = list(movies)
+    res = [float(0)] * len(movies)
+    keys = _batchKeys(movies, (_bulkText, _bulkInt))
+    if not keys:
+        return res
+    try:
+        conn = Connector.DBConnector(readOnly=True)
+        _, result = conn.executePrepared("averageRatings", ([name for name, _ in keys.values()],
+                                                            [year for _, year in keys.values()]))
+        for ordinal, row in zip(keys, result.rows):
+            res[ordinal] = row[0]
+    except DatabaseException.ConnectionInvalid as e:
+        print(e)
+    except Exception as e:
+        print(e)
+    finally:
+        if conn is not None:
+            conn.close()
+        return res
+
+
+def averageActorRatings(actor_ids: Iterable[int]) -> List[float]:
+    conn = None
+    actor_ids = list(actor_ids)
+    res = [float(0)] * len(actor_ids)
+    keys = _batchKeys([(actor_id,) for actor_id in actor_ids], (_bulkInt,))
+    if not keys:
+        return res
+    try:
+        conn = Connector.DBConnector(readOnly=True)
+        _, result = conn.executePrepared("averageActorRatings", ([actor_id for actor_id, in keys.values()],))
+        for ordinal, row in zip(keys, result.rows):
+            res[ordinal] = row[0]
+    except DatabaseException.ConnectionInvalid as e:
+        print(e)
+    except Exception as e:
+        print(e)
+    finally:
+        if conn is not None:
+            conn.close()
+        return res
+
+
+# uses and fills the profile cache, only the actors missing from it are queried
+def getActorProfiles(actor_ids: Iterable[int]) -> List[Actor]:
+    conn = None
+    actor_ids = list(actor_ids)
+    ids = {ordinal: actor_id for ordinal, (actor_id,) in _batchKeys([(actor_id,) for actor_id in actor_ids],
+                                                                     (_bulkInt,)).items()}
+    profiles = [None] * len(actor_ids)
+    for ordinal, actor_id in ids.items():
+        profiles[ordinal] = _cachedProfile(_profileKey("actor", actor_id))
+    missing = list(dict.fromkeys(actor_id for ordinal, actor_id in ids.items() if profiles[ordinal] is None))
+    token = _profile_cache.token()
+    try:
+        if missing:
+            conn = Connector.DBConnector(readOnly=True)
+            _, result = conn.executePrepared("getActorProfiles", (missing,))
+            fetched = {}
+            for actor_id, row in zip(missing, result.rows):
+                profile = (1, ResultSet(result.description, [row])) if row[0] is not None else (0, ResultSet())
+                fetched[actor_id] = profile
+                _cacheProfile(_profileKey("actor", actor_id), profile, token, conn)
+            profiles = [fetched[ids[ordinal]] if profile is None and ordinal in ids else profile
+                        for ordinal, profile in enumerate(profiles)]
+    except DatabaseException.ConnectionInvalid as e:
+        print(e)
+    except Exception as e:
+        print(e)
+    finally:
+        if conn is not None:
+            conn.close()
+        return [CreateActorFromResultSet(profile[1], profile[0]) if profile is not None else Actor.badActor()
+                for profile in profiles]
+
+
+# ---------------------------------- in-memory engine ----------------------------------
+# backend=memory replaces every function above with its pure-Python counterpart, no database is used
+if Config.get("connector", "backend") == "memory":
+    from MemorySolution import *
+
 # GOOD LUCK!
@@ -0,0 +1,50 @@
+import unittest
+import Solution
+from Tests.abstractTest import AbstractTest
+
+from Business.Actor import Actor
+from Business.Movie import Movie
+from Business.Studio import Studio
+
+'''
+    Advanced API results are cached until a write touches a table they read
+'''
+
+
+class Test(AbstractTest):
+    rollback = False  # the cache only keeps what was committed
+
+    def testUnrelatedWriteKeepsResult(self) -> None:
+        Solution.addMovie(Movie(movie_name="Heat", year=1995, genre="Action"))
+        Solution.addStudio(Studio(studio_id=1, studio_name="Warner"))
+        Solution.studioProducedMovie(1, "Heat", 1995, 10, 100)
+        self.assertEqual([(1, 1995, 100)], Solution.studioRevenueByYear())
+        hits = Solution.advancedCacheStats()["hits"]
+        Solution.addActor(Actor(actor_id=1, actor_name="Al Pacino", age=80, height=170))
+        self.assertEqual([(1, 1995, 100)], Solution.studioRevenueByYear())
+        self.assertEqual(hits + 1, Solution.advancedCacheStats()["hits"])
+
+    def testWritesInvalidate(self) -> None:
+        Solution.addMovie(Movie(movie_name="Heat", year=1995, genre="Action"))
+        Solution.addStudio(Studio(studio_id=1, studio_name="Warner"))
+        self.assertEqual([("Heat", 0)], Solution.franchiseRevenue())
+        Solution.studioProducedMovie(1, "Heat", 1995, 10, 100)
+        self.assertEqual([("Heat", 100)], Solution.franchiseRevenue())
+        self.assertEqual([(1, 1995, 100)], Solution.studioRevenueByYear())
+        # the cascade removes the Produced row as well
+        Solution.deleteStudio(1)
+        self.assertEqual([("Heat", 0)], Solution.franchiseRevenue())
+        self.assertEqual([], Solution.studioRevenueByYear())
+
+    def testCascadeFromMovies(self) -> None:
+        Solution.addMovie(Movie(movie_name="Heat", year=1995, genre="Action"))
+        Solution.addActor(Actor(actor_id=1, actor_name="Al Pacino", age=80, height=170))
+        Solution.actorPlayedInMovie("Heat", 1995, 1, 100, ["Vincent"])
+        self.assertEqual([("Action", 80.0)], Solution.averageAgeByGenre())
+        Solution.deleteMovie("Heat", 1995)
+        self.assertEqual([], Solution.averageAgeByGenre())
+
+
+# *** DO NOT RUN EACH TEST MANUALLY ***
+if __name__ == '__main__':
+    unittest.main(verbosity=2, exit=False)
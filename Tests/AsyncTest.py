@@ -0,0 +1,58 @@
+import asyncio
+import unittest
+import AsyncSolution
+import Solution
+from Tests.abstractTest import AbstractTest
+from Utility.ReturnValue import ReturnValue
+
+from Business.Actor import Actor
+from Business.Movie import Movie
+
+'''
+    AsyncSolution returns exactly what Solution returns
+'''
+
+
+class Test(AbstractTest):
+    rollback = False  # the calls run on the executor's threads
+
+    def testSameReturnValues(self) -> None:
+        async def scenario():
+            self.assertEqual(ReturnValue.OK, await AsyncSolution.addActor(Actor(actor_id=1, actor_name="Al",
+                                                                                age=80, height=170)))
+            self.assertEqual(ReturnValue.ALREADY_EXISTS,
+                             await AsyncSolution.addActor(Actor(actor_id=1, actor_name="Al", age=80, height=170)))
+            self.assertEqual(ReturnValue.OK, await AsyncSolution.addMovie(Movie(movie_name="Heat", year=1995,
+                                                                                genre="Action")))
+            self.assertEqual(ReturnValue.NOT_EXISTS,
+                             await AsyncSolution.actorPlayedInMovie("Heat", 1995, 2, 100, ["Neil"]))
+            self.assertEqual(ReturnValue.OK, await AsyncSolution.actorPlayedInMovie("Heat", 1995, 1, 100, ["Neil"]))
+            self.assertEqual(["Neil"], await AsyncSolution.getActorsRoleInMovie(1, "Heat", 1995))
+            self.assertEqual([("Action", 80.0)], await AsyncSolution.averageAgeByGenre())
+
+        asyncio.run(scenario())
+
+    def testConcurrentLookups(self) -> None:
+        Solution.addActors(Actor(actor_id=i, actor_name="actor" + str(i), age=30, height=180) for i in range(1, 51))
+
+        async def scenario():
+            return await asyncio.gather(*[AsyncSolution.getActorProfile(i) for i in range(1, 201)])
+
+        actors = asyncio.run(scenario())
+        self.assertEqual(list(range(1, 51)), [actor.getActorID() for actor in actors[:50]])
+        self.assertEqual(Actor.badActor(), actors[100])
+
+    def testTransactionRollback(self) -> None:
+        async def scenario():
+            async with AsyncSolution.transaction() as tx:
+                await AsyncSolution.addMovie(Movie(movie_name="Heat", year=1995, genre="Action"))
+                self.assertEqual("Heat", (await AsyncSolution.getMovieProfile("Heat", 1995)).getMovieName())
+                tx.rollback()
+            return await AsyncSolution.getMovieProfile("Heat", 1995)
+
+        self.assertEqual(Movie.badMovie(), asyncio.run(scenario()))
+
+
+# *** DO NOT RUN EACH TEST MANUALLY ***
+if __name__ == '__main__':
+    unittest.main(verbosity=2, exit=False)
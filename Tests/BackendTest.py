@@ -0,0 +1,95 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+
+import Solution
+import Utility.Backends as Backends
+import Utility.DBConnector as Connector
+from Utility.Exceptions import DatabaseException
+from Utility.ReturnValue import ReturnValue
+from psycopg2 import sql
+
+from Business.Actor import Actor
+from Business.Critic import Critic
+from Business.Movie import Movie
+
+'''
+    the SQLite backend: same schema, constraints and ReturnValues as PostgreSQL, no server needed
+'''
+
+
+class Test(unittest.TestCase):
+
+    def setUp(self) -> None:
+        Connector.configureBackend("sqlite")
+        Solution.createTables()
+
+    def tearDown(self) -> None:
+        Solution.dropTables()
+        Connector.configureBackend(None)
+
+    def testConstraints(self) -> None:
+        self.assertEqual(ReturnValue.BAD_PARAMS, Solution.addCritic(Critic(critic_id=None, critic_name="John")))
+        self.assertEqual(ReturnValue.BAD_PARAMS, Solution.addCritic(Critic(critic_id=0, critic_name="John")))
+        self.assertEqual(ReturnValue.OK, Solution.addCritic(Critic(critic_id=1, critic_name="John")))
+        self.assertEqual(ReturnValue.ALREADY_EXISTS, Solution.addCritic(Critic(critic_id=1, critic_name="Bob")))
+        self.assertEqual(ReturnValue.ERROR, Solution.addCritic(Critic(critic_id="one", critic_name="Bob")),
+                         "STRICT tables reject values of the wrong type")
+        self.assertEqual(ReturnValue.OK, Solution.addMovie(Movie(movie_name="Heat", year="1995", genre="Action")))
+        self.assertEqual(ReturnValue.BAD_PARAMS, Solution.addMovie(Movie(movie_name="Heat", year=1995, genre="Jazz")))
+        self.assertEqual(ReturnValue.NOT_EXISTS, Solution.criticRatedMovie("Heat", 1995, 2, 5))
+        self.assertEqual(ReturnValue.OK, Solution.criticRatedMovie("Heat", 1995, 1, 4))
+
+    def testCascadesAndAggregates(self) -> None:
+        Solution.addMovie(Movie(movie_name="Heat", year=1995, genre="Action"))
+        Solution.addActor(Actor(actor_id=1, actor_name="Al", age=55, height=170))
+        for critic_id, rating in ((1, 5), (2, 2)):
+            Solution.addCritic(Critic(critic_id=critic_id, critic_name="critic" + str(critic_id)))
+            Solution.criticRatedMovie("Heat", 1995, critic_id, rating)
+        self.assertEqual(ReturnValue.OK, Solution.actorPlayedInMovie("Heat", 1995, 1, 100, ["Vincent", "Hanna"]))
+        self.assertEqual(3.5, Solution.averageRating("Heat", 1995))
+        self.assertEqual([3.5, 0.0], Solution.averageRatings([("Heat", 1995), ("Ronin", 1998)]))
+        self.assertEqual(ReturnValue.OK, Solution.deleteCritic(1))
+        self.assertEqual(2.0, Solution.averageActorRating(1), "the trigger follows the cascaded delete")
+        self.assertEqual(ReturnValue.OK, Solution.deleteActor(1))
+        self.assertEqual([], Solution.getActorsRoleInMovie(1, "Heat", 1995))
+        self.assertEqual([], Solution.verifyIndexes())
+
+    def testErrorMapping(self) -> None:
+        backend = Backends.SQLiteBackend()
+        connection = sqlite3.connect(":memory:")
+        connection.execute("CREATE TABLE t(a INTEGER NOT NULL UNIQUE CHECK (a > 0)) STRICT")
+        connection.execute("INSERT INTO t VALUES(1)")
+        for statement, expected in (("INSERT INTO t VALUES(NULL)", DatabaseException.NOT_NULL_VIOLATION),
+                                    ("INSERT INTO t VALUES(1)", DatabaseException.UNIQUE_VIOLATION),
+                                    ("INSERT INTO t VALUES(-1)", DatabaseException.CHECK_VIOLATION)):
+            with self.assertRaises(sqlite3.IntegrityError) as raised:
+                connection.execute(statement)
+            self.assertIsInstance(backend.translateError(raised.exception), expected, statement)
+        self.assertIsNone(backend.translateError(ValueError()))
+        connection.close()
+
+    def testQueryRendering(self) -> None:
+        self.assertEqual("SELECT * FROM t WHERE a=?1 AND b=?2", Backends.sqliteQuery("SELECT * FROM t WHERE a=$1 AND b=$2"))
+        self.assertEqual('SELECT "x" FROM t', Backends.sqliteQuery(sql.SQL("SELECT {} FROM t").format(sql.Identifier("x"))))
+        self.assertEqual('["a", "b"]', Backends.sqliteParam(["a", "b"]))
+
+    def testFileDatabase(self) -> None:
+        handle, filename = tempfile.mkstemp(suffix=".db")
+        os.close(handle)
+        try:
+            Connector.configureBackend("sqlite", database=filename)
+            Solution.createTables()
+            self.assertEqual(ReturnValue.OK, Solution.addCritic(Critic(critic_id=1, critic_name="John")))
+            Connector.configureBackend("sqlite", database=filename)  # reconnects, the file keeps the data
+            self.assertEqual("John", Solution.getCriticProfile(1).getName())
+            Solution.dropTables()
+        finally:
+            Connector.configureBackend("sqlite")
+            os.remove(filename)
+
+
+# *** DO NOT RUN EACH TEST MANUALLY ***
+if __name__ == '__main__':
+    unittest.main(verbosity=2, exit=False)
@@ -0,0 +1,92 @@
+import unittest
+from unittest import mock
+
+import Solution
+import Utility.Config as Config
+import Utility.DBConnector as Connector
+from Tests.abstractTest import AbstractTest
+
+from Business.Actor import Actor
+from Business.Critic import Critic
+from Business.Movie import Movie
+from Utility.Exceptions import DatabaseException
+
+'''
+    batched point queries answer exactly like the single-row functions, in input order
+'''
+
+
+class Test(AbstractTest):
+    rollback = False  # the cache only keeps what was committed
+
+    def setUp(self) -> None:
+        super().setUp()
+        Solution.addMovie(Movie(movie_name="Heat", year=1995, genre="Action"))
+        Solution.addMovie(Movie(movie_name="Ronin", year=1998, genre="Action"))
+        Solution.addMovie(Movie(movie_name="Casino", year=1995, genre="Drama"))
+        Solution.addActor(Actor(actor_id=1, actor_name="Robert De Niro", age=80, height=177))
+        Solution.addActor(Actor(actor_id=2, actor_name="Al Pacino", age=83, height=170))
+        Solution.actorPlayedInMovie("Heat", 1995, 1, 100, ["Neil"])
+        Solution.actorPlayedInMovie("Ronin", 1998, 1, 100, ["Sam"])
+        Solution.actorPlayedInMovie("Heat", 1995, 2, 100, ["Vincent"])
+        for critic_id in (1, 2):
+            Solution.addCritic(Critic(critic_id=critic_id, critic_name="critic" + str(critic_id)))
+        Solution.criticRatedMovie("Heat", 1995, 1, 5)
+        Solution.criticRatedMovie("Heat", 1995, 2, 4)
+        Solution.criticRatedMovie("Ronin", 1998, 1, 2)
+
+    def testAverageRatings(self) -> None:
+        movies = [("Ronin", 1998), ("Heat", 1995), ("Casino", 1995), ("Missing", 2000), ("Heat", 1995)]
+        expected = [Solution.averageRating(name, year) for name, year in movies]
+        self.assertEqual([2.0, 4.5, 0.0, 0.0, 4.5], expected)
+        self.assertEqual(expected, Solution.averageRatings(movies))
+        self.assertEqual([], Solution.averageRatings([]))
+
+    def testAverageActorRatings(self) -> None:
+        actor_ids = [2, 1, 3, 1]
+        expected = [Solution.averageActorRating(actor_id) for actor_id in actor_ids]
+        self.assertEqual(expected, Solution.averageActorRatings(actor_ids))
+        self.assertEqual([], Solution.averageActorRatings([]))
+
+    def testGetActorProfiles(self) -> None:
+        Solution.configureProfileCache(enabled=False)
+        try:
+            actor_ids = [2, 3, 1, 2]
+            expected = [Solution.getActorProfile(actor_id) for actor_id in actor_ids]
+            self.assertEqual(Actor.badActor(), expected[1])
+            self.assertEqual(expected, Solution.getActorProfiles(actor_ids))
+        finally:
+            Solution.configureProfileCache()
+
+    def testStringKeys(self) -> None:
+        # converted like the single-row functions, only the keys that do not convert get the default
+        movies = [("Heat", "1995"), ("Heat", "x"), ("Ronin", 1998)]
+        self.assertEqual([4.5, 0.0, 2.0], Solution.averageRatings(movies))
+        expected = Solution.averageActorRatings([2, 1])
+        self.assertEqual([expected[0], 0.0, 0.0, expected[1]], Solution.averageActorRatings(["2", "two", None, 1]))
+        profiles = Solution.getActorProfiles(["1", "x", 2])
+        self.assertEqual(["Robert De Niro", "Al Pacino"], [profiles[0].getActorName(), profiles[2].getActorName()])
+        self.assertEqual(Actor.badActor(), profiles[1])
+
+    @unittest.skipIf(Config.get("connector", "backend") == "memory", "the memory backend has no profile cache")
+    def testGetActorProfilesUsesCache(self) -> None:
+        Solution.getActorProfile(1)
+        hits = Solution.profileCacheStats()["hits"]
+        profiles = Solution.getActorProfiles([1, 2])
+        self.assertEqual(hits + 1, Solution.profileCacheStats()["hits"])
+        self.assertEqual(["Robert De Niro", "Al Pacino"], [actor.getActorName() for actor in profiles])
+        self.assertEqual(profiles[1], Solution.getActorProfile(2), "the batch filled the cache")
+
+    @unittest.skipIf(Config.get("connector", "backend") == "memory", "the memory backend opens no connection")
+    def testConnectionFailure(self) -> None:
+        unreachable = DatabaseException.ConnectionInvalid("Could not connect to database")
+        with mock.patch.object(Connector, "DBConnector", side_effect=unreachable):
+            self.assertEqual([0.0, 0.0], Solution.averageRatings([("Heat", 1995), ("Ronin", 1998)]))
+            self.assertEqual([0.0], Solution.averageActorRatings([1]))
+            self.assertEqual([], Solution.getIndexes())
+            self.assertEqual([name for name, _ in Solution.INDEXES], Solution.verifyIndexes())
+
+
+# *** DO NOT RUN EACH TEST MANUALLY ***
+if __name__ == '__main__':
+    unittest.main(verbosity=2, exit=False)
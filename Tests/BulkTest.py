@@ -0,0 +1,58 @@
+import unittest
+import Solution
+from Utility.ReturnValue import ReturnValue
+from Tests.abstractTest import AbstractTest
+
+from Business.Critic import Critic
+from Business.Actor import Actor
+from Business.Movie import Movie
+from Business.Studio import Studio
+
+'''
+    Bulk API: one ReturnValue per row, the same ones the single-row functions return
+'''
+
+
+class Test(AbstractTest):
+
+    def testAddEntities(self) -> None:
+        self.assertEqual(ReturnValue.OK, Solution.addCritic(Critic(critic_id=1, critic_name="John")))
+        critics = [Critic(critic_id=1, critic_name="Bob"), Critic(critic_id=2, critic_name="Alice"),
+                   Critic(critic_id=2, critic_name="Alice again"), Critic(critic_id=-3, critic_name="Neg"),
+                   Critic(critic_id=None, critic_name="Nobody"), Critic(critic_id="three", critic_name="Typo")]
+        self.assertEqual([ReturnValue.ALREADY_EXISTS, ReturnValue.OK, ReturnValue.ALREADY_EXISTS,
+                          ReturnValue.BAD_PARAMS, ReturnValue.BAD_PARAMS, ReturnValue.ERROR],
+                         Solution.addCritics(critics))
+        self.assertEqual("Alice", Solution.getCriticProfile(2).getName(), "first of the duplicates wins")
+        movies = [Movie(movie_name="Heat", year="1995", genre="Action"), Movie(movie_name="Old", year=1800, genre="Drama"),
+                  Movie(movie_name="Heat", year=1996, genre="Musical")]
+        self.assertEqual([ReturnValue.OK, ReturnValue.BAD_PARAMS, ReturnValue.BAD_PARAMS], Solution.addMovies(movies))
+        self.assertEqual([ReturnValue.OK], Solution.addActors([Actor(actor_id=1, actor_name="Al", age=55, height=170)]))
+        self.assertEqual([ReturnValue.OK], Solution.addStudios([Studio(studio_id=1, studio_name="Warner Bros")]))
+        self.assertEqual([], Solution.addStudios([]), "empty batch")
+
+    def testRelations(self) -> None:
+        Solution.addMovie(Movie(movie_name="Heat", year=1995, genre="Action"))
+        Solution.addCritic(Critic(critic_id=1, critic_name="John"))
+        Solution.addActor(Actor(actor_id=1, actor_name="Al", age=55, height=170))
+        Solution.addActor(Actor(actor_id=2, actor_name="Bob", age=70, height=177))
+        Solution.addStudio(Studio(studio_id=1, studio_name="Warner Bros"))
+        self.assertEqual([ReturnValue.OK, ReturnValue.ALREADY_EXISTS, ReturnValue.NOT_EXISTS, ReturnValue.BAD_PARAMS],
+                         Solution.bulkRated([("Heat", 1995, 1, 4), ("Heat", 1995, 1, 5), ("Heat", 1995, 2, 3),
+                                             ("Heat", 1995, 1, 6)]))
+        self.assertEqual(4.0, Solution.averageRating("Heat", 1995))
+        self.assertEqual([ReturnValue.NOT_EXISTS, ReturnValue.OK, ReturnValue.ALREADY_EXISTS],
+                         Solution.bulkProduced([(2, "Heat", 1995, 10, 20), (1, "Heat", 1995, 10, 20),
+                                                (1, "Heat", 1995, 30, 40)]))
+        self.assertEqual([ReturnValue.OK, ReturnValue.ALREADY_EXISTS, ReturnValue.BAD_PARAMS, ReturnValue.NOT_EXISTS],
+                         Solution.bulkPlayedIn([("Heat", 1995, 1, 100, ["Vincent", "Cop"]),
+                                                ("Heat", 1995, 2, 100, ["Neil", "Neil"]),
+                                                ("Heat", 1995, 2, 100, []),
+                                                ("Heat", 1995, 3, 100, ["Chris"])]))
+        self.assertEqual(["Vincent", "Cop"], Solution.getActorsRoleInMovie(1, "Heat", 1995))
+        self.assertEqual(10 - 100, Solution.stageCrewBudget("Heat", 1995))
+
+
+# *** DO NOT RUN EACH TEST MANUALLY ***
+if __name__ == '__main__':
+    unittest.main(verbosity=2, exit=False)
@@ -0,0 +1,85 @@
+import unittest
+from unittest import mock
+
+from Utility.Cache import DependencyCache, LRUCache
+
+
+class Test(unittest.TestCase):
+    def testHitsAndMisses(self) -> None:
+        cache = LRUCache(capacity=10)
+        self.assertIsNone(cache.get("a"))
+        cache.put("a", 1)
+        self.assertEqual(1, cache.get("a"))
+        stats = cache.stats()
+        self.assertEqual((1, 1, 1), (stats["hits"], stats["misses"], stats["size"]))
+
+    def testLeastRecentlyUsedIsEvicted(self) -> None:
+        cache = LRUCache(capacity=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(1, cache.get("a"))
+        self.assertEqual(3, cache.get("c"))
+        self.assertEqual(1, cache.stats()["evictions"])
+
+    def testTimeToLive(self) -> None:
+        cache = LRUCache(ttl=10)
+        with mock.patch("Utility.Cache.time.monotonic", return_value=100.0):
+            cache.put("a", 1)
+        with mock.patch("Utility.Cache.time.monotonic", return_value=105.0):
+            self.assertEqual(1, cache.get("a"))
+        with mock.patch("Utility.Cache.time.monotonic", return_value=111.0):
+            self.assertIsNone(cache.get("a"))
+        self.assertEqual(0, cache.stats()["size"])
+
+    def testInvalidation(self) -> None:
+        cache = LRUCache()
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.invalidate("a")
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(2, cache.get("b"))
+        cache.clear()
+        self.assertIsNone(cache.get("b"))
+
+    def testStalePutIsDropped(self) -> None:
+        cache = LRUCache()
+        token = cache.token()
+        cache.invalidate("a")  # a writer ran while the value was being read
+        cache.put("a", "stale", token)
+        self.assertIsNone(cache.get("a"))
+        cache.put("a", "fresh", cache.token())
+        self.assertEqual("fresh", cache.get("a"))
+
+    def testDisabled(self) -> None:
+        cache = LRUCache(enabled=False)
+        cache.put("a", 1)
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(0, cache.stats()["size"])
+
+    def testDependencyVersions(self) -> None:
+        cache = DependencyCache()
+        cache.put("revenue", [("a", 1)], cache.versions(["Movies", "Produced"]))
+        cache.invalidate("Rated")
+        self.assertEqual([("a", 1)], cache.get("revenue", ["Movies", "Produced"]))
+        cache.invalidate("produced")
+        self.assertIsNone(cache.get("revenue", ["Movies", "Produced"]))
+        self.assertEqual((1, 1), (cache.stats()["hits"], cache.stats()["stale"]))
+
+    def testDependencyRacingWrite(self) -> None:
+        cache = DependencyCache()
+        versions = cache.versions(["Produced"])
+        cache.invalidate("Produced")  # a writer committed while the query ran
+        cache.put("revenue", [], versions)
+        self.assertIsNone(cache.get("revenue", ["Produced"]))
+        versions = cache.versions(["Produced"])
+        cache.clear()
+        cache.put("revenue", [], versions)
+        self.assertIsNone(cache.get("revenue", ["Produced"]))
+
+
+# *** DO NOT RUN EACH TEST MANUALLY ***
+if __name__ == '__main__':
+    unittest.main(verbosity=2, exit=False)
@@ -0,0 +1,71 @@
+import array
+import math
+import unittest
+from collections import namedtuple
+from decimal import Decimal
+from unittest import mock
+
+import Utility.Columnar as Columnar
+from Utility.DBConnector import ResultSet
+
+Column = namedtuple("Column", ["name", "type_code"])
+DESCRIPTION = [Column("studio_id", 23), Column("genre", 25), Column("average", 1700)]
+ROWS = [(1, "Drama", Decimal("30.5")), (2, "Action", None), (3, "Comedy", Decimal("41"))]
+
+
+# a cursor handing out rows in batches, like a server-side cursor
+class FakeCursor:
+    def __init__(self, rows):
+        self.rows = rows
+        self.description = None
+        self.fetches = []
+
+    def fetchmany(self, size):
+        self.description = DESCRIPTION
+        batch, self.rows = self.rows[:size], self.rows[size:]
+        self.fetches.append(len(batch))
+        return batch
+
+
+class Test(unittest.TestCase):
+    def testWithoutNumpy(self) -> None:
+        with mock.patch.object(Columnar, "numpy", None):
+            columns = ResultSet(DESCRIPTION, ROWS).columns()
+        self.assertEqual(["studio_id", "genre", "average"], columns.names)
+        self.assertEqual(3, columns.size)
+        self.assertEqual(array.array("i", [1, 2, 3]), columns["studio_id"])
+        self.assertEqual(["Drama", "Action", "Comedy"], columns["genre"])
+        self.assertEqual("d", columns["average"].typecode)
+        self.assertEqual(30.5, columns["average"][0])
+        self.assertTrue(math.isnan(columns["average"][1]), "NULL becomes NaN")
+
+    def testNullWidensIntegers(self) -> None:
+        with mock.patch.object(Columnar, "numpy", None):
+            columns = Columnar.fromRows(DESCRIPTION, [(1, "Drama", None), (None, "Drama", None)])
+        self.assertEqual("d", columns["studio_id"].typecode)
+        self.assertEqual(1.0, columns["studio_id"][0])
+        self.assertTrue(math.isnan(columns["studio_id"][1]))
+
+    def testFromCursorInBatches(self) -> None:
+        cursor = FakeCursor(ROWS)
+        with mock.patch.object(Columnar, "numpy", None):
+            columns = Columnar.fromCursor(cursor, 2)
+        self.assertEqual([2, 1, 0], cursor.fetches)
+        self.assertEqual(array.array("i", [1, 2, 3]), columns["studio_id"])
+
+    def testEmpty(self) -> None:
+        self.assertEqual(0, ResultSet().columns().size)
+        self.assertEqual(0, Columnar.fromCursor(FakeCursor([]), 10).size)
+
+    @unittest.skipIf(Columnar.numpy is None, "NumPy is not installed")
+    def testNumpy(self) -> None:
+        columns = ResultSet(DESCRIPTION, ROWS).columns()
+        self.assertEqual("int32", str(columns["studio_id"].dtype))
+        self.assertEqual(6, columns["studio_id"].sum())
+        self.assertEqual(object, columns["genre"].dtype)
+        self.assertEqual(71.5, Columnar.numpy.nansum(columns["average"]))
+
+
+# *** DO NOT RUN EACH TEST MANUALLY ***
+if __name__ == '__main__':
+    unittest.main(verbosity=2, exit=False)
@@ -0,0 +1,56 @@
+import os
+import tempfile
+import unittest
+
+import Utility.Config as Config
+from Utility.Exceptions import DatabaseException
+
+
+class Test(unittest.TestCase):
+    def setUp(self) -> None:
+        self.saved_environ = dict(os.environ)
+        handle, self.filename = tempfile.mkstemp(suffix=".ini")
+        with os.fdopen(handle, "w") as ini:
+            ini.write("[postgresql]\nhost=primary\nport=5432\n\n[postgresql_replica]\nhost=replica\n")
+        os.environ[Config.CONFIG_FILE_ENV] = self.filename
+        Config.reload()
+
+    def tearDown(self) -> None:
+        os.environ.clear()
+        os.environ.update(self.saved_environ)
+        os.remove(self.filename)
+        Config.reload()
+
+    def testNamedSections(self) -> None:
+        self.assertEqual({"host": "primary", "port": "5432"}, Config.section("postgresql"))
+        self.assertEqual("replica", Config.get("postgresql_replica", "host"))
+        self.assertRaises(DatabaseException.database_ini_ERROR, Config.section, "missing")
+
+    def testLoadedOnce(self) -> None:
+        with open(self.filename, "a") as ini:
+            ini.write("\n[late]\nkey=value\n")
+        self.assertFalse(Config.hasSection("late"), "file is not re-read without reload()")
+        generation = Config.generation()
+        Config.reload()
+        self.assertTrue(Config.hasSection("late"))
+        self.assertEqual(generation + 1, Config.generation())
+
+    def testEnvironmentOverrides(self) -> None:
+        os.environ["DB_POSTGRESQL__HOST"] = "override"
+        os.environ["DB_POSTGRESQL_REPLICA__PORT"] = "5433"
+        os.environ["DB_CONNECTOR__POOL_MAX_SIZE"] = "3"
+        Config.reload()
+        self.assertEqual("override", Config.get("postgresql", "host"))
+        self.assertEqual(5433, Config.getInt("postgresql_replica", "port"))
+        self.assertEqual(3, Config.getInt("connector", "pool_max_size"))
+
+    def testReloadNotifiesListeners(self) -> None:
+        calls = []
+        Config.onReload(lambda: calls.append(Config.get("postgresql", "host")))
+        Config.reload()
+        self.assertEqual(["primary"], calls)
+
+
+# *** DO NOT RUN EACH TEST MANUALLY ***
+if __name__ == '__main__':
+    unittest.main(verbosity=2, exit=False)
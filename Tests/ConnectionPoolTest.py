@@ -0,0 +1,118 @@
+import threading
+import time
+import unittest
+
+from psycopg2 import extensions
+
+from Utility.ConnectionPool import ConnectionPool
+from Utility.Exceptions import DatabaseException
+
+
+class FakeCursor:
+    def __init__(self, connection):
+        self.connection = connection
+
+    def execute(self, query):
+        if not self.connection.alive:
+            raise Exception("server closed the connection")
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self):
+        self.closed = 0
+        self.alive = True
+        self.autocommit = False
+        self.status = extensions.TRANSACTION_STATUS_IDLE
+        self.rollbacks = 0
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def get_transaction_status(self):
+        return self.status
+
+    def rollback(self):
+        self.rollbacks += 1
+        self.status = extensions.TRANSACTION_STATUS_IDLE
+
+    def close(self):
+        self.closed = 1
+
+
+class Test(unittest.TestCase):
+    def setUp(self) -> None:
+        self.opened = []
+
+    def connect(self):
+        connection = FakeConnection()
+        self.opened.append(connection)
+        return connection
+
+    def testReuse(self) -> None:
+        pool = ConnectionPool(self.connect, min_size=1, max_size=2)
+        self.assertEqual(1, len(self.opened), "min_size connections are opened up front")
+        first = pool.acquire()
+        pool.release(first)
+        second = pool.acquire()
+        self.assertIs(first, second, "idle connection is reused")
+        self.assertEqual(1, len(self.opened), "no new connection for a reused one")
+        pool.release(second)
+        pool.close()
+        self.assertTrue(self.opened[0].closed, "close() closes idle connections")
+
+    def testOpenTransactionRolledBackOnRelease(self) -> None:
+        pool = ConnectionPool(self.connect, min_size=0, max_size=1)
+        pooled = pool.acquire()
+        pooled.connection.status = extensions.TRANSACTION_STATUS_INERROR
+        pool.release(pooled)
+        self.assertEqual(1, pooled.connection.rollbacks, "aborted transaction is rolled back")
+        self.assertEqual({"size": 1, "idle": 1, "in_use": 0}, pool.stats())
+
+    def testMaxSizeBlocksUntilRelease(self) -> None:
+        pool = ConnectionPool(self.connect, min_size=0, max_size=1, acquire_timeout=5)
+        held = pool.acquire()
+        acquired = []
+        waiter = threading.Thread(target=lambda: acquired.append(pool.acquire()))
+        waiter.start()
+        time.sleep(0.05)
+        self.assertEqual([], acquired, "pool is full")
+        pool.release(held)
+        waiter.join(5)
+        self.assertEqual([held], acquired, "released connection handed to the waiter")
+        self.assertEqual(1, len(self.opened))
+
+    def testAcquireTimeout(self) -> None:
+        pool = ConnectionPool(self.connect, min_size=0, max_size=1, acquire_timeout=0.05)
+        pool.acquire()
+        self.assertRaises(DatabaseException.ConnectionInvalid, pool.acquire)
+
+    def testHealthCheckDiscardsDeadConnection(self) -> None:
+        pool = ConnectionPool(self.connect, min_size=1, max_size=1, check_idle_after=0)
+        self.opened[0].alive = False
+        pooled = pool.acquire()
+        self.assertIsNot(self.opened[0], pooled.connection, "dead connection replaced")
+        self.assertTrue(self.opened[0].closed)
+        self.assertEqual(2, len(self.opened))
+
+    def testExpiredConnectionsReplaced(self) -> None:
+        pool = ConnectionPool(self.connect, min_size=0, max_size=2, idle_timeout=None, max_lifetime=0)
+        pooled = pool.acquire()
+        pool.release(pooled)
+        self.assertTrue(pooled.connection.closed, "connection past max_lifetime is not pooled again")
+        self.assertEqual({"size": 0, "idle": 0, "in_use": 0}, pool.stats())
+
+    def testIdleTimeoutShrinksToMinSize(self) -> None:
+        pool = ConnectionPool(self.connect, min_size=1, max_size=3, idle_timeout=0)
+        held = [pool.acquire(), pool.acquire(), pool.acquire()]
+        for pooled in held:
+            pool.release(pooled)
+        pool.release(pool.acquire())
+        self.assertEqual(1, pool.stats()["size"], "idle connections above min_size are closed")
+
+
+# *** DO NOT RUN EACH TEST MANUALLY ***
+if __name__ == '__main__':
+    unittest.main(verbosity=2, exit=False)
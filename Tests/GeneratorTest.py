@@ -0,0 +1,75 @@
+import collections
+import unittest
+
+import Solution
+import Utility.DBConnector as Connector
+from Benchmarks import SuiteBenchmark
+from Benchmarks.Generator import Dataset
+from Utility.ReturnValue import ReturnValue
+
+'''
+    the benchmark data generator: deterministic, valid against the schema and skewed; and the suite's statistics
+'''
+
+
+class Test(unittest.TestCase):
+
+    def testDeterministic(self) -> None:
+        first, second = Dataset(5000, seed=7), Dataset(5000, seed=7)
+        self.assertEqual(list(first.ratedRows()), list(second.ratedRows()))
+        self.assertEqual(list(first.playedInRows()), list(second.playedInRows()))
+        self.assertEqual([str(vars(m)) for m in first.movieRows()], [str(vars(m)) for m in second.movieRows()])
+        self.assertNotEqual(list(first.ratedRows()), list(Dataset(5000, seed=8).ratedRows()))
+        sampler, again = first.sampler(3), second.sampler(3)
+        self.assertEqual([sampler.movie() for _ in range(100)], [again.movie() for _ in range(100)])
+
+    def testValid(self) -> None:
+        dataset = Dataset(20000)
+        movies = {(m.getMovieName(), m.getYear()) for m in dataset.movieRows()}
+        self.assertEqual(dataset.movies, len(movies))
+        rated = list(dataset.ratedRows())
+        self.assertEqual(dataset.ratings, len(rated))
+        self.assertEqual(len(rated), len({(name, year, critic) for name, year, critic, _ in rated}), "unique keys")
+        self.assertTrue(all((name, year) in movies and 1 <= critic <= dataset.critics and 1 <= rating <= 5
+                            for name, year, critic, rating in rated))
+        cast = list(dataset.playedInRows())
+        self.assertEqual(len(cast), len({(name, year, actor) for name, year, actor, _, _ in cast}))
+        self.assertTrue(all(1 <= actor <= dataset.actors and roles for _, _, actor, _, roles in cast))
+        produced = list(dataset.producedRows())
+        self.assertEqual(len(produced), len({(name, year) for _, name, year, _, _ in produced}), "one studio a movie")
+
+    def testSkewed(self) -> None:
+        dataset = Dataset(20000)
+        ratings = collections.Counter((name, year) for name, year, _, _ in dataset.ratedRows())
+        top = sum(count for _, count in ratings.most_common(dataset.movies // 10))
+        self.assertGreater(top, dataset.ratings / 2, "the top 10% of the movies get most of the ratings")
+        sampler = dataset.sampler()
+        draws = collections.Counter(sampler.critic() for _ in range(10000))
+        self.assertEqual(1, draws.most_common(1)[0][0])
+
+    def testLoads(self) -> None:
+        Connector.configureBackend("sqlite")
+        Solution.createTables()
+        try:
+            dataset = Dataset(2000)
+            dataset.load(Solution)
+            self.assertEqual(dataset.movies, len(Solution.franchiseRevenue()))
+            sampler = dataset.sampler()
+            self.assertEqual(ReturnValue.ALREADY_EXISTS, Solution.criticRatedMovie(*sampler.movie(), 1, 5))
+        finally:
+            Solution.dropTables()
+            Connector.configureBackend(None)
+
+    def testStatistics(self) -> None:
+        summary = SuiteBenchmark.summarize([i * 10 ** 6 for i in range(100, 0, -1)])
+        self.assertEqual((50, 95, 99, 100), (summary["p50_ms"], summary["p95_ms"], summary["p99_ms"], summary["calls"]))
+        self.assertAlmostEqual(100 / 5.05, summary["throughput"])
+        old = {"results": {"a": {"p50_ms": 1.0, "p95_ms": 2.0}, "b": {"p50_ms": 1.0, "p95_ms": 2.0}}}
+        new = {"results": {"a": {"p50_ms": 1.1, "p95_ms": 3.0}, "b": {"p50_ms": 1.1, "p95_ms": 2.1},
+                           "c": {"p50_ms": 9.0, "p95_ms": 9.0}}}
+        self.assertEqual(["a"], list(SuiteBenchmark.regressions(old, new)), "p95 grew 1.5x, new functions are skipped")
+
+
+# *** DO NOT RUN EACH TEST MANUALLY ***
+if __name__ == '__main__':
+    unittest.main(verbosity=2, exit=False)
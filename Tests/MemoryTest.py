@@ -0,0 +1,119 @@
+import random
+import unittest
+
+import MemorySolution
+import Solution
+import Utility.DBConnector as Connector
+from Utility.ReturnValue import ReturnValue
+
+from Business.Actor import Actor
+from Business.Critic import Critic
+from Business.Movie import Movie
+from Business.Studio import Studio
+
+'''
+    the in-memory engine: same ReturnValues and results as the SQL implementation (run here on SQLite)
+'''
+
+
+# a random mix of every write of the API, with invalid and duplicate values. the values are drawn while the
+# operations run, so each api needs its own workload(seed)
+def workload(seed, calls=1500):
+    rnd = random.Random(seed)
+    names = ["Heat", "Ronin", "Alien", "Up"]
+    genres = ["Drama", "Action", "Comedy", "Horror", "Jazz", None]
+    number = lambda: rnd.choice([rnd.randint(1, 6), rnd.randint(1, 6), 0, -1, None])
+    movie = lambda: (rnd.choice(names + [None]), rnd.choice([1995, 1998, 1995, 1800]))
+    operations = [
+        lambda api: api.addCritic(Critic(critic_id=number(), critic_name=rnd.choice(["a", "b", None]))),
+        lambda api: api.addActor(Actor(actor_id=number(), actor_name="x", age=rnd.choice([30, 50, 0]), height=180)),
+        lambda api: api.addMovie(Movie(*movie(), genre=rnd.choice(genres))),
+        lambda api: api.addStudio(Studio(studio_id=number(), studio_name="s")),
+        lambda api: api.criticRatedMovie(*movie(), number(), rnd.choice([1, 3, 5, 6])),
+        lambda api: api.actorPlayedInMovie(*movie(), number(), rnd.choice([10, 0]),
+                                           rnd.choice([["a"], ["a", "b"], [], ["a", "a"], ["b", None]])),
+        lambda api: api.studioProducedMovie(number(), *movie(), rnd.choice([10, -1]), rnd.randint(0, 100)),
+        lambda api: api.criticDidntRateMovie(*movie(), number()),
+        lambda api: api.actorDidntPlayInMovie(*movie(), number()),
+        lambda api: api.studioDidntProduceMovie(number(), *movie()),
+        lambda api: api.deleteCritic(number()) if rnd.random() < 0.2 else None,
+        lambda api: api.deleteActor(number()) if rnd.random() < 0.2 else None,
+        lambda api: api.deleteMovie(*movie()) if rnd.random() < 0.2 else None,
+        lambda api: api.deleteStudio(number()) if rnd.random() < 0.2 else None,
+    ]
+    return [rnd.choice(operations) for _ in range(calls)]
+
+
+def snapshot(api):
+    result = [api.franchiseRevenue(), api.studioRevenueByYear(), api.getFanCritics(), api.averageAgeByGenre(),
+              api.getExclusiveActors()]
+    for name in ("Heat", "Ronin", "Alien", "Up"):
+        result.append((api.averageRating(name, 1995), api.stageCrewBudget(name, 1995)))
+    for actor_id in range(1, 7):
+        result.append((api.averageActorRating(actor_id), str(vars(api.bestPerformance(actor_id))),
+                       api.getActorsRoleInMovie(actor_id, "Heat", 1995),
+                       api.overlyInvestedInMovie("Heat", 1995, actor_id), str(vars(api.getActorProfile(actor_id)))))
+    return result
+
+
+class Test(unittest.TestCase):
+
+    def setUp(self) -> None:
+        Connector.configureBackend("sqlite")
+        Solution.createTables()
+        MemorySolution.createTables()
+
+    def tearDown(self) -> None:
+        Solution.dropTables()
+        MemorySolution.dropTables()
+        Connector.configureBackend(None)
+
+    def testSameAsSQL(self) -> None:
+        for seed in range(3):
+            Solution.clearTables()
+            MemorySolution.clearTables()
+            sql_results = [operation(Solution) for operation in workload(seed)]
+            memory_results = [operation(MemorySolution) for operation in workload(seed)]
+            self.assertEqual(sql_results, memory_results, "seed " + str(seed))
+            self.assertEqual(snapshot(Solution), snapshot(MemorySolution), "seed " + str(seed))
+
+    def testTypes(self) -> None:
+        self.assertEqual(ReturnValue.OK, MemorySolution.addMovie(Movie(movie_name="Heat", year="1995", genre="Action")))
+        self.assertEqual(ReturnValue.ALREADY_EXISTS, MemorySolution.addMovie(Movie(movie_name="Heat", year=1995.2,
+                                                                                   genre="Action")))
+        self.assertEqual(ReturnValue.ERROR, MemorySolution.addCritic(Critic(critic_id="one", critic_name="Bob")))
+        self.assertEqual(ReturnValue.ERROR, MemorySolution.addCritic(Critic(critic_id=2 ** 31, critic_name="Bob")))
+        self.assertEqual(1995, MemorySolution.getMovieProfile("Heat", "1995").getYear())
+
+    def testTransactions(self) -> None:
+        with MemorySolution.transaction() as tx:
+            self.assertEqual(ReturnValue.OK, MemorySolution.addCritic(Critic(critic_id=1, critic_name="John")))
+            self.assertEqual(ReturnValue.ALREADY_EXISTS, MemorySolution.addCritic(Critic(critic_id=1, critic_name="Bob")))
+            tx.rollback()
+        self.assertTrue(MemorySolution.getCriticProfile(1).getName() is None, "rolled back")
+        with MemorySolution.transaction():
+            MemorySolution.addMovie(Movie(movie_name="Heat", year=1995, genre="Action"))
+            MemorySolution.addCritic(Critic(critic_id=1, critic_name="John"))
+            MemorySolution.criticRatedMovie("Heat", 1995, 1, 5)
+            with MemorySolution.transaction() as savepoint:
+                self.assertEqual(ReturnValue.OK, MemorySolution.deleteMovie("Heat", 1995))
+                self.assertEqual(0.0, MemorySolution.averageRating("Heat", 1995), "the delete cascaded")
+                savepoint.rollback()
+        self.assertEqual(5.0, MemorySolution.averageRating("Heat", 1995), "only the savepoint was rolled back")
+        with MemorySolution.transaction(savepoints=False):
+            self.assertEqual(ReturnValue.ALREADY_EXISTS, MemorySolution.addCritic(Critic(critic_id=1, critic_name="Bob")))
+            self.assertEqual(ReturnValue.ERROR, MemorySolution.addCritic(Critic(critic_id=2, critic_name="Bob")),
+                             "a failed call aborts a transaction without savepoints")
+        self.assertTrue(MemorySolution.getCriticProfile(2).getName() is None)
+
+    def testDropped(self) -> None:
+        MemorySolution.dropTables()
+        self.assertEqual(ReturnValue.ERROR, MemorySolution.addCritic(Critic(critic_id=1, critic_name="John")))
+        self.assertEqual([], MemorySolution.franchiseRevenue())
+        MemorySolution.createTables()
+        self.assertEqual(ReturnValue.OK, MemorySolution.addCritic(Critic(critic_id=1, critic_name="John")))
+
+
+# *** DO NOT RUN EACH TEST MANUALLY ***
+if __name__ == '__main__':
+    unittest.main(verbosity=2, exit=False)
@@ -0,0 +1,79 @@
+import unittest
+
+import Solution
+import Utility.DBConnector as Connector
+import Utility.Metrics as Metrics
+from Utility.ReturnValue import ReturnValue
+
+from Business.Critic import Critic
+from Business.Movie import Movie
+
+'''
+    per-statement metrics of DBConnector, tagged with the Solution.py function (run here on SQLite)
+'''
+
+
+class Test(unittest.TestCase):
+
+    def setUp(self) -> None:
+        Connector.configureBackend("sqlite")
+        Solution.configureProfileCache(enabled=False)
+        Solution.createTables()
+        Metrics.reset()
+        Metrics.configure(enabled=True)
+
+    def tearDown(self) -> None:
+        Metrics.configure(enabled=None)
+        Metrics.reset()
+        Solution.dropTables()
+        Solution.configureProfileCache()
+        Connector.configureBackend(None)
+
+    def testTaggedByFunction(self) -> None:
+        self.assertEqual(ReturnValue.OK, Solution.addCritic(Critic(critic_id=1, critic_name="John")))
+        self.assertEqual(ReturnValue.ALREADY_EXISTS, Solution.addCritic(Critic(critic_id=1, critic_name="Bob")))
+        self.assertEqual("John", Solution.getCriticProfile(1).getName())
+        snapshot = Metrics.snapshot()
+        self.assertEqual(2, snapshot["dbconnector_query_seconds"]["addCritic"]["count"])
+        self.assertEqual(2, snapshot["dbconnector_acquire_seconds"]["addCritic"]["count"])
+        self.assertEqual({"UNIQUE_VIOLATION": 1}, snapshot[Metrics.ERRORS]["addCritic"])
+        rows = snapshot["dbconnector_query_rows"]["getCriticProfile"]
+        self.assertEqual((1, 1), (rows["count"], rows["sum"]))
+        self.assertEqual(8 + len("John"), snapshot["dbconnector_query_bytes"]["getCriticProfile"]["sum"])
+
+    def testHooks(self) -> None:
+        events = []
+        Metrics.addHook(events.append)
+        try:
+            Solution.addMovie(Movie(movie_name="Heat", year=1995, genre="Action"))
+            Solution.averageRating("Heat", 1995)
+        finally:
+            Metrics.removeHook(events.append)
+        self.assertEqual(["addMovie", "averageRating"], [event.function for event in events])
+        self.assertTrue(all(event.seconds >= 0 and event.error is None for event in events))
+
+    def testDisabled(self) -> None:
+        Metrics.configure(enabled=False)
+        Solution.addCritic(Critic(critic_id=1, critic_name="John"))
+        self.assertEqual({}, Metrics.snapshot()["dbconnector_query_seconds"])
+
+    def testPrometheus(self) -> None:
+        Solution.addCritic(Critic(critic_id=1, critic_name="John"))
+        Solution.addCritic(Critic(critic_id=1, critic_name="John"))
+        text = Metrics.prometheus()
+        self.assertIn("# TYPE dbconnector_query_seconds histogram\n", text)
+        self.assertIn('dbconnector_query_seconds_bucket{function="addCritic",le="+Inf"} 2\n', text)
+        self.assertIn('dbconnector_query_seconds_count{function="addCritic"} 2\n', text)
+        self.assertIn('dbconnector_query_errors_total{function="addCritic",error="UNIQUE_VIOLATION"} 1\n', text)
+
+    def testHistogram(self) -> None:
+        histogram = Metrics.Histogram((1, 10, 100))
+        for value in (0.5, 1, 5, 50, 500):
+            histogram.observe(value)
+        self.assertEqual([(1, 2), (10, 3), (100, 4), (float("inf"), 5)], histogram.cumulative())
+        self.assertEqual((10, 100), (histogram.quantile(0.5), histogram.quantile(0.8)))
+
+
+# *** DO NOT RUN EACH TEST MANUALLY ***
+if __name__ == '__main__':
+    unittest.main(verbosity=2, exit=False)
@@ -0,0 +1,141 @@
+import os
+import unittest
+from unittest import mock
+
+import MemorySolution
+import Solution
+import Utility.Backends as Backends
+import Utility.Config as Config
+import Utility.DBConnector as Connector
+from Utility.DBConnector import ResultSet
+
+from Business.Critic import Critic
+from Business.Movie import Movie
+
+'''
+    the year-partitioned layout of createTables ([schema] partitioned): the PostgreSQL DDL it sends (recorded, no
+    server needed) and the backends that ignore it
+'''
+
+
+# stands in for DBConnector, keeps every statement createTables sends
+class Recorder:
+    statements = []
+
+    def __init__(self, readOnly=False):
+        pass
+
+    def execute(self, query, printSchema=False, params=None):
+        Recorder.statements.append(" ".join(str(query).split()))
+        return 0, ResultSet()
+
+    def close(self):
+        pass
+
+    @staticmethod
+    def invalidatePrepared():
+        pass
+
+
+class Test(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.saved = os.environ.get("DB_SCHEMA__PARTITIONED")
+
+    def tearDown(self) -> None:
+        if self.saved is None:
+            os.environ.pop("DB_SCHEMA__PARTITIONED", None)
+        else:
+            os.environ["DB_SCHEMA__PARTITIONED"] = self.saved
+        Config.reload()
+
+    def partitioned(self, enabled: bool) -> None:
+        os.environ["DB_SCHEMA__PARTITIONED"] = "true" if enabled else "false"
+        Config.reload()
+
+    # the statements of createTables on PostgreSQL, by the table they create
+    def postgresqlSchema(self, partitioned: bool) -> dict:
+        Recorder.statements = []
+        with mock.patch.object(Connector, "DBConnector", Recorder), \
+                mock.patch.object(Connector, "Transaction", mock.MagicMock()), \
+                mock.patch.object(Connector, "dialect", return_value="postgresql"), \
+                mock.patch.object(Solution, "_partitioned", return_value=partitioned):
+            Solution.createTables()
+        self.assertTrue(Recorder.statements[-1].startswith("CREATE INDEX"), "createTables ran to the end")
+        return {statement.split(" ")[5].split("(")[0]: statement for statement in Recorder.statements
+                if statement.startswith("CREATE TABLE IF NOT EXISTS")}
+
+    def testPartitionedTables(self) -> None:
+        tables = self.postgresqlSchema(True)
+        for table in Solution.PARTITIONED_TABLES:
+            self.assertTrue(tables[table].endswith(") PARTITION BY RANGE (year)"), table)
+            self.assertEqual("CREATE TABLE IF NOT EXISTS " + table + "_default PARTITION OF " + table + " DEFAULT",
+                             tables[table + "_default"])
+        self.assertIn("FOREIGN KEY(movie_name,year) REFERENCES Movies ON DELETE CASCADE", tables["Rated"])
+        self.assertIn("FOREIGN KEY(critic_id) REFERENCES Critics ON DELETE CASCADE", tables["Rated"])
+        self.assertIn("FOREIGN KEY(studio_id) REFERENCES Studios ON DELETE CASCADE", tables["Produced"])
+        self.assertIn("FOREIGN KEY (actor_id) REFERENCES Actors ON DELETE CASCADE", tables["PlayedIn"])
+        self.assertIn("REFERENCES PlayedIn ON DELETE CASCADE", tables["PlayedInRole"], "the partitioned parent")
+        self.assertNotIn("PARTITION", tables["PlayedInRole"])
+        self.assertIn("CREATE TRIGGER movies_partitions BEFORE INSERT ON Movies FOR EACH ROW "
+                      "EXECUTE PROCEDURE movies_year_partitions()", Recorder.statements)
+        order = list(tables)
+        self.assertLess(order.index("Rated"), order.index("Rated_default"))
+
+    def testPlainTables(self) -> None:
+        self.postgresqlSchema(False)
+        self.assertEqual([], [statement for statement in Recorder.statements if "PARTITION" in statement])
+
+    def testYearRanges(self) -> None:
+        for span in (1, 10):
+            function = " ".join(Solution._partitionStatements(span)[3].split())
+            self.assertIn("first INTEGER := y - y % " + str(span) + ";", function)
+            self.assertIn("FOR VALUES FROM (%s) TO (%s)', t || '_y' || first, t, first, first + " + str(span), function)
+            # the lock sits between the unlocked check and the CREATE, and is followed by a second check
+            lock = function.index("pg_advisory_xact_lock(hashtext('ensure_year_partitions'), first)")
+            self.assertLess(function.index("to_regclass('rated_y' || first)"), lock)
+            self.assertLess(lock, function.index("to_regclass('rated_y' || first)", lock))
+            self.assertLess(lock, function.index("CREATE TABLE IF NOT EXISTS %I PARTITION OF %I"))
+
+    def testSessionOptions(self) -> None:
+        for enabled in (True, False):
+            self.partitioned(enabled)
+            with mock.patch.object(Backends.psycopg2, "connect") as connect:
+                Backends.PostgreSQLBackend().connect()
+            options = connect.call_args.kwargs.get("options", "")
+            self.assertEqual(enabled, Backends.PostgreSQLBackend.PARTITIONWISE in options)
+
+    def testIgnoredBySQLite(self) -> None:
+        self.partitioned(True)
+        Connector.configureBackend("sqlite")
+        Solution.createTables()
+        try:
+            conn = Connector.DBConnector()
+            try:
+                _, result = conn.execute("SELECT name FROM sqlite_master WHERE name LIKE '%default%'")
+            finally:
+                conn.close()
+            self.assertEqual([], result.rows)
+            Solution.addMovie(Movie(movie_name="Heat", year=1995, genre="Action"))
+            Solution.addCritic(Critic(critic_id=1, critic_name="Ebert"))
+            Solution.criticRatedMovie("Heat", 1995, 1, 4)
+            self.assertEqual(4, Solution.averageRating("Heat", 1995))
+        finally:
+            Solution.dropTables()
+            Connector.configureBackend(None)
+
+    def testIgnoredByMemory(self) -> None:
+        self.partitioned(True)
+        MemorySolution.createTables()
+        try:
+            MemorySolution.addMovie(Movie(movie_name="Heat", year=1995, genre="Action"))
+            MemorySolution.addCritic(Critic(critic_id=1, critic_name="Ebert"))
+            MemorySolution.criticRatedMovie("Heat", 1995, 1, 4)
+            self.assertEqual(4, MemorySolution.averageRating("Heat", 1995))
+        finally:
+            MemorySolution.dropTables()
+
+
+# *** DO NOT RUN EACH TEST MANUALLY ***
+if __name__ == '__main__':
+    unittest.main(verbosity=2, exit=False)
@@ -0,0 +1,75 @@
+import unittest
+
+import Solution
+import Utility.DBConnector as Connector
+from Benchmarks import PlanBenchmark
+from Benchmarks.Generator import Dataset
+from Business.Movie import Movie
+from Business.Studio import Studio
+
+'''
+    the plan-regression checks of Benchmarks/PlanBenchmark.py on hand-written EXPLAIN (FORMAT JSON) output, and
+    the alternative formulations it compares returning the same rows (run here on SQLite)
+'''
+
+
+def explained(cost, rows, actual, scan="Index Scan", relation="rated"):
+    return [{"Plan": {"Node Type": "Hash Join", "Total Cost": cost, "Plan Rows": rows, "Actual Rows": actual,
+                      "Shared Hit Blocks": 10, "Shared Read Blocks": 2,
+                      "Plans": [{"Node Type": scan, "Relation Name": relation, "Total Cost": cost / 2,
+                                 "Plan Rows": 100, "Actual Rows": 100},
+                                {"Node Type": "Index Only Scan", "Relation Name": "produced", "Total Cost": 1.0,
+                                 "Plan Rows": 5, "Actual Rows": 4}]},
+             "Planning Time": 0.1, "Execution Time": 2.5}]
+
+
+class Test(unittest.TestCase):
+
+    def testSummary(self) -> None:
+        summary = PlanBenchmark.summarize(explained(100.0, 10, 500, scan="Seq Scan"))
+        self.assertEqual((100.0, 2.5, 12, ["rated"]), (summary["cost"], summary["execution_ms"], summary["buffers"],
+                                                        summary["seq_scans"]))
+        self.assertEqual((50.0, "Hash Join"), (summary["misestimate"], summary["misestimated_node"]))
+        self.assertEqual(1.0, PlanBenchmark.misestimate({"Plan Rows": 0, "Actual Rows": 0}))
+
+    def testRegressions(self) -> None:
+        old = {"plans": {"getFanCritics": PlanBenchmark.summarize(explained(100.0, 10, 12)),
+                         "averageRating": PlanBenchmark.summarize(explained(8.0, 1, 1))}}
+        self.assertEqual([], PlanBenchmark.regressions(old, old))
+        new = {"plans": {"getFanCritics": PlanBenchmark.summarize(explained(160.0, 10, 500, scan="Seq Scan")),
+                         "averageRating": PlanBenchmark.summarize(explained(11.0, 1, 1)),
+                         "franchiseRevenue": PlanBenchmark.summarize(explained(1000.0, 1, 1000, scan="Seq Scan"))}}
+        self.assertEqual(["getFanCritics: new sequential scan on rated",
+                          "getFanCritics: row estimate off by 50x at Hash Join",
+                          "getFanCritics: cost 100.0 -> 160.0 (x1.60)"], PlanBenchmark.regressions(old, new))
+        self.assertEqual(["getFanCritics: new sequential scan on rated"],
+                         PlanBenchmark.regressions(old, new, threshold=2, blowup=100))
+
+    def testAlternativesAgree(self) -> None:
+        Connector.configureBackend("sqlite")
+        Solution.createTables()
+        try:
+            Dataset(5000).load(Solution)
+            Solution.addStudio(Studio(studio_id=999, studio_name="small"))
+            Solution.addMovie(Movie(movie_name="Heat", year=1995, genre="Action"))
+            Solution.studioProducedMovie(999, "Heat", 1995, 10, 20)
+            Solution.criticRatedMovie("Heat", 1995, 1, 5)  # critic 1 is a fan of studio 999
+            for name, formulations in PlanBenchmark.ALTERNATIVES.items():
+                self.assertEqual(len(formulations), len(set(formulations.values())), name + " compares distinct SQL")
+                results = []
+                for query in formulations.values():
+                    conn = Connector.DBConnector()
+                    try:
+                        results.append(conn.execute(query)[1].rows)
+                    finally:
+                        conn.close()
+                self.assertTrue(results[0], name + " returns rows on this dataset")
+                self.assertTrue(all(rows == results[0] for rows in results), name)
+        finally:
+            Solution.dropTables()
+            Connector.configureBackend(None)
+
+
+# *** DO NOT RUN EACH TEST MANUALLY ***
+if __name__ == '__main__':
+    unittest.main(verbosity=2, exit=False)
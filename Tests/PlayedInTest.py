@@ -0,0 +1,48 @@
+import unittest
+import Solution
+from Tests.abstractTest import AbstractTest
+from Utility.ReturnValue import ReturnValue
+
+from Business.Actor import Actor
+from Business.Movie import Movie
+
+'''
+    actorPlayedInMovie as a single call and whole casts at once
+'''
+
+
+class Test(AbstractTest):
+
+    def setUp(self) -> None:
+        super().setUp()
+        Solution.addMovie(Movie(movie_name="Heat", year=1995, genre="Action"))
+        for actor_id in (1, 2, 3):
+            Solution.addActor(Actor(actor_id=actor_id, actor_name="actor" + str(actor_id), age=40, height=180))
+
+    def testManyRoles(self) -> None:
+        roles = ["role" + str(i) for i in range(500)]
+        self.assertEqual(ReturnValue.OK, Solution.actorPlayedInMovie("Heat", 1995, 1, 100, roles))
+        self.assertEqual(sorted(roles, reverse=True), Solution.getActorsRoleInMovie(1, "Heat", 1995))
+
+    def testReturnValues(self) -> None:
+        self.assertEqual(ReturnValue.BAD_PARAMS, Solution.actorPlayedInMovie("Heat", 1995, 1, 100, []))
+        self.assertEqual(ReturnValue.BAD_PARAMS, Solution.actorPlayedInMovie("Heat", 1995, 1, 0, ["a"]))
+        self.assertEqual(ReturnValue.BAD_PARAMS, Solution.actorPlayedInMovie("Heat", 1995, 1, 100, ["a", None]))
+        self.assertEqual(ReturnValue.NOT_EXISTS, Solution.actorPlayedInMovie("Heat", 1995, 9, 100, ["a"]))
+        self.assertEqual(ReturnValue.NOT_EXISTS, Solution.actorPlayedInMovie("Heat", 1995, 9, 100, ["a", "a"]),
+                         "the PlayedIn row fails before the duplicate role is seen")
+        self.assertEqual(ReturnValue.ALREADY_EXISTS, Solution.actorPlayedInMovie("Heat", 1995, 1, 100, ["a", "a"]))
+        self.assertEqual([], Solution.getActorsRoleInMovie(1, "Heat", 1995), "a failed call inserts nothing")
+        self.assertEqual(ReturnValue.OK, Solution.actorPlayedInMovie("Heat", 1995, 1, 100, ["a"]))
+        self.assertEqual(ReturnValue.ALREADY_EXISTS, Solution.actorPlayedInMovie("Heat", 1995, 1, 100, ["b"]))
+
+    def testWholeCast(self) -> None:
+        self.assertEqual([ReturnValue.OK, ReturnValue.OK, ReturnValue.NOT_EXISTS, ReturnValue.ALREADY_EXISTS],
+                         Solution.actorsPlayedInMovie("Heat", 1995, [(1, 100, ["Neil"]), (2, 200, ["Vincent"]),
+                                                                     (9, 100, ["Waingro"]), (1, 100, ["Neil"])]))
+        self.assertEqual(["Vincent"], Solution.getActorsRoleInMovie(2, "Heat", 1995))
+
+
+# *** DO NOT RUN EACH TEST MANUALLY ***
+if __name__ == '__main__':
+    unittest.main(verbosity=2, exit=False)
@@ -0,0 +1,126 @@
+import unittest
+from unittest import mock
+
+import Utility.DBConnector as Connector
+
+'''
+    server-side prepared statements: the PREPARE / EXECUTE / DEALLOCATE text DBConnector.executePrepared sends,
+    checked on a stub connection that records it (the PostgreSQL path, no server needed)
+'''
+
+
+class StubCursor:
+    def __init__(self, executed):
+        self.executed = executed
+        self.rowcount = 1
+        self.description = None
+
+    def execute(self, query, params=None):
+        self.executed.append((query, params))
+
+    def mogrify(self, query, params=None) -> bytes:
+        value = params[0]
+        return ("'" + value.replace("'", "''") + "'" if isinstance(value, str) else str(value)).encode()
+
+    def fetchall(self):
+        return []
+
+    def close(self):
+        pass
+
+
+class StubConnection:
+    def __init__(self):
+        self.executed = []
+        self.autocommit = False
+        self.closed = False
+
+    def cursor(self):
+        return StubCursor(self.executed)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+
+class StubBackend:
+    name = "postgresql"
+    prepare = True
+
+    def __init__(self):
+        self.connections = []
+
+    def connect(self):
+        self.connections.append(StubConnection())
+        return self.connections[-1]
+
+    def translateError(self, e):
+        return None
+
+
+class Test(unittest.TestCase):
+
+    def setUp(self) -> None:
+        Connector.DBConnector.prepare("preparedTestLookup",
+                                      "SELECT * FROM Critics WHERE critic_id = $1 AND critic_name = $2",
+                                      ["INTEGER", "TEXT"])
+        Connector.DBConnector.prepare("preparedTestCount", "SELECT COUNT(*) FROM Critics")
+        self.backend = StubBackend()
+        self.patches = [mock.patch.object(Connector, "backend", return_value=self.backend),
+                        mock.patch.object(Connector, "getPool", return_value=None)]
+        for patch in self.patches:
+            patch.start()
+        Connector.configurePreparedStatements(True)
+        self.conn = Connector.DBConnector()
+        self.executed = self.backend.connections[0].executed
+
+    def tearDown(self) -> None:
+        self.conn.close()
+        Connector.configurePreparedStatements(None)
+        for patch in self.patches:
+            patch.stop()
+
+    def testPrepareOnce(self) -> None:
+        self.conn.executePrepared("preparedTestLookup", (1, "Ebert"))
+        self.conn.executePrepared("preparedTestLookup", (2, "Siskel"))
+        self.conn.executePrepared("preparedTestCount")
+        self.assertEqual([("PREPARE preparedTestLookup(INTEGER, TEXT) AS "
+                           "SELECT * FROM Critics WHERE critic_id = $1 AND critic_name = $2", None),
+                          ("EXECUTE preparedTestLookup(%s, %s)", (1, "Ebert")),
+                          ("EXECUTE preparedTestLookup(%s, %s)", (2, "Siskel")),
+                          ("PREPARE preparedTestCount AS SELECT COUNT(*) FROM Critics", None),
+                          ("EXECUTE preparedTestCount", ())], self.executed)
+
+    def testInvalidatePrepared(self) -> None:
+        self.conn.executePrepared("preparedTestCount")
+        Connector.DBConnector.invalidatePrepared()
+        self.conn.executePrepared("preparedTestCount")
+        self.conn.executePrepared("preparedTestCount")
+        prepare, execute = "PREPARE preparedTestCount AS SELECT COUNT(*) FROM Critics", "EXECUTE preparedTestCount"
+        self.assertEqual([prepare, execute, "DEALLOCATE ALL", prepare, execute, execute],
+                         [query for query, _ in self.executed], "prepared again once after the bump")
+        Connector.DBConnector.invalidatePrepared()
+        fresh = Connector.DBConnector()
+        try:
+            fresh.executePrepared("preparedTestCount")
+        finally:
+            fresh.close()
+        self.assertEqual([prepare, execute], [query for query, _ in self.backend.connections[1].executed],
+                         "nothing to DEALLOCATE on a connection that prepared nothing")
+
+    def testInlined(self) -> None:
+        Connector.configurePreparedStatements(False)
+        self.conn.executePrepared("preparedTestLookup", (7, "O'Hara"))
+        self.assertEqual([("SELECT * FROM Critics WHERE critic_id = 7 AND critic_name = 'O''Hara'", None)],
+                         self.executed)
+        self.assertEqual(self.executed[0][0], self.conn.inlined("preparedTestLookup", (7, "O'Hara")))
+
+
+# *** DO NOT RUN EACH TEST MANUALLY ***
+if __name__ == '__main__':
+    unittest.main(verbosity=2, exit=False)
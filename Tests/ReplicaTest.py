@@ -0,0 +1,105 @@
+import os
+import tempfile
+import time
+import unittest
+
+import Solution
+import Utility.Config as Config
+import Utility.DBConnector as Connector
+
+from Business.Critic import Critic
+from Business.Movie import Movie
+
+'''
+    read-only calls routed to read replicas. run here on SQLite: each "replica" is a database file of its own that
+    holds a different critic 1, so the name that comes back tells which database answered
+'''
+
+
+class Test(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.saved_environ = dict(os.environ)
+        self.files = []
+        for name in ("replica1", "replica2", "primary"):
+            handle, filename = tempfile.mkstemp(suffix=".db")
+            os.close(handle)
+            self.files.append(filename)
+            Connector.configureBackend("sqlite", database=filename)
+            Solution.createTables()
+            Solution.addCritic(Critic(critic_id=1, critic_name=name))
+        os.environ["DB_SQLITE_REPLICA1__DATABASE"] = self.files[0]
+        os.environ["DB_SQLITE_REPLICA2__DATABASE"] = self.files[1]
+        Config.reload()
+
+    def tearDown(self) -> None:
+        Connector.configureReplicas(None)
+        Solution.configureProfileCache()
+        Connector.configureBackend(None)
+        os.environ.clear()
+        os.environ.update(self.saved_environ)
+        Config.reload()
+        for filename in self.files:
+            os.remove(filename)
+
+    def testRoundRobin(self) -> None:
+        Connector.configureReplicas(["sqlite_replica1", "sqlite_replica2"])
+        names = {Solution.getCriticProfile(1).getName() for _ in range(4)}
+        self.assertEqual({"replica1", "replica2"}, names)
+        Solution.addCritic(Critic(critic_id=2, critic_name="written"))
+        self.assertTrue(Solution.getCriticProfile(2).getName() is None, "writes go to the primary only")
+        Connector.configureReplicas(None)
+        self.assertEqual("primary", Solution.getCriticProfile(1).getName(), "no replicas configured")
+
+    def testReplicaReadsNotCached(self) -> None:
+        Connector.configureReplicas(["sqlite_replica1"])  # a replica that never catches up
+        hits = Solution.profileCacheStats()["hits"]
+        Solution.addCritic(Critic(critic_id=5, critic_name="written"))
+        Solution.addMovie(Movie(movie_name="Heat", year=1995, genre="Action"))
+        self.assertTrue(Solution.getCriticProfile(5).getName() is None, "not replicated yet")
+        self.assertEqual([], Solution.franchiseRevenue(), "not replicated yet")
+        Connector.configureReplicas(None)
+        self.assertEqual("written", Solution.getCriticProfile(5).getName(), "the lagging read was not cached")
+        self.assertEqual([("Heat", 0)], Solution.franchiseRevenue(), "the lagging read was not cached")
+        self.assertEqual(hits, Solution.profileCacheStats()["hits"])
+
+    def testLeastLoaded(self) -> None:
+        Connector.configureReplicas(["sqlite_replica1", "sqlite_replica2"], selection="least_loaded")
+        busy = Connector.DBConnector(readOnly=True)
+        try:
+            for _ in range(3):
+                conn = Connector.DBConnector(readOnly=True)
+                self.assertNotEqual(busy.replica.section, conn.replica.section)
+                conn.close()
+            self.assertEqual(1, busy.replica.in_use)
+        finally:
+            busy.close()
+        self.assertEqual([0, 0], [replica.in_use for replica in Connector.getReplicas()])
+
+    def testReadYourWrites(self) -> None:
+        Connector.configureReplicas(["sqlite_replica1"], readYourWrites=0.2)
+        time.sleep(0.25)  # since setUp wrote
+        self.assertEqual("replica1", Solution.getCriticProfile(1).getName())
+        with Solution.transaction():
+            self.assertEqual("primary", Solution.getCriticProfile(1).getName(), "a transaction stays on the primary")
+        time.sleep(0.25)
+        Solution.addCritic(Critic(critic_id=2, critic_name="written"))
+        self.assertEqual("written", Solution.getCriticProfile(2).getName(), "read back from the primary")
+
+    def testFallback(self) -> None:
+        os.environ["DB_SQLITE_BROKEN__DATABASE"] = os.path.join(self.files[0] + ".missing", "replica.db")
+        Config.reload()
+        Connector.configureReplicas(["sqlite_broken"])
+        self.assertEqual("primary", Solution.getCriticProfile(1).getName(), "an unreachable replica is skipped")
+        self.assertRaises(ValueError, Connector.configureReplicas, ["sqlite_replica1"], selection="random")
+
+    def testConfig(self) -> None:
+        os.environ["DB_CONNECTOR__REPLICAS"] = "sqlite_replica2"
+        Config.reload()
+        self.assertEqual(["sqlite_replica2"], [replica.section for replica in Connector.getReplicas()])
+        self.assertEqual("replica2", Solution.getCriticProfile(1).getName())
+
+
+# *** DO NOT RUN EACH TEST MANUALLY ***
+if __name__ == '__main__':
+    unittest.main(verbosity=2, exit=False)
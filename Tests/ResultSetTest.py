@@ -0,0 +1,48 @@
+import unittest
+from collections import namedtuple
+
+from Utility.DBConnector import ResultSet, ResultSetRow
+
+Column = namedtuple("Column", ["name"])
+
+
+class Test(unittest.TestCase):
+    def setUp(self) -> None:
+        self.rows = [(1, "Heat", 1995), (2, "Ronin", 1998)]
+        self.result = ResultSet([Column("id"), Column("movie_name"), Column("year")], self.rows)
+
+    def testRowsAreNotCopied(self) -> None:
+        self.assertIs(self.rows, self.result.rows)
+        self.assertEqual(2, self.result.size())
+        self.assertFalse(self.result.isEmpty())
+
+    def testColumnLookup(self) -> None:
+        self.assertEqual(1, self.result.cols["movie_name"])
+        self.assertEqual(1, self.result.cols["MOVIE_NAME"])
+        self.assertEqual("Ronin", self.result[1]["movie_name"])
+        self.assertEqual(1998, self.result[1]["Year"])
+        self.assertIsNone(self.result[0][0], "only column names are looked up")
+        self.assertEqual({"id": 1, "movie_name": "Heat", "year": 1995}, self.result[0])
+
+    def testRowsShareHeader(self) -> None:
+        first, second = self.result[0], self.result[1]
+        self.assertIsInstance(first, ResultSetRow)
+        self.assertIs(first.cols, second.cols)
+        self.assertFalse(hasattr(first, "__dict__"))
+
+    def testInvalidRow(self) -> None:
+        self.assertEqual({}, self.result[5])
+
+    def testEmpty(self) -> None:
+        empty = ResultSet()
+        self.assertTrue(empty.isEmpty())
+        self.assertEqual([], empty.rows)
+        self.assertEqual("\n", str(empty))
+
+    def testStr(self) -> None:
+        self.assertEqual("id   movie_name   year   \n1   Heat   1995   \n2   Ronin   1998   \n", str(self.result))
+
+
+# *** DO NOT RUN EACH TEST MANUALLY ***
+if __name__ == '__main__':
+    unittest.main(verbosity=2, exit=False)
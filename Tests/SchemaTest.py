@@ -0,0 +1,128 @@
+import unittest
+import Solution
+import Utility.DBConnector as Connector
+from Tests.abstractTest import AbstractTest
+
+from Business.Actor import Actor
+from Business.Critic import Critic
+from Business.Movie import Movie
+from Business.Studio import Studio
+
+'''
+    Schema objects created by createTables
+'''
+
+
+class Test(AbstractTest):
+
+    def testIndexes(self) -> None:
+        self.assertEqual([], Solution.verifyIndexes(), "createTables creates every secondary index")
+        names = [index for _, index, _ in Solution.getIndexes()]
+        for name, _ in Solution.INDEXES:
+            self.assertIn(name, names)
+
+    def testRatingAggregates(self) -> None:
+        Solution.addMovie(Movie(movie_name="Heat", year=1995, genre="Action"))
+        Solution.addMovie(Movie(movie_name="Ronin", year=1998, genre="Action"))
+        Solution.addActor(Actor(actor_id=1, actor_name="Robert De Niro", age=80, height=177))
+        Solution.actorPlayedInMovie("Heat", 1995, 1, 100, ["Neil"])
+        Solution.actorPlayedInMovie("Ronin", 1998, 1, 100, ["Sam"])
+        for critic_id in (1, 2, 3):
+            Solution.addCritic(Critic(critic_id=critic_id, critic_name="critic" + str(critic_id)))
+        Solution.criticRatedMovie("Heat", 1995, 1, 5)
+        Solution.criticRatedMovie("Heat", 1995, 2, 4)
+        Solution.criticRatedMovie("Heat", 1995, 3, 4)
+        Solution.criticRatedMovie("Ronin", 1998, 1, 3)
+        self.assertAlmostEqual(13 / 3, Solution.averageRating("Heat", 1995))
+        self.assertAlmostEqual((13 / 3 + 3) / 2, Solution.averageActorRating(1))
+        self.assertEqual("Heat", Solution.bestPerformance(1).getMovieName())
+        Solution.criticDidntRateMovie("Heat", 1995, 3)
+        self.assertAlmostEqual(4.5, Solution.averageRating("Heat", 1995))
+        Solution.deleteCritic(1)  # cascades to both movies
+        self.assertAlmostEqual(4.0, Solution.averageRating("Heat", 1995))
+        self.assertEqual(0, Solution.averageRating("Ronin", 1998), "no ratings left")
+        self.assertAlmostEqual(2.0, Solution.averageActorRating(1))
+        Solution.deleteMovie("Heat", 1995)
+        Solution.addMovie(Movie(movie_name="Heat", year=1995, genre="Action"))
+        self.assertEqual(0, Solution.averageRating("Heat", 1995), "ratings of a deleted movie are gone")
+
+    def testRevenueSummaries(self) -> None:
+        for name, year in (("Heat", 1995), ("Heat", 2022), ("Ronin", 1998), ("Alien", 1979)):
+            Solution.addMovie(Movie(movie_name=name, year=year, genre="Action"))
+        Solution.addStudio(Studio(studio_id=1, studio_name="Warner"))
+        Solution.addStudio(Studio(studio_id=2, studio_name="MGM"))
+        Solution.studioProducedMovie(1, "Heat", 1995, 10, 100)
+        Solution.studioProducedMovie(2, "Heat", 2022, 10, 30)
+        Solution.studioProducedMovie(2, "Ronin", 1998, 10, 50)
+        self.assertEqual([("Ronin", 50), ("Heat", 130), ("Alien", 0)], Solution.franchiseRevenue())
+        self.assertEqual([(2, 2022, 30), (2, 1998, 50), (1, 1995, 100)], Solution.studioRevenueByYear())
+        Solution.studioDidntProduceMovie(2, "Heat", 2022)
+        self.assertEqual([("Ronin", 50), ("Heat", 100), ("Alien", 0)], Solution.franchiseRevenue())
+        self.assertEqual([(2, 1998, 50), (1, 1995, 100)], Solution.studioRevenueByYear())
+        Solution.deleteMovie("Heat", 1995)  # cascades to Warner's production, Heat 2022 keeps the name
+        self.assertEqual([("Ronin", 50), ("Heat", 0), ("Alien", 0)], Solution.franchiseRevenue())
+        self.assertEqual([(2, 1998, 50)], Solution.studioRevenueByYear())
+        Solution.deleteStudio(2)
+        Solution.deleteMovie("Heat", 2022)
+        self.assertEqual([("Ronin", 0), ("Alien", 0)], Solution.franchiseRevenue())
+        self.assertEqual([], Solution.studioRevenueByYear())
+        Solution.addMovie(Movie(movie_name="Heat", year=1995, genre="Action"))
+        Solution.studioProducedMovie(1, "Heat", 1995, 10, 7)
+        self.assertEqual([("Ronin", 0), ("Heat", 7), ("Alien", 0)], Solution.franchiseRevenue())
+        self.assertEqual([(1, 1995, 7)], Solution.studioRevenueByYear())
+
+    # (StudioMovieCount rows, CriticStudioCoverage rows) as getFanCritics reads them
+    @staticmethod
+    def coverage() -> tuple:
+        conn = Connector.DBConnector()
+        try:
+            counts = conn.execute("SELECT studio_id, movie_count FROM StudioMovieCount ORDER BY studio_id")[1].rows
+            rated = conn.execute("SELECT critic_id, studio_id, rated_count FROM CriticStudioCoverage\
+                                 ORDER BY critic_id, studio_id")[1].rows
+            return [tuple(row) for row in counts], [tuple(row) for row in rated]
+        finally:
+            conn.close()
+
+    def testFanCoverage(self) -> None:
+        self.assertIn("CriticStudioCoverage", Solution.ADVANCED_QUERIES["getFanCritics"])
+        for name, year in (("Heat", 1995), ("Ronin", 1998), ("Alien", 1979)):
+            Solution.addMovie(Movie(movie_name=name, year=year, genre="Action"))
+        for critic_id in (1, 2):
+            Solution.addCritic(Critic(critic_id=critic_id, critic_name="critic" + str(critic_id)))
+        Solution.addStudio(Studio(studio_id=1, studio_name="Warner"))
+        Solution.addStudio(Studio(studio_id=2, studio_name="MGM"))
+        Solution.criticRatedMovie("Heat", 1995, 1, 5)  # rated before it is produced
+        Solution.criticRatedMovie("Alien", 1979, 2, 4)  # never produced
+        self.assertEqual(([], []), self.coverage())
+        Solution.studioProducedMovie(1, "Heat", 1995, 10, 100)
+        Solution.studioProducedMovie(1, "Ronin", 1998, 10, 100)
+        self.assertEqual(([(1, 2)], [(1, 1, 1)]), self.coverage())
+        self.assertEqual([], Solution.getFanCritics())
+        Solution.criticRatedMovie("Ronin", 1998, 1, 3)
+        Solution.criticRatedMovie("Ronin", 1998, 2, 3)
+        self.assertEqual(([(1, 2)], [(1, 1, 2), (2, 1, 1)]), self.coverage())
+        self.assertEqual([(1, 1)], Solution.getFanCritics())
+        Solution.studioDidntProduceMovie(1, "Heat", 1995)
+        Solution.studioProducedMovie(2, "Heat", 1995, 10, 100)
+        self.assertEqual(([(1, 1), (2, 1)], [(1, 1, 1), (1, 2, 1), (2, 1, 1)]), self.coverage())
+        self.assertEqual([(2, 1), (1, 2), (1, 1)], Solution.getFanCritics())
+        Solution.criticDidntRateMovie("Heat", 1995, 1)
+        self.assertEqual(([(1, 1), (2, 1)], [(1, 1, 1), (2, 1, 1)]), self.coverage(), "the emptied row is gone")
+        self.assertEqual([(2, 1), (1, 1)], Solution.getFanCritics())
+        Solution.criticRatedMovie("Heat", 1995, 2, 5)
+        Solution.deleteMovie("Ronin", 1998)  # cascades to Warner's production and both ratings
+        self.assertEqual(([(2, 1)], [(2, 2, 1)]), self.coverage())
+        self.assertEqual([(2, 2)], Solution.getFanCritics())
+        Solution.studioProducedMovie(1, "Alien", 1979, 10, 100)
+        self.assertEqual(([(1, 1), (2, 1)], [(2, 1, 1), (2, 2, 1)]), self.coverage())
+        self.assertEqual([(2, 2), (2, 1)], Solution.getFanCritics())
+        Solution.deleteStudio(2)
+        self.assertEqual(([(1, 1)], [(2, 1, 1)]), self.coverage())
+        self.assertEqual([(2, 1)], Solution.getFanCritics())
+        Solution.deleteCritic(2)
+        self.assertEqual(([(1, 1)], []), self.coverage())
+        self.assertEqual([], Solution.getFanCritics())
+
+# *** DO NOT RUN EACH TEST MANUALLY ***
+if __name__ == '__main__':
+    unittest.main(verbosity=2, exit=False)
@@ -0,0 +1,93 @@
+import unittest
+from unittest import mock
+
+import Solution
+import Utility.DBConnector as Connector
+from Tests.abstractTest import AbstractTest
+
+from Business.Actor import Actor
+from Business.Critic import Critic
+from Business.Movie import Movie
+from Business.Studio import Studio
+from Utility.Exceptions import DatabaseException
+
+'''
+    generator variants of the Advanced API
+'''
+
+
+# a server-side cursor whose connection is lost after rows rows
+class FailingCursor:
+    def __init__(self, cursor, rows):
+        self.cursor = cursor
+        self.rows = rows
+        self.itersize = cursor.itersize
+
+    def execute(self, query, params=None):
+        self.cursor.execute(query, params)
+
+    def __iter__(self):
+        for row in self.cursor:
+            if self.rows == 0:
+                raise DatabaseException.ConnectionInvalid("connection lost")
+            self.rows -= 1
+            yield row
+
+    def close(self):
+        self.cursor.close()
+
+
+class Test(AbstractTest):
+    rollback = False  # checks the pool once the stream is closed
+
+    def setUp(self) -> None:
+        super().setUp()
+        Solution.configureAdvancedCache(enabled=False)
+        Solution.addStudio(Studio(studio_id=1, studio_name="Warner"))
+        Solution.addCritic(Critic(critic_id=1, critic_name="Ebert"))
+        Solution.addActor(Actor(actor_id=1, actor_name="Al Pacino", age=80, height=170))
+        for year in range(1990, 2000):
+            Solution.addMovie(Movie(movie_name="Movie" + str(year), year=year, genre="Drama"))
+            Solution.studioProducedMovie(1, "Movie" + str(year), year, 10, year)
+            Solution.criticRatedMovie("Movie" + str(year), year, 1, 3)
+            Solution.actorPlayedInMovie("Movie" + str(year), year, 1, 100, ["role"])
+
+    def tearDown(self) -> None:
+        Solution.configureAdvancedCache(enabled=True)
+        super().tearDown()
+
+    def testSameRows(self) -> None:
+        self.assertEqual(Solution.franchiseRevenue(), list(Solution.franchiseRevenueStream(fetchSize=3)))
+        self.assertEqual(Solution.studioRevenueByYear(), list(Solution.studioRevenueByYearStream(fetchSize=3)))
+        self.assertEqual(Solution.getFanCritics(), list(Solution.getFanCriticsStream(fetchSize=3)))
+        self.assertEqual(Solution.averageAgeByGenre(), list(Solution.averageAgeByGenreStream(fetchSize=3)))
+        self.assertEqual(Solution.getExclusiveActors(), list(Solution.getExclusiveActorsStream(fetchSize=3)))
+
+    def testClosedEarly(self) -> None:
+        rows = Solution.studioRevenueByYearStream(fetchSize=2)
+        self.assertEqual((1, 1999, 1999), next(rows))
+        rows.close()
+        pool = Connector.getPool()
+        if pool is not None:
+            self.assertEqual(0, pool.stats()["in_use"], "closing the generator returns its connection")
+
+    def failAfter(self, rows):
+        serverCursor = Connector.DBConnector._DBConnector__serverCursor
+        return mock.patch.object(Connector.DBConnector, "_DBConnector__serverCursor",
+                                 lambda conn, fetchSize: FailingCursor(serverCursor(conn, fetchSize), rows))
+
+    def testFailsPartway(self) -> None:
+        with self.failAfter(3):
+            rows = Solution.studioRevenueByYearStream(fetchSize=2)
+            self.assertEqual([1999, 1998, 1997], [next(rows)[1] for _ in range(3)])
+            self.assertRaises(DatabaseException.ConnectionInvalid, next, rows)
+        with self.failAfter(0):
+            self.assertEqual([], list(Solution.studioRevenueByYearStream()), "nothing streamed yet, as the list")
+        pool = Connector.getPool()
+        if pool is not None:
+            self.assertEqual(0, pool.stats()["in_use"], "the failed streams returned their connections")
+
+
+# *** DO NOT RUN EACH TEST MANUALLY ***
+if __name__ == '__main__':
+    unittest.main(verbosity=2, exit=False)
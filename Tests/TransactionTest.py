@@ -0,0 +1,51 @@
+import unittest
+import Solution
+from Utility.ReturnValue import ReturnValue
+from Tests.abstractTest import AbstractTest
+
+from Business.Critic import Critic
+from Business.Movie import Movie
+
+'''
+    Solution.transaction(): one connection and one commit for a sequence of calls
+'''
+
+
+class Test(AbstractTest):
+
+    def testCommit(self) -> None:
+        with Solution.transaction():
+            self.assertEqual(ReturnValue.OK, Solution.addCritic(Critic(critic_id=1, critic_name="John")))
+            self.assertEqual(ReturnValue.ALREADY_EXISTS, Solution.addCritic(Critic(critic_id=1, critic_name="Bob")),
+                             "failing call keeps its ReturnValue")
+            self.assertEqual(ReturnValue.OK, Solution.addCritic(Critic(critic_id=2, critic_name="Alice")),
+                             "transaction carries on after a failing call")
+            self.assertEqual("John", Solution.getCriticProfile(1).getName(), "reads see the transaction's writes")
+        self.assertEqual("Alice", Solution.getCriticProfile(2).getName())
+
+    def testRollback(self) -> None:
+        with Solution.transaction() as tx:
+            self.assertEqual(ReturnValue.OK, Solution.addMovie(Movie(movie_name="Heat", year=1995, genre="Action")))
+            tx.rollback()
+        self.assertEqual(None, Solution.getMovieProfile("Heat", 1995).getMovieName())
+        try:
+            with Solution.transaction():
+                Solution.addMovie(Movie(movie_name="Heat", year=1995, genre="Action"))
+                raise RuntimeError("abort")
+        except RuntimeError:
+            pass
+        self.assertEqual(None, Solution.getMovieProfile("Heat", 1995).getMovieName(), "exception rolls back")
+
+    def testNested(self) -> None:
+        with Solution.transaction():
+            Solution.addCritic(Critic(critic_id=1, critic_name="John"))
+            with Solution.transaction() as inner:
+                Solution.addCritic(Critic(critic_id=2, critic_name="Bob"))
+                inner.rollback()
+        self.assertEqual("John", Solution.getCriticProfile(1).getName())
+        self.assertEqual(None, Solution.getCriticProfile(2).getName(), "inner rollback only undoes the inner block")
+
+
+# *** DO NOT RUN EACH TEST MANUALLY ***
+if __name__ == '__main__':
+    unittest.main(verbosity=2, exit=False)
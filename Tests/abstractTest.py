@@ -1,12 +1,50 @@
 import unittest
 import Solution as Solution
+import Utility.Config as Config
 
+# reset= of the [tests] section in database.ini (DB_TESTS__RESET=...) picks how the tables are reset between tests:
+#   drop      createTables() before and dropTables() after every test
+#   truncate  the tables are created once per test class and emptied by clearTables() after every test.
+#             the default, so every suite (SimpleTest included) runs this way unless database.ini says otherwise
+#   rollback  the tables are created once per test class and every test runs in a transaction that is rolled back.
+#             a class whose tests need their writes committed (other threads, caches, tx.commit()) sets
+#             rollback = False and is truncated instead
+RESET_MODES = ("drop", "truncate", "rollback")
 
+
+# the tests run against the backend of database.ini, DB_CONNECTOR__BACKEND=sqlite runs them without a server
 class AbstractTest(unittest.TestCase):
+    rollback = True
+    reset = "truncate"  # the mode of this class, set by setUpClass
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        reset = Config.get("tests", "reset") or "truncate"
+        if reset not in RESET_MODES:
+            raise ValueError("reset must be one of " + ", ".join(RESET_MODES))
+        cls.reset = "truncate" if reset == "rollback" and not cls.rollback else reset
+        if cls.reset != "drop":
+            Solution.createTables()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        if cls.reset != "drop":
+            Solution.dropTables()
+
     # before each test, setUp is executed
     def setUp(self) -> None:
-        Solution.createTables()
+        if self.reset == "drop":
+            Solution.createTables()
+        elif self.reset == "rollback":
+            self.transaction = Solution.transaction()
+            self.transaction.__enter__()
 
     # after each test, tearDown is executed
     def tearDown(self) -> None:
-        Solution.dropTables()
+        if self.reset == "drop":
+            Solution.dropTables()
+        elif self.reset == "rollback":
+            self.transaction.rollback()
+            self.transaction.__exit__(None, None, None)
+        else:
+            Solution.clearTables()
@@ -0,0 +1,254 @@
+import json
+import os
+import re
+import sqlite3
+import threading
+from collections import namedtuple
+
+import psycopg2
+from psycopg2 import extensions, sql
+
+import Utility.Config as Config
+from Utility.Exceptions import DatabaseException
+
+# storage engines behind DBConnector, chosen with backend= in the [connector] section of database.ini
+# (or DB_CONNECTOR__BACKEND=sqlite). a backend opens DB-API connections that behave like psycopg2's
+# (autocommit, get_transaction_status(), cursor(name=...), %s parameters) and maps the driver's constraint
+# errors to DatabaseException, so DBConnector and Solution.py work unchanged on top of it
+
+
+# backend= of the [connector] section
+def configuredName() -> str:
+    return Config.get("connector", "backend") or "postgresql"
+
+
+def _violations():
+    return {
+        "NOT_NULL": DatabaseException.NOT_NULL_VIOLATION("NOT_NULL_VIOLATION"),
+        "FOREIGN_KEY": DatabaseException.FOREIGN_KEY_VIOLATION("FOREIGN_KEY_VIOLATION"),
+        "UNIQUE": DatabaseException.UNIQUE_VIOLATION("UNIQUE_VIOLATION"),
+        "CHECK": DatabaseException.CHECK_VIOLATION("CHECK_VIOLATION"),
+    }
+
+
+class PostgreSQLBackend:
+    name = "postgresql"
+    prepare = True  # server-side PREPARE / EXECUTE
+    copy = True  # COPY ... FROM STDIN
+
+    _SQLSTATES = {"23502": "NOT_NULL", "23503": "FOREIGN_KEY", "23505": "UNIQUE", "23514": "CHECK"}
+
+    # joins and aggregates over tables partitioned alike run partition by partition
+    PARTITIONWISE = "-c enable_partitionwise_join=on -c enable_partitionwise_aggregate=on"
+
+    # section names the connection parameters, e.g. a read replica's (see DBConnector.configureReplicas).
+    # the partitioned layout of createTables ([schema] partitioned=true) adds PARTITIONWISE to the session options
+    def connect(self, section="postgresql"):
+        parameters = Config.section(section)
+        if Config.getBool("schema", "partitioned", False):
+            parameters["options"] = (parameters.get("options", "") + " " + self.PARTITIONWISE).strip()
+        return psycopg2.connect(**parameters)
+
+    # connection parameters are read on every connect(), only the backend choice matters
+    def matchesConfig(self) -> bool:
+        return configuredName() == self.name
+
+    # the DatabaseException for a constraint violation, None for any other error
+    def translateError(self, e):
+        if not isinstance(e, psycopg2.Error) or e.pgcode not in self._SQLSTATES:
+            return None
+        return _violations()[self._SQLSTATES[e.pgcode]]
+
+    def close(self):
+        pass
+
+
+# ---------------------------------- SQLite ----------------------------------
+# [sqlite] database= is a file name, or :memory: (the default) for one in-memory database shared by every
+# connection of the process. tables are STRICT, so a value of the wrong type is rejected like PostgreSQL does
+Column = namedtuple("Column", ["name", "type_code"])
+
+_placeholder = re.compile(r"\$(\d+)")
+_format = re.compile(r"%s")
+
+
+# a statement (str or psycopg2.sql.SQL / Composed / Identifier) as SQLite text, $n and %s become ?n / ?
+def sqliteQuery(query) -> str:
+    if isinstance(query, sql.Composed):
+        return "".join(sqliteQuery(part) for part in query.seq)
+    if isinstance(query, sql.SQL):
+        return query.string
+    if isinstance(query, sql.Identifier):
+        return ".".join('"' + string.replace('"', '""') + '"' for string in query.strings)
+    if isinstance(query, sql.Composable):
+        raise DatabaseException.UNKNOWN_ERROR("SQLite can not render " + type(query).__name__ + ", use parameters")
+    return _placeholder.sub(lambda match: "?" + match.group(1), query)
+
+
+# lists / tuples travel as JSON arrays, read them with json_each()
+def sqliteParam(value):
+    if isinstance(value, (list, tuple)):
+        return json.dumps(list(value))
+    return value
+
+
+# a named (streaming) cursor steps through its rows lazily. any other cursor fetches them when the statement
+# runs, so that rowcount is the number of rows of a SELECT as with psycopg2
+class SQLiteCursor:
+    def __init__(self, connection, lazy=False):
+        self.connection = connection
+        self.cursor = connection.raw.cursor()
+        self.lazy = lazy
+        self.rows = None
+        self.itersize = 2000
+        self.description = None
+        self.rowcount = -1
+
+    def execute(self, query, params=None):
+        query = sqliteQuery(query)
+        if params is not None:
+            params = [sqliteParam(param) for param in params]
+            used = [int(index) for index in re.findall(r"\?(\d+)", query)]
+            if used:
+                params = params[:max(used)]  # sqlite3 refuses unused trailing parameters
+            else:
+                query = _format.sub("?", query)
+        self.connection.begin()
+        self.cursor.execute(query, params if params is not None else ())
+        self.rows = None
+        self.rowcount = self.cursor.rowcount
+        if self.cursor.description is None:
+            self.description = None
+            return
+        self.description = [Column(d[0], None) for d in self.cursor.description]
+        if not self.lazy:
+            self.rows = self.cursor.fetchall()
+            self.rows.reverse()  # popped from the end
+            self.rowcount = len(self.rows)
+
+    def fetchmany(self, size=None) -> list:
+        size = size or self.itersize
+        if self.rows is None:
+            return self.cursor.fetchmany(size)
+        batch = self.rows[:-size - 1:-1]
+        del self.rows[-size:]
+        return batch
+
+    def fetchall(self) -> list:
+        if self.rows is None:
+            return self.cursor.fetchall()
+        batch, self.rows = self.rows[::-1], []
+        return batch
+
+    def fetchone(self):
+        rows = self.fetchmany(1)
+        return rows[0] if rows else None
+
+    def __iter__(self):
+        return iter(self.fetchone, None) if self.rows is not None else iter(self.cursor)
+
+    def mogrify(self, query, params=None) -> bytes:
+        literals = []
+        for param in params or ():
+            param = sqliteParam(param)
+            if param is None:
+                literals.append("NULL")
+            elif isinstance(param, (int, float)):
+                literals.append(repr(param))
+            else:
+                literals.append("'" + str(param).replace("'", "''") + "'")
+        return (_format.sub(lambda _: literals.pop(0), query) if literals else query).encode()
+
+    def close(self):
+        self.cursor.close()
+
+
+# psycopg2-style wrapper: BEGIN is issued before the first statement unless autocommit is on,
+# commit() / rollback() end the transaction
+class SQLiteConnection:
+    def __init__(self, raw):
+        raw.isolation_level = None  # transactions are managed here
+        raw.execute("PRAGMA foreign_keys = ON")
+        self.raw = raw
+        self.autocommit = False
+        self.closed = False
+
+    def begin(self):
+        if not self.autocommit and not self.raw.in_transaction:
+            self.raw.execute("BEGIN")
+
+    def cursor(self, name=None):
+        return SQLiteCursor(self, lazy=name is not None)
+
+    def commit(self):
+        if self.raw.in_transaction:
+            self.raw.execute("COMMIT")
+
+    def rollback(self):
+        if self.raw.in_transaction:
+            self.raw.execute("ROLLBACK")
+
+    def get_transaction_status(self) -> int:
+        if self.closed:
+            return extensions.TRANSACTION_STATUS_UNKNOWN
+        return extensions.TRANSACTION_STATUS_INTRANS if self.raw.in_transaction else extensions.TRANSACTION_STATUS_IDLE
+
+    def close(self):
+        if not self.closed:
+            self.closed = True
+            self.raw.close()
+
+
+class SQLiteBackend:
+    name = "sqlite"
+    prepare = False  # sqlite3 caches compiled statements by itself
+    copy = False
+
+    _ERRORS = {"SQLITE_CONSTRAINT_NOTNULL": "NOT_NULL", "SQLITE_CONSTRAINT_FOREIGNKEY": "FOREIGN_KEY",
+               "SQLITE_CONSTRAINT_UNIQUE": "UNIQUE", "SQLITE_CONSTRAINT_PRIMARYKEY": "UNIQUE",
+               "SQLITE_CONSTRAINT_CHECK": "CHECK"}
+    _MESSAGES = (("NOT NULL constraint failed", "NOT_NULL"), ("FOREIGN KEY constraint failed", "FOREIGN_KEY"),
+                 ("UNIQUE constraint failed", "UNIQUE"), ("CHECK constraint failed", "CHECK"))
+
+    def __init__(self, database=None):
+        self.database = database or Config.get("sqlite", "database") or ":memory:"
+        self.keeper = None  # keeps a shared in-memory database alive while connections come and go
+        self.lock = threading.Lock()
+
+    def __target(self):
+        if self.database != ":memory:":
+            return self.database, False
+        return "file:dbconnector_" + str(os.getpid()) + "_" + str(id(self)) + "?mode=memory&cache=shared", True
+
+    # a replica's section names its own database file
+    def connect(self, section=None):
+        if section is not None:
+            return SQLiteConnection(sqlite3.connect(Config.section(section)["database"], check_same_thread=False,
+                                                    timeout=30))
+        database, uri = self.__target()
+        with self.lock:
+            if uri and self.keeper is None:
+                self.keeper = sqlite3.connect(database, uri=True, check_same_thread=False)
+        return SQLiteConnection(sqlite3.connect(database, uri=uri, check_same_thread=False, timeout=30))
+
+    def matchesConfig(self) -> bool:
+        return configuredName() == self.name and self.database == (Config.get("sqlite", "database") or ":memory:")
+
+    def translateError(self, e):
+        if not isinstance(e, sqlite3.IntegrityError):
+            return None
+        kind = self._ERRORS.get(getattr(e, "sqlite_errorname", None))
+        for message, message_kind in self._MESSAGES:
+            if kind is None and str(e).startswith(message):
+                kind = message_kind
+        return _violations()[kind] if kind is not None else None
+
+    # drops the in-memory database once every connection is closed
+    def close(self):
+        with self.lock:
+            if self.keeper is not None:
+                self.keeper.close()
+                self.keeper = None
+
+
+BACKENDS = {"postgresql": PostgreSQLBackend, "sqlite": SQLiteBackend}
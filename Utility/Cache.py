@@ -0,0 +1,121 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+# thread-safe LRU cache with an optional time-to-live (seconds), counts hits and misses.
+# a reader takes token() before querying the database and passes it to put(): if anything was invalidated in
+# between, the value may already be stale and is not cached
+class LRUCache:
+    def __init__(self, capacity=10000, ttl=None, enabled=True):
+        self.capacity = capacity
+        self.ttl = ttl
+        self.enabled = enabled
+        self.__entries = OrderedDict()  # key -> (value, expires), least recently used first
+        self.__lock = threading.Lock()
+        self.__invalidations = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    # the cached value, or None on a miss (so None itself is never cached, wrap it instead)
+    def get(self, key):
+        if not self.enabled:
+            return None
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is None or (entry[1] is not None and entry[1] < time.monotonic()):
+                if entry is not None:
+                    del self.__entries[key]
+                self.misses += 1
+                return None
+            self.__entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def token(self) -> int:
+        return self.__invalidations
+
+    def put(self, key, value, token=None):
+        if not self.enabled or self.capacity <= 0:
+            return
+        with self.__lock:
+            if token is not None and token != self.__invalidations:
+                return
+            expires = time.monotonic() + self.ttl if self.ttl is not None else None
+            self.__entries[key] = (value, expires)
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.capacity:
+                self.__entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key):
+        with self.__lock:
+            self.__invalidations += 1
+            self.__entries.pop(key, None)
+
+    def clear(self):
+        with self.__lock:
+            self.__invalidations += 1
+            self.__entries.clear()
+
+    def stats(self) -> dict:
+        with self.__lock:
+            return {"enabled": self.enabled, "size": len(self.__entries), "capacity": self.capacity,
+                    "hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+
+# results that depend on whole tables. every table has a version that writers bump with invalidate(), an entry is
+# stored with the versions of the tables it was computed from and is only served while all of them are unchanged.
+# a reader takes versions() before querying, so a write racing with the query makes the stored entry stale at once
+class DependencyCache:
+    def __init__(self, capacity=1000, ttl=None, enabled=True):
+        self.__entries = LRUCache(capacity, ttl, enabled)
+        self.__versions = {}  # table name (lower case) -> version
+        self.__epoch = 0  # bumped by clear(), so it also covers tables that were never written
+        self.__lock = threading.Lock()
+        self.stale = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.__entries.enabled
+
+    def configure(self, enabled=True, capacity=1000, ttl=None):
+        self.__entries.enabled = enabled
+        self.__entries.capacity = capacity
+        self.__entries.ttl = ttl
+        self.__entries.clear()
+
+    def versions(self, tables) -> tuple:
+        with self.__lock:
+            return (self.__epoch,) + tuple(self.__versions.get(table.lower(), 0) for table in tables)
+
+    # the cached value if none of its tables changed since it was stored, None otherwise
+    def get(self, key, tables):
+        entry = self.__entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] != self.versions(tables):
+            self.stale += 1
+            return None
+        return entry[1]
+
+    # versions is what versions(tables) returned before the value was read from the database
+    def put(self, key, value, versions):
+        self.__entries.put(key, (versions, value))
+
+    def invalidate(self, *tables):
+        with self.__lock:
+            for table in tables:
+                self.__versions[table.lower()] = self.__versions.get(table.lower(), 0) + 1
+
+    def clear(self):
+        with self.__lock:
+            self.__epoch += 1
+        self.__entries.clear()
+
+    def stats(self) -> dict:
+        stats = self.__entries.stats()
+        stats["stale"] = self.stale
+        stats["hits"] -= self.stale  # the LRU counted them as hits before the versions were compared
+        return stats
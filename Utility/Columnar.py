@@ -0,0 +1,87 @@
+import array
+
+try:
+    import numpy
+except ImportError:  # NumPy is optional, columns are typed array.array without it
+    numpy = None
+
+# column-oriented query results: {column name: values}. numeric columns become one typed array each
+# (numpy.ndarray, or array.array when NumPy is not installed), chosen from the PostgreSQL type OID in
+# cursor.description. other columns (text, ...) are a NumPy object array / a plain list.
+# a numeric column holding NULL is widened to float64 with NaN in its place
+
+# PostgreSQL type OID -> array.array typecode
+TYPECODES = {
+    16: "b",  # boolean
+    21: "h",  # smallint
+    23: "i",  # integer
+    20: "q",  # bigint
+    700: "f",  # real
+    701: "d",  # double precision
+    1700: "d",  # numeric, e.g. AVG(integer)
+}
+NUMPY_TYPES = {"b": "bool", "h": "int16", "i": "int32", "q": "int64", "f": "float32", "d": "float64"}
+NAN = float("nan")
+
+
+class Columns(dict):
+    def __init__(self, names, columns, size):
+        super().__init__(zip(names, columns))
+        self.names = list(names)
+        self.size = size
+
+    # the columns in result order
+    def arrays(self) -> list:
+        return [self[name] for name in self.names]
+
+
+# accumulates rows (one batch at a time) straight into per-column buffers
+class ColumnsBuilder:
+    def __init__(self, description):
+        self.names = [d.name for d in description]
+        self.typecodes = [TYPECODES.get(d.type_code) for d in description]
+        self.buffers = [array.array(typecode) if typecode else [] for typecode in self.typecodes]
+        self.size = 0
+
+    def extend(self, rows):
+        if not rows:
+            return
+        self.size += len(rows)
+        for index, values in enumerate(zip(*rows)):
+            typecode = self.typecodes[index]
+            if typecode is not None and None in values:
+                if typecode != "d":
+                    self.typecodes[index] = typecode = "d"
+                    self.buffers[index] = array.array("d", self.buffers[index])
+                values = [NAN if value is None else value for value in values]
+            self.buffers[index].extend(values)
+
+    def build(self) -> Columns:
+        columns = []
+        for typecode, buffer in zip(self.typecodes, self.buffers):
+            if numpy is None:
+                columns.append(buffer)
+            elif typecode is None:
+                column = numpy.empty(len(buffer), dtype=object)
+                column[:] = buffer
+                columns.append(column)
+            else:
+                columns.append(numpy.frombuffer(buffer, dtype=NUMPY_TYPES[typecode]))  # shares the buffer
+        return Columns(self.names, columns, self.size)
+
+
+def fromRows(description, rows) -> Columns:
+    builder = ColumnsBuilder(description)
+    for start in range(0, len(rows), 4096):
+        builder.extend(rows[start:start + 4096])
+    return builder.build()
+
+
+# executed cursor -> Columns, fetching fetchSize rows at a time so only one batch of row tuples exists at once
+def fromCursor(cursor, fetchSize=2000) -> Columns:
+    rows = cursor.fetchmany(fetchSize)  # a server-side cursor has no description before its first fetch
+    builder = ColumnsBuilder(cursor.description or [])
+    while rows:
+        builder.extend(rows)
+        rows = cursor.fetchmany(fetchSize)
+    return builder.build()
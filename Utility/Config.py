@@ -0,0 +1,109 @@
+import os
+import threading
+from configparser import ConfigParser
+
+from Utility.Exceptions import DatabaseException
+
+# database.ini is read once and cached, call reload() after editing it.
+# lookup order: $DB_CONFIG_FILE, ./Utility/database.ini, ../Utility/database.ini, next to this module.
+# any value can be overridden from the environment as DB_<SECTION>__<KEY>, for example
+# DB_POSTGRESQL__PASSWORD=secret or DB_POSTGRESQL_REPLICA__HOST=replica1 (this also creates new sections)
+CONFIG_FILE_ENV = "DB_CONFIG_FILE"
+ENV_PREFIX = "DB_"
+ENV_SEPARATOR = "__"
+
+_sections = None
+_generation = 0
+_listeners = []
+_lock = threading.RLock()
+
+
+def candidateFiles() -> list:
+    if os.environ.get(CONFIG_FILE_ENV):
+        return [os.environ[CONFIG_FILE_ENV]]
+    return [os.path.join(os.getcwd(), "Utility", "database.ini"),
+            os.path.join(os.path.dirname(os.getcwd()), "Utility", "database.ini"),
+            os.path.join(os.path.dirname(os.path.abspath(__file__)), "database.ini")]
+
+
+def _read() -> dict:
+    parser = ConfigParser()
+    for filename in candidateFiles():
+        if parser.read(filename):
+            break
+    sections = {name: dict(parser.items(name)) for name in parser.sections()}
+    for variable, value in os.environ.items():
+        if not variable.startswith(ENV_PREFIX) or ENV_SEPARATOR not in variable:
+            continue
+        section, key = variable[len(ENV_PREFIX):].split(ENV_SEPARATOR, 1)
+        sections.setdefault(section.lower(), {})[key.lower()] = value
+    return sections
+
+
+# all sections, parsed on first use
+def load() -> dict:
+    global _sections
+    if _sections is None:
+        with _lock:
+            if _sections is None:
+                _sections = _read()
+    return _sections
+
+
+# re-read database.ini and the environment, then notify everything that cached derived state
+def reload() -> None:
+    global _sections, _generation
+    with _lock:
+        _sections = _read()
+        _generation += 1
+        listeners = list(_listeners)
+    for listener in listeners:
+        listener()
+
+
+# call listener() after every reload(), e.g. to reconnect with the new parameters
+def onReload(listener) -> None:
+    with _lock:
+        _listeners.append(listener)
+
+
+# bumped by every reload()
+def generation() -> int:
+    return _generation
+
+
+def sections() -> list:
+    return list(load().keys())
+
+
+def hasSection(name: str) -> bool:
+    return name in load()
+
+
+# a copy of a whole section, e.g. the connection parameters in [postgresql]
+def section(name='postgresql') -> dict:
+    sections = load()
+    if name not in sections:
+        raise DatabaseException.database_ini_ERROR("Please modify database.ini file under Utility")
+    return dict(sections[name])
+
+
+def get(section_name: str, key: str, default=None):
+    return load().get(section_name, {}).get(key, default)
+
+
+def getInt(section_name: str, key: str, default=None):
+    value = get(section_name, key)
+    return default if value in (None, "") else int(value)
+
+
+def getFloat(section_name: str, key: str, default=None):
+    value = get(section_name, key)
+    return default if value in (None, "") else float(value)
+
+
+def getBool(section_name: str, key: str, default=None):
+    value = get(section_name, key)
+    if value in (None, ""):
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
@@ -0,0 +1,156 @@
+import threading
+import time
+from collections import deque
+
+from psycopg2 import extensions
+
+from Utility.Exceptions import DatabaseException
+
+
+# a physical connection together with the bookkeeping the pool needs,
+# plus the server-side prepared statements that live as long as the connection does
+class PooledConnection:
+    def __init__(self, connection):
+        self.connection = connection
+        self.created = time.monotonic()
+        self.last_used = self.created
+        self.prepared = set()
+        self.prepared_generation = 0
+
+
+# thread-safe pool of open connections.
+# connect is a function returning a new DB-API connection, so the pool does not care how connections are made.
+# min_size connections are kept open at all times, at most max_size connections exist at once.
+# connections idle for more than idle_timeout seconds are closed (down to min_size),
+# connections older than max_lifetime seconds are replaced, and a connection idle for more than
+# check_idle_after seconds is pinged before it is handed out (0 pings on every checkout)
+class ConnectionPool:
+    def __init__(self, connect, min_size=1, max_size=10, idle_timeout=300.0, max_lifetime=3600.0,
+                 check_on_checkout=True, check_idle_after=5.0, acquire_timeout=30.0):
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError("invalid pool size: min_size=" + str(min_size) + ", max_size=" + str(max_size))
+        self.connect = connect
+        self.min_size = min_size
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.max_lifetime = max_lifetime
+        self.check_on_checkout = check_on_checkout
+        self.check_idle_after = check_idle_after
+        self.acquire_timeout = acquire_timeout
+        self.__condition = threading.Condition()
+        self.__idle = deque()  # most recently used connection is on the right
+        self.__size = 0  # idle + checked out + being opened
+        self.__closed = False
+        for _ in range(min_size):
+            self.__idle.append(self.__open())
+            self.__size += 1
+
+    # take a connection out of the pool, opening a new one if none is idle and the pool is not full
+    def acquire(self) -> PooledConnection:
+        deadline = time.monotonic() + self.acquire_timeout
+        while True:
+            pooled = None
+            with self.__condition:
+                while True:
+                    if self.__closed:
+                        raise DatabaseException.ConnectionInvalid("Connection pool is closed")
+                    now = time.monotonic()
+                    self.__pruneIdle(now)
+                    while self.__idle:
+                        candidate = self.__idle.pop()
+                        if self.__expired(candidate, now):
+                            self.__discard(candidate)
+                        else:
+                            pooled = candidate
+                            break
+                    if pooled is not None or self.__size < self.max_size:
+                        break
+                    remaining = deadline - now
+                    if remaining <= 0 or not self.__condition.wait(remaining):
+                        raise DatabaseException.ConnectionInvalid("Timed out waiting for a pooled connection")
+                if pooled is None:
+                    self.__size += 1  # reserve the slot, the connection is opened outside the lock
+            if pooled is None:
+                try:
+                    return self.__open()
+                except Exception:
+                    with self.__condition:
+                        self.__size -= 1
+                        self.__condition.notify()
+                    raise
+            if self.__healthy(pooled):
+                return pooled
+            with self.__condition:
+                self.__discard(pooled)
+
+    # give a connection back, any transaction left open on it is rolled back
+    def release(self, pooled: PooledConnection, discard=False):
+        connection = pooled.connection
+        if not discard and not connection.closed:
+            status = connection.get_transaction_status()
+            if status == extensions.TRANSACTION_STATUS_UNKNOWN:
+                discard = True
+            elif status != extensions.TRANSACTION_STATUS_IDLE:
+                try:
+                    connection.rollback()
+                except Exception:
+                    discard = True
+        with self.__condition:
+            now = time.monotonic()
+            if discard or self.__closed or connection.closed or self.__expired(pooled, now):
+                self.__discard(pooled)
+            else:
+                pooled.last_used = now
+                self.__idle.append(pooled)
+            self.__condition.notify()
+
+    # close every idle connection, connections still checked out are closed when released
+    def close(self):
+        with self.__condition:
+            self.__closed = True
+            while self.__idle:
+                self.__discard(self.__idle.pop())
+            self.__condition.notify_all()
+
+    def stats(self) -> dict:
+        with self.__condition:
+            return {"size": self.__size, "idle": len(self.__idle), "in_use": self.__size - len(self.__idle)}
+
+    def __open(self) -> PooledConnection:
+        connection = self.connect()
+        connection.autocommit = False
+        return PooledConnection(connection)
+
+    def __expired(self, pooled: PooledConnection, now: float) -> bool:
+        return self.max_lifetime is not None and now - pooled.created > self.max_lifetime
+
+    # close the least recently used idle connections that sat unused for longer than idle_timeout
+    def __pruneIdle(self, now: float):
+        if self.idle_timeout is None:
+            return
+        while self.__idle and self.__size > self.min_size and now - self.__idle[0].last_used > self.idle_timeout:
+            self.__discard(self.__idle.popleft())
+
+    # caller holds the lock
+    def __discard(self, pooled: PooledConnection):
+        self.__size -= 1
+        try:
+            pooled.connection.close()
+        except Exception:
+            pass
+
+    def __healthy(self, pooled: PooledConnection) -> bool:
+        connection = pooled.connection
+        if connection.closed:
+            return False
+        if not self.check_on_checkout or time.monotonic() - pooled.last_used < self.check_idle_after:
+            return True
+        try:
+            connection.autocommit = True  # ping without paying for BEGIN / ROLLBACK
+            cursor = connection.cursor()
+            cursor.execute("SELECT 1")
+            cursor.close()
+            connection.autocommit = False
+            return True
+        except Exception:
+            return False
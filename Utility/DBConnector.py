@@ -1,8 +1,16 @@
-import psycopg2
-from psycopg2 import errors, sql
-from configparser import ConfigParser
+from psycopg2 import sql
+import Utility.Backends as Backends
+import Utility.Columnar as Columnar
+import Utility.Config as Config
+import Utility.Metrics as Metrics
+from Utility.ConnectionPool import ConnectionPool, PooledConnection
 from Utility.Exceptions import DatabaseException
-import os
+import functools
+import io
+import itertools
+import re
+import threading
+import time
 from typing import Union
 
 
@@ -13,12 +21,56 @@ class ResultSetDict(dict):
         return super().__getitem__(item.lower())
 
 
+# one row of a ResultSet, row['col'] looks the column up in the header shared by every row of the result
+class ResultSetRow:
+    __slots__ = ("values", "cols")
+
+    def __init__(self, values, cols):
+        self.values = values
+        self.cols = cols
+
+    def __getitem__(self, item):
+        if type(item) is not str:
+            return None
+        return self.values[dict.__getitem__(self.cols, item.lower())]
+
+    def get(self, item, default=None):
+        index = self.cols.get(item.lower()) if type(item) is str else None
+        return default if index is None else self.values[index]
+
+    def keys(self):
+        return self.cols.keys()
+
+    def items(self):
+        return [(col, self.values[index]) for col, index in self.cols.items()]
+
+    def __iter__(self):
+        return iter(self.cols)
+
+    def __len__(self):
+        return len(self.cols)
+
+    def __contains__(self, item):
+        return type(item) is str and item.lower() in self.cols
+
+    def __eq__(self, other):
+        if isinstance(other, ResultSetRow):
+            other = dict(other.items())
+        return isinstance(other, dict) and dict(self.items()) == other
+
+    def __repr__(self):
+        return repr(dict(self.items()))
+
+
 class ResultSet:
     # constructor
+    # results (e.g. cursor.fetchall()) is taken over as is, not copied. rows stay tuples and every row shares
+    # the column header, so a row access allocates nothing but a small ResultSetRow
     def __init__(self, description=None, results=None):
         self.rows = []
         self.cols_header = []
         self.cols = ResultSetDict()
+        self.description = description
         self.__fromQuery(description, results)
 
     def __getitem__(self, row):
@@ -26,15 +78,19 @@ class ResultSet:
 
     # so you can use print(ResultSet)
     def __str__(self):
-        string = ""
-        for col in self.cols_header:
-            string += str(col) + "   "
-        string += '\n'
-        for row in self.rows:
-            for val in row:
-                string += str(val) + "   "
-            string += '\n'
-        return string
+        out = io.StringIO()
+        out.write("".join(str(col) + "   " for col in self.cols_header) + "\n")
+        formats = {}  # row length -> "%s   %s   ...   \n"
+        for start in range(0, len(self.rows), 4096):  # bounded intermediate list, linear overall
+            lines = []
+            for row in self.rows[start:start + 4096]:
+                row = row if type(row) is tuple else tuple(row)
+                line = formats.get(len(row))
+                if line is None:
+                    line = formats[len(row)] = "%s   " * len(row) + "\n"
+                lines.append(line % row)
+            out.write("".join(lines))
+        return out.getvalue()
 
     # what is the size of the ResultSet?
     def size(self):
@@ -44,58 +100,496 @@ class ResultSet:
     def isEmpty(self):
         return self.size() == 0
 
+    # columnar view {column name: array}, see Utility/Columnar.py
+    def columns(self) -> Columnar.Columns:
+        return Columnar.fromRows(self.description or [], self.rows)
+
     def __getRow(self, row: int):
         if len(self.rows) <= row:
             print('Invalid row ' + str(row))
             return ResultSetDict()
-        row_to_return = ResultSetDict()
-        for val, col in zip(self.rows[row], self.cols_header):
-            row_to_return[col] = val
-        return row_to_return
+        return ResultSetRow(self.rows[row], self.cols)
 
     def __fromQuery(self, description, results: list):
-        if results is None or len(results) == 0:  # no results
-            self.cols = ResultSetDict()
-        else:
-            self.rows = results.copy()
+        if description is not None:
             self.cols_header = [d.name for d in description]
-            self.cols = ResultSetDict()
-            for col, index in zip(self.cols_header, range(len(results[0]))):
-                self.cols[col] = index
+            for index, col in enumerate(self.cols_header):
+                self.cols[col.lower()] = index
+        if results is not None:
+            self.rows = results
+
+
+# file-like object feeding rows to COPY ... FROM STDIN (text format) without building the whole payload
+class CopyStream:
+    def __init__(self, rows):
+        self.__lines = (CopyStream.line(row) for row in rows)
+        self.__buffer = ""
+
+    def read(self, size=-1) -> str:
+        chunks = [self.__buffer]
+        length = len(self.__buffer)
+        for line in self.__lines:
+            chunks.append(line)
+            length += len(line)
+            if 0 <= size <= length:
+                break
+        data = "".join(chunks)
+        if size < 0:
+            self.__buffer = ""
+            return data
+        self.__buffer = data[size:]
+        return data[:size]
+
+    def readline(self, size=-1) -> str:
+        return self.read(size)
+
+    @staticmethod
+    def line(row) -> str:
+        return "\t".join(CopyStream.field(value) for value in row) + "\n"
+
+    @staticmethod
+    def field(value) -> str:
+        if value is None:
+            return "\\N"
+        if isinstance(value, (list, tuple)):
+            value = CopyStream.array(value)
+        return str(value).replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n").replace("\r", "\\r")
+
+    # PostgreSQL array literal, e.g. {"a","b",NULL}
+    @staticmethod
+    def array(values) -> str:
+        elements = []
+        for value in values:
+            if value is None:
+                elements.append("NULL")
+            else:
+                elements.append('"' + str(value).replace("\\", "\\\\").replace('"', '\\"') + '"')
+        return "{" + ",".join(elements) + "}"
+
+
+# process-wide connection pool shared by every DBConnector, created on first use.
+# defaults come from the [connector] section of database.ini, configurePool() overrides them
+_pool = None
+_pool_enabled = None
+_pool_settings = {}
+_pool_lock = threading.Lock()
+
+
+def _poolSettingsFromConfig() -> dict:
+    settings = {}
+    for key, getter in (("min_size", Config.getInt), ("max_size", Config.getInt),
+                        ("idle_timeout", Config.getFloat), ("max_lifetime", Config.getFloat),
+                        ("check_on_checkout", Config.getBool), ("check_idle_after", Config.getFloat),
+                        ("acquire_timeout", Config.getFloat)):
+        value = getter("connector", "pool_" + key)
+        if value is not None:
+            settings[key] = value
+    return settings
+
+
+# the storage engine connections are opened with, backend= in the [connector] section (see Utility/Backends.py)
+_backend = None
+_backend_explicit = False  # set by configureBackend(name), kept across Config.reload()
+_backend_lock = threading.Lock()
+
+
+def backend():
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                name = Backends.configuredName()
+                if name not in Backends.BACKENDS:
+                    raise DatabaseException.UNKNOWN_ERROR("Unknown backend " + name)
+                _backend = Backends.BACKENDS[name]()
+    return _backend
+
+
+# switch the storage engine, e.g. configureBackend("sqlite", database="test.db").
+# name=None goes back to the one in database.ini. open connections of the old backend are closed
+def configureBackend(name=None, **options):
+    global _backend, _backend_explicit
+    with _backend_lock:
+        old = _backend
+        _backend = Backends.BACKENDS[name](**options) if name is not None else None
+        _backend_explicit = name is not None
+    _resetPool()
+    if old is not None:
+        old.close()
+
+
+# name of the current backend, Solution.py picks the SQL dialect with it
+def dialect() -> str:
+    return backend().name
+
+
+# returns the process-wide pool, or None when pooling is disabled
+def getPool() -> Union[ConnectionPool, None]:
+    global _pool
+    enabled = _pool_enabled if _pool_enabled is not None else Config.getBool("connector", "pool_enabled", True)
+    if not enabled:
+        return None
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                settings = _poolSettingsFromConfig()
+                settings.update(_pool_settings)
+                _pool = ConnectionPool(backend().connect, **settings)
+    return _pool
+
+
+# (re)configure the process-wide pool, see ConnectionPool for the settings.
+# enabled=False makes every DBConnector open and close its own connection
+def configurePool(enabled=True, **settings):
+    global _pool, _pool_enabled, _pool_settings
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+        _pool = None
+        _pool_enabled = enabled
+        _pool_settings = dict(settings)
+    _resetReplicas()
+
+
+# connections opened with the old parameters are closed as soon as they are released
+def _resetPool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+        _pool = None
+    _resetReplicas()
+
+
+# a reload keeps the backend (and an in-memory database) unless database.ini now selects another one
+def _reloadBackend():
+    if _backend is not None and (_backend_explicit or _backend.matchesConfig()):
+        _resetPool()
+    else:
+        configureBackend(None)
+
+
+Config.onReload(_reloadBackend)
+
+
+# read replicas: a read-only DBConnector outside a Transaction connects to one of the database.ini sections listed
+# in replicas= of [connector] (e.g. replicas=postgresql_replica1,postgresql_replica2), everything else goes to the
+# primary. replica_selection=round_robin takes them in turn, least_loaded the one with the fewest open connectors.
+# read_your_writes=seconds keeps a thread's reads on the primary for that long after it wrote, so it sees its own
+# writes despite the replication lag. a replica that can not be reached sends its reads to the primary
+class Replica:
+    # pool_settings is None when pooling is disabled, the pool is opened by the first acquire()
+    def __init__(self, section: str, pool_settings):
+        self.section = section
+        self.pool_settings = pool_settings
+        self.pool = None
+        self.in_use = 0
+        self.closed = False
+        self.lock = threading.Lock()
+
+    def acquire(self) -> PooledConnection:
+        with self.lock:
+            self.in_use += 1
+        try:
+            if self.pool_settings is not None:
+                with self.lock:
+                    if self.closed:
+                        raise DatabaseException.ConnectionInvalid("Replica " + self.section + " is closed")
+                    if self.pool is None:
+                        self.pool = ConnectionPool(functools.partial(backend().connect, self.section),
+                                                   **self.pool_settings)
+                return self.pool.acquire()
+            pooled = PooledConnection(backend().connect(self.section))
+            pooled.connection.autocommit = False
+            return pooled
+        except Exception:
+            self.release()
+            raise
+
+    def release(self):
+        with self.lock:
+            self.in_use -= 1
+
+    def close(self):
+        with self.lock:
+            self.closed = True
+            if self.pool is not None:
+                self.pool.close()
+
+
+_replicas = None
+_replica_settings = None  # set by configureReplicas()
+_replica_turn = itertools.count()
+
+REPLICA_SELECTIONS = ("round_robin", "least_loaded")
+
+
+# route reads to the replicas in sections (database.ini section names), see above. sections=None goes back to the
+# settings of database.ini
+def configureReplicas(sections=None, selection="round_robin", readYourWrites=0.0):
+    global _replica_settings
+    if selection not in REPLICA_SELECTIONS:
+        raise ValueError("replica selection must be one of " + ", ".join(REPLICA_SELECTIONS))
+    _replica_settings = (list(sections), selection, readYourWrites) if sections is not None else None
+    _resetReplicas()
+
+
+def _replicaSettings() -> tuple:
+    if _replica_settings is not None:
+        return _replica_settings
+    sections = [name.strip() for name in (Config.get("connector", "replicas") or "").split(",") if name.strip()]
+    return (sections, Config.get("connector", "replica_selection") or "round_robin",
+            Config.getFloat("connector", "read_your_writes", 0.0))
+
+
+# the replicas, each with its own pool (same settings as the primary's), created on first use
+def getReplicas() -> list:
+    global _replicas
+    if _replicas is None:
+        pooled = getPool() is not None
+        with _pool_lock:
+            if _replicas is None:
+                settings = _poolSettingsFromConfig()
+                settings.update(_pool_settings)
+                _replicas = [Replica(section, settings if pooled else None) for section in _replicaSettings()[0]]
+    return _replicas
+
+
+def _resetReplicas():
+    global _replicas
+    with _pool_lock:
+        replicas, _replicas = _replicas, None
+    for replica in replicas or ():
+        replica.close()
+
+
+# the replica a read should use, None for the primary
+def _chooseReplica() -> Union[Replica, None]:
+    replicas = getReplicas()
+    if not replicas:
+        return None
+    _, selection, window = _replicaSettings()
+    if window and time.monotonic() - getattr(_local, "last_write", -window) < window:
+        return None
+    turn = next(_replica_turn) % len(replicas)
+    if selection == "least_loaded":  # ties go round robin
+        return min(replicas[turn:] + replicas[:turn], key=lambda replica: replica.in_use)
+    return replicas[turn]
+
+
+# registry of server-side prepared statements: name -> (query with $1..$n placeholders, parameter types).
+# a statement is PREPAREd the first time a connection executes it and EXECUTEd from then on
+_statements = {}
+_statements_generation = 0
+_prepared_enabled = None
+_placeholder = re.compile(r"\$(\d+)")
+
+
+# enabled=False sends every registered statement as plain SQL with the parameters inlined
+def configurePreparedStatements(enabled=True):
+    global _prepared_enabled
+    _prepared_enabled = enabled
+
+
+def _preparedEnabled() -> bool:
+    if _prepared_enabled is not None:
+        return _prepared_enabled
+    return Config.getBool("connector", "prepared_statements", True)
+
+
+# read-only DBConnectors run in autocommit mode when enabled, saving the BEGIN / COMMIT round trips
+_autocommit_reads = None
+
+
+def configureAutocommitReads(enabled=True):
+    global _autocommit_reads
+    _autocommit_reads = enabled
+
+
+def _autocommitReads() -> bool:
+    if _autocommit_reads is not None:
+        return _autocommit_reads
+    return Config.getBool("connector", "autocommit_reads", False)
+
+
+# rows fetched per round trip by DBConnector.stream()
+_stream_fetch_size = None
+_stream_names = itertools.count()
+
+
+def configureStreaming(fetchSize=2000):
+    global _stream_fetch_size
+    _stream_fetch_size = fetchSize
+
+
+def _streamFetchSize() -> int:
+    if _stream_fetch_size is not None:
+        return _stream_fetch_size
+    return Config.getInt("connector", "stream_fetch_size", 2000)
+
+
+# the transaction the current thread is running, if any
+_local = threading.local()
+
+
+def currentTransaction():
+    return getattr(_local, "transaction", None)
+
+
+# unit of work: every DBConnector created by this thread inside "with Transaction():" shares one connection,
+# nothing is committed until the block ends and an exception in the block rolls everything back.
+# with savepoints=True each statement runs under a savepoint, so a failing statement (e.g. a UNIQUE violation
+# mapped to ALREADY_EXISTS) only undoes itself and the transaction carries on.
+# a nested Transaction becomes a savepoint of the outer one
+class Transaction:
+    def __init__(self, savepoints=True):
+        self.savepoints = savepoints
+        self.outer = None
+        self.connector = None
+        self.control = None  # cursor for SAVEPOINT commands, keeps the statements' results intact
+        self.name = None
+        self.rollback_only = False
+        self.callbacks = []
+
+    def __enter__(self):
+        self.outer = currentTransaction()
+        if self.outer is not None:
+            self.connector = self.outer.connector
+            self.control = self.outer.control
+            self.name = "dbconnector_tx" + str(id(self))
+            self.control.execute("SAVEPOINT " + self.name)
+        else:
+            self.connector = DBConnector()
+            self.control = self.connector.connection.cursor()
+        _local.transaction = self
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        _local.transaction = self.outer
+        try:
+            if self.outer is not None:
+                if exc_type is None and not self.rollback_only:
+                    self.control.execute("RELEASE SAVEPOINT " + self.name)
+                else:
+                    self.control.execute("ROLLBACK TO SAVEPOINT " + self.name)
+            elif exc_type is None and not self.rollback_only:
+                self.connector.commit()
+            else:
+                self.connector.rollback()
+        finally:
+            if self.outer is not None:
+                self.outer.callbacks.extend(self.callbacks)
+            else:
+                self.control.close()
+                self.connector.close()
+                for callback in self.callbacks:
+                    callback()
+        return False
+
+    # commit the work so far, the transaction stays open
+    def commit(self):
+        if self.outer is not None:
+            raise DatabaseException.UNKNOWN_ERROR("Can not commit a nested transaction")
+        self.connector.commit()
+
+    # discard the work of this transaction when the block ends
+    def rollback(self):
+        self.rollback_only = True
+
+    # run callback once the outermost transaction ended, whether it committed or not
+    def afterEnd(self, callback):
+        self.callbacks.append(callback)
 
 
 class DBConnector:
     # constructor
-    def __init__(self):
+    # a read-only connector may run in autocommit mode (see configureAutocommitReads).
+    # inside a Transaction the connector borrows the transaction's connection
+    def __init__(self, readOnly=False):
+        self.pool = None
+        self.pooled = None
+        self.connection = None
+        self.cursor = None
+        self.readOnly = readOnly
+        self.replica = None
+        self.transaction = currentTransaction()
+        if self.transaction is not None:
+            self.pooled = self.transaction.connector.pooled
+            self.connection = self.pooled.connection
+            self.cursor = self.connection.cursor()
+            return
         try:
-            # Obtain the configuration parameters
-            params = DBConnector.__config()
-            self.connection = psycopg2.connect(**params)
-            self.connection.autocommit = False
+            started = time.perf_counter() if Metrics.enabled else None
+            self.replica = _chooseReplica() if readOnly else None
+            if self.replica is not None:
+                try:
+                    self.pooled = self.replica.acquire()
+                    self.pool = self.replica.pool
+                except Exception:
+                    self.replica = None
+            if self.replica is None:
+                self.pool = getPool()
+                if self.pool is not None:
+                    self.pooled = self.pool.acquire()
+                else:
+                    self.pooled = PooledConnection(backend().connect())
+                    self.pooled.connection.autocommit = False
+            if started is not None:
+                Metrics.observeAcquire(started)
+            self.connection = self.pooled.connection
+            if readOnly and _autocommitReads():
+                self.connection.autocommit = True
             self.cursor = self.connection.cursor()
         except Exception as e:
+            if self.pool is not None and self.pooled is not None:
+                self.pool.release(self.pooled, discard=True)
+            if self.replica is not None:
+                self.replica.release()
+                self.replica = None
+            self.pool = None
+            self.pooled = None
             self.connection = None
             self.cursor = None
             raise DatabaseException.ConnectionInvalid("Could not connect to database")
 
-    # close connection
+    # close connection, a pooled connection goes back to the pool instead
     def close(self):
         if self.cursor is not None:
             self.cursor.close()
-        if self.connection is not None:
+            self.cursor = None
+        if self.transaction is not None:  # the connection belongs to the transaction
+            self.transaction = None
+            self.pooled = None
+            self.connection = None
+            return
+        if not self.readOnly and self.connection is not None:
+            _local.last_write = time.monotonic()  # see read_your_writes
+        if self.connection is not None and not self.connection.closed and self.connection.autocommit:
+            self.connection.autocommit = False
+        if self.pool is not None:
+            self.pool.release(self.pooled)
+        elif self.connection is not None:
             self.connection.close()
+        if self.replica is not None:
+            self.replica.release()
+            self.replica = None
+        self.pool = None
+        self.pooled = None
+        self.connection = None
 
-    # commit connection's changes
+    # commit connection's changes, inside a Transaction this waits for the transaction to end
     def commit(self):
-        if self.connection is not None:
+        if self.connection is not None and self.transaction is None and not self.connection.autocommit:
             try:
                 self.connection.commit()
             except Exception:
                 raise DatabaseException.ConnectionInvalid("Could not commit changes")
 
-    # rollback connection's changes
+    # rollback connection's changes, inside a Transaction this rolls the whole transaction back when it ends
     def rollback(self):
-        if self.connection is not None:
+        if self.transaction is not None:
+            self.transaction.rollback()
+        elif self.connection is not None:
             try:
                 self.connection.rollback()
             except Exception:
@@ -103,29 +597,38 @@ class DBConnector:
 
     # executes the query, if it is SELECT you may ask to print the results with printSchema
     # returns the number of rows effected and a ResultSet (for SELECT)
-    def execute(self, query: Union[str, sql.Composed], printSchema=False) -> (int, ResultSet):
+    # params are bound to %s placeholders in the query
+    def execute(self, query: Union[str, sql.Composed], printSchema=False, params=None) -> (int, ResultSet):
+        return self.__execute(lambda: self.cursor.execute(query, params), printSchema, query)
+
+    # runs action (statements on self.cursor) like execute(), the last statement's rows are the result.
+    # query is what Utility/Metrics.py reports for it
+    def __execute(self, action, printSchema=False, query=None) -> (int, ResultSet):
         if self.connection is None:
             raise DatabaseException.ConnectionInvalid("Connection Invalid")
+        started = time.perf_counter() if Metrics.enabled else None
 
         # try execute the query
         try:
-            self.cursor.execute(query)
+            self.__run(action)
             row_effected = max(self.cursor.rowcount, 0)
             self.commit()
-        except errors.lookup("23502"):
-            raise DatabaseException.NOT_NULL_VIOLATION("NOT_NULL_VIOLATION")
-        except errors.lookup("23503"):
-            raise DatabaseException.FOREIGN_KEY_VIOLATION("FOREIGN_KEY_VIOLATION")
-        except errors.lookup("23505"):
-            raise DatabaseException.UNIQUE_VIOLATION("UNIQUE_VIOLATION")
-        except errors.lookup("23514"):
-            raise DatabaseException.CHECK_VIOLATION("CHECK_VIOLATION")
+        except Exception as e:
+            # constraint violations become DatabaseException, anything else propagates as is
+            violation = backend().translateError(e)
+            if started is not None:
+                Metrics.observeQuery(query, started, error=violation or e)
+            if violation is None:
+                raise
+            raise violation
 
         # get entries in case of SELECT
         if self.cursor.description is not None:
             entries = ResultSet(self.cursor.description, self.cursor.fetchall())
         else:
             entries = ResultSet()
+        if started is not None:
+            Metrics.observeQuery(query, started, row_effected, entries.rows if entries.description else None)
 
         # print SELECT entries
         if printSchema:
@@ -133,25 +636,141 @@ class DBConnector:
 
         return row_effected, entries
 
-    # grant credentials
+    # runs a SELECT on a server-side (named) cursor and yields its rows one by one, fetching fetchSize rows per
+    # round trip, so only one batch is in memory at a time. keep the connector open until the rows are consumed
+    def stream(self, query: Union[str, sql.Composed], params=None, fetchSize=None):
+        cursor = self.__serverCursor(fetchSize)
+        started = time.perf_counter() if Metrics.enabled else None
+        rows = 0
+        try:
+            self.__run(lambda: cursor.execute(query, params))
+            for row in cursor:
+                rows += 1
+                yield row
+        finally:
+            cursor.close()
+            if started is not None:  # includes the time the consumer spent between rows
+                Metrics.observeQuery(query, started, rows)
+
+    # runs a SELECT on a server-side cursor and returns its result as columns, built one batch of fetchSize rows
+    # at a time, see Utility/Columnar.py
+    def executeColumnar(self, query: Union[str, sql.Composed], params=None, fetchSize=None) -> Columnar.Columns:
+        cursor = self.__serverCursor(fetchSize)
+        started = time.perf_counter() if Metrics.enabled else None
+        try:
+            self.__run(lambda: cursor.execute(query, params))
+            columns = Columnar.fromCursor(cursor, cursor.itersize)
+        except Exception as e:
+            if started is not None:
+                Metrics.observeQuery(query, started, error=e)
+            raise
+        finally:
+            cursor.close()
+        if started is not None:
+            Metrics.observeQuery(query, started, columns.size)
+        return columns
+
+    def __serverCursor(self, fetchSize):
+        if self.connection is None:
+            raise DatabaseException.ConnectionInvalid("Connection Invalid")
+        if self.transaction is None and self.connection.autocommit:
+            self.connection.autocommit = False  # a server-side cursor only lives inside a transaction
+        cursor = self.connection.cursor(name="dbconnector_stream" + str(next(_stream_names)))
+        cursor.itersize = fetchSize or _streamFetchSize()
+        return cursor
+
+    # runs action (one statement on self.cursor). inside a Transaction it runs under a savepoint,
+    # so a failure only undoes this statement
+    def __run(self, action):
+        if self.transaction is None or not self.transaction.savepoints:
+            action()
+            return
+        control = self.transaction.control
+        control.execute("SAVEPOINT dbconnector")
+        try:
+            action()
+        except Exception:
+            control.execute("ROLLBACK TO SAVEPOINT dbconnector")
+            raise
+        control.execute("RELEASE SAVEPOINT dbconnector")
+
+    # executes a statement registered with prepare(), PREPAREing it on this connection first if needed
+    def executePrepared(self, name: str, params=(), printSchema=False) -> (int, ResultSet):
+        if self.connection is None:
+            raise DatabaseException.ConnectionInvalid("Connection Invalid")
+        if not backend().prepare:
+            return self.__executeDirect(name, params, printSchema)
+        if not _preparedEnabled():
+            return self.execute(self.inlined(name, params), printSchema)
+        if self.pooled.prepared_generation != _statements_generation:
+            if self.pooled.prepared:
+                self.__run(lambda: self.cursor.execute("DEALLOCATE ALL"))
+            self.pooled.prepared = set()
+            self.pooled.prepared_generation = _statements_generation
+        if name not in self.pooled.prepared:
+            query, types, _ = _statements[name]
+            signature = "(" + ", ".join(types) + ")" if types else ""
+            self.__run(lambda: self.cursor.execute("PREPARE " + name + signature + " AS " + query))
+            self.pooled.prepared.add(name)
+        arguments = "(" + ", ".join(["%s"] * len(params)) + ")" if params else ""
+        return self.execute("EXECUTE " + name + arguments, printSchema, tuple(params))
+
+    # backends without PREPARE run the statement's text for their dialect with bound parameters.
+    # a dialect may need several statements (a list) for one registered statement, they run as one unit
+    def __executeDirect(self, name: str, params, printSchema) -> (int, ResultSet):
+        query, _, dialects = _statements[name]
+        query = dialects.get(dialect(), query)
+        if isinstance(query, str):
+            return self.execute(query, printSchema, tuple(params))
+
+        def statements():
+            for statement in query:
+                self.cursor.execute(statement, tuple(params))
+        return self.__execute(statements, printSchema, query)
+
+    # the registered statement as plain SQL with the parameters inlined as literals
+    def inlined(self, name: str, params) -> str:
+        query, _, _ = _statements[name]
+        literals = [self.cursor.mogrify("%s", (param,)).decode() for param in params]
+        return _placeholder.sub(lambda match: literals[int(match.group(1)) - 1], query)
+
+    # register a statement under name, use $1..$n for its parameters.
+    # types (e.g. ["INTEGER", "TEXT"]) may be omitted to let the server infer them.
+    # dialects maps a backend name to its own text (or list of statements) where the PostgreSQL one does not fit
     @staticmethod
-    def __config(filename=os.path.join(os.path.join(os.getcwd(), "Utility"), 'database.ini'),
-                 section='postgresql'):
-        # create a parser
-        parser = ConfigParser()
-        # read config file
-        parser.read(filename)
-
-        # get section
-        db = {}
-        if parser.has_section(section):
-            params = parser.items(section)
-            for param in params:
-                db[param[0]] = param[1]
-        else:
-            # file not found
-            db = DBConnector.__config(
-                filename=os.path.join(os.path.join(os.path.dirname(os.getcwd()), 'Utility'), 'database.ini'))
-            if db is None:
-                raise DatabaseException.database_ini_ERROR("Please modify database.ini file under Utility")
-        return db
+    def prepare(name: str, query: str, types=None, dialects=None):
+        _statements[name] = (query, list(types) if types else [], dict(dialects or {}))
+
+    # forget every statement prepared so far on every connection, needed after the schema changes
+    @staticmethod
+    def invalidatePrepared():
+        global _statements_generation
+        _statements_generation += 1
+
+    # streams rows (tuples in the order of columns) into table with COPY ... FROM STDIN
+    # returns the number of rows copied
+    def copyFrom(self, table: str, columns: list, rows) -> int:
+        if self.connection is None:
+            raise DatabaseException.ConnectionInvalid("Connection Invalid")
+        query = "COPY " + table + "(" + ", ".join(columns) + ") FROM STDIN"
+        started = time.perf_counter() if Metrics.enabled else None
+        try:
+            self.__run(lambda: self.cursor.copy_expert(query, CopyStream(rows)))
+            row_effected = max(self.cursor.rowcount, 0)
+            self.commit()
+        except Exception as e:
+            # constraint violations become DatabaseException, anything else propagates as is
+            violation = backend().translateError(e)
+            if started is not None:
+                Metrics.observeQuery(query, started, error=violation or e)
+            if violation is None:
+                raise
+            raise violation
+        if started is not None:
+            Metrics.observeQuery(query, started, row_effected)
+        return row_effected
+
+    # connection parameters of the database, parsed once by Utility.Config
+    @staticmethod
+    def config(section='postgresql') -> dict:
+        return Config.section(section)
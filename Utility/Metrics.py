@@ -0,0 +1,226 @@
+import bisect
+import sys
+import threading
+import time
+from collections import namedtuple
+
+import Utility.Config as Config
+
+# per-statement instrumentation of DBConnector: time spent running a statement and fetching its rows, rows and
+# bytes fetched, time spent acquiring a connection and the class of the error, if any. every observation is tagged
+# with the Solution.py function that issued it and feeds in-process histograms, read with snapshot() or
+# prometheus(). hooks added with addHook() receive every QueryEvent as well.
+# disabled by default ([metrics] enabled in database.ini, or configure()), DBConnector then only reads `enabled`
+
+# a finished statement: seconds, rows (fetched, or affected by a write), bytes (estimated size of the fetched
+# values), error (exception class name, None on success)
+QueryEvent = namedtuple("QueryEvent", ["function", "query", "seconds", "rows", "bytes", "error"])
+
+SECONDS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+ROWS = (0, 1, 10, 100, 1000, 10 ** 4, 10 ** 5, 10 ** 6)
+BYTES = (64, 256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+# modules whose functions a statement is attributed to, the first public one up the stack wins
+TAGGED_MODULES = {"Solution", "MemorySolution"}
+UNTAGGED = "other"
+
+enabled = False
+_explicit = False  # set by configure(), kept across Config.reload()
+_hooks = []
+_lock = threading.Lock()
+
+
+# cumulative histogram with fixed upper bounds, Prometheus style
+class Histogram:
+    def __init__(self, bounds):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)  # the last one counts what is above every bound
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    # [(upper bound, observations <= bound)], ending with (inf, count)
+    def cumulative(self) -> list:
+        total = 0
+        result = []
+        for bound, count in zip(self.bounds + (float("inf"),), self.counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+    # upper bound of the bucket holding the q-th quantile, an over-estimate of at most one bucket
+    def quantile(self, q: float) -> float:
+        if self.count == 0:
+            return 0.0
+        rank = q * self.count
+        for bound, total in self.cumulative():
+            if total >= rank:
+                return bound
+        return float("inf")
+
+    def snapshot(self) -> dict:
+        return {"count": self.count, "sum": self.sum, "buckets": self.cumulative(), "p50": self.quantile(0.5),
+                "p95": self.quantile(0.95), "p99": self.quantile(0.99)}
+
+
+# metric name -> (help, bounds), every one is a histogram per function
+HISTOGRAMS = {
+    "dbconnector_query_seconds": ("Time spent executing a statement and fetching its rows.", SECONDS),
+    "dbconnector_query_rows": ("Rows fetched by a statement, or affected by a write.", ROWS),
+    "dbconnector_query_bytes": ("Estimated size of the values fetched by a statement.", BYTES),
+    "dbconnector_acquire_seconds": ("Time spent acquiring a connection from the pool or the server.", SECONDS),
+}
+ERRORS = "dbconnector_query_errors_total"
+
+_histograms = {name: {} for name in HISTOGRAMS}  # metric name -> function -> Histogram
+_errors = {}  # (function, error class) -> count
+
+
+# enabled=False stops recording (what was recorded is kept, see reset()). enabled=None goes back to database.ini
+def configure(enabled=True):
+    global _explicit
+    _explicit = enabled is not None
+    _apply(enabled if enabled is not None else Config.getBool("metrics", "enabled", False))
+
+
+def _apply(value):
+    global enabled
+    enabled = bool(value)
+
+
+def _reload():
+    if not _explicit:
+        _apply(Config.getBool("metrics", "enabled", False))
+
+
+_reload()
+Config.onReload(_reload)
+
+
+# hook(event: QueryEvent) runs after every statement while metrics are enabled, on the thread that ran it
+def addHook(hook):
+    with _lock:
+        _hooks.append(hook)
+
+
+def removeHook(hook):
+    with _lock:
+        if hook in _hooks:
+            _hooks.remove(hook)
+
+
+def reset():
+    with _lock:
+        for histograms in _histograms.values():
+            histograms.clear()
+        _errors.clear()
+
+
+# name of the Solution.py function that called into DBConnector, from the caller's stack
+def caller() -> str:
+    frame = sys._getframe(2)
+    private = None
+    while frame is not None:
+        if frame.f_globals.get("__name__") in TAGGED_MODULES:
+            name = frame.f_code.co_name
+            if not name.startswith("_"):
+                return name
+            private = private or name
+        frame = frame.f_back
+    return private or UNTAGGED
+
+
+# approximate size of fetched rows: the length of text and binary values, 8 bytes for anything else
+def payloadBytes(rows) -> int:
+    size = 0
+    for row in rows:
+        for value in row:
+            if isinstance(value, (str, bytes, bytearray, memoryview)):
+                size += len(value)
+            elif isinstance(value, (list, tuple)):
+                size += sum(len(item) if isinstance(item, str) else 8 for item in value)
+            else:
+                size += 8
+    return size
+
+
+def _observe(name, function, value):
+    histograms = _histograms[name]
+    histogram = histograms.get(function)
+    if histogram is None:
+        histogram = histograms[function] = Histogram(HISTOGRAMS[name][1])
+    histogram.observe(value)
+
+
+# a statement that started at started (time.perf_counter()) just finished. fetched are the rows it returned,
+# counted as rows when given, error the exception it raised
+def observeQuery(query, started, rows=0, fetched=None, error=None):
+    seconds = time.perf_counter() - started
+    function = caller()
+    if fetched is not None:
+        rows = len(fetched)
+    size = payloadBytes(fetched) if fetched else 0
+    error = type(error).__name__ if error is not None else None
+    with _lock:
+        _observe("dbconnector_query_seconds", function, seconds)
+        _observe("dbconnector_query_rows", function, rows)
+        _observe("dbconnector_query_bytes", function, size)
+        if error is not None:
+            _errors[(function, error)] = _errors.get((function, error), 0) + 1
+        hooks = list(_hooks)
+    if hooks:
+        event = QueryEvent(function, query, seconds, rows, size, error)
+        for hook in hooks:
+            hook(event)
+
+
+def observeAcquire(started):
+    seconds = time.perf_counter() - started
+    function = caller()
+    with _lock:
+        _observe("dbconnector_acquire_seconds", function, seconds)
+
+
+# {metric name: {function: histogram snapshot}} and {ERRORS: {function: {error class: count}}}
+def snapshot() -> dict:
+    with _lock:
+        result = {name: {function: histogram.snapshot() for function, histogram in histograms.items()}
+                  for name, histograms in _histograms.items()}
+        errors = {}
+        for (function, error), count in _errors.items():
+            errors.setdefault(function, {})[error] = count
+        result[ERRORS] = errors
+    return result
+
+
+def _label(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _number(value) -> str:
+    return "+Inf" if value == float("inf") else repr(value)
+
+
+# everything recorded so far in the Prometheus text exposition format
+def prometheus() -> str:
+    state = snapshot()
+    lines = []
+    for name, (description, _) in HISTOGRAMS.items():
+        lines.append("# HELP " + name + " " + description)
+        lines.append("# TYPE " + name + " histogram")
+        for function, histogram in sorted(state[name].items()):
+            label = 'function="' + _label(function) + '"'
+            for bound, total in histogram["buckets"]:
+                lines.append(name + "_bucket{" + label + ',le="' + _number(bound) + '"} ' + str(total))
+            lines.append(name + "_sum{" + label + "} " + _number(histogram["sum"]))
+            lines.append(name + "_count{" + label + "} " + str(histogram["count"]))
+    lines.append("# HELP " + ERRORS + " Statements that raised, by exception class.")
+    lines.append("# TYPE " + ERRORS + " counter")
+    for function, errors in sorted(state[ERRORS].items()):
+        for error, count in sorted(errors.items()):
+            lines.append(ERRORS + '{function="' + _label(function) + '",error="' + _label(error) + '"} ' + str(count))
+    return "\n".join(lines) + "\n"